@@ -1,14 +1,21 @@
+import asyncio
+import json
 import logging
+import time
 
 from dotenv import load_dotenv
+from livekit import rtc
 from livekit.agents import (
     NOT_GIVEN,
     AgentFalseInterruptionEvent,
     AgentSession,
+    AgentStateChangedEvent,
+    FunctionToolsExecutedEvent,
     JobContext,
     JobProcess,
     MetricsCollectedEvent,
     RoomInputOptions,
+    UserStateChangedEvent,
     WorkerOptions,
     cli,
     metrics,
@@ -20,9 +27,16 @@ from livekit.plugins import (
 from livekit.plugins.turn_detector.multilingual import MultilingualModel
 
 # Agents are imported when needed to avoid circular imports
-from handlers.participant import process_participant_data
+from config.credentials import parse_google_credentials
+from handlers.participant import build_agent, start_next_card
 from langfuse_setup import setup_langfuse
 from models.session import MySessionInfo
+from prompts.loader import load_prompt
+from services.greeting_cache import get_greeting_cache
+from services.loop_monitor import LoopStallMonitor
+from services.provider_pool import ProviderPool
+from services.provider_warmup import warm_agent_tts, warm_deepgram, warmup_enabled
+from services.startup_graph import StartupGraph
 
 logger = logging.getLogger("agent")
 
@@ -37,7 +51,6 @@ def prewarm(proc: JobProcess):
 
 
 async def entrypoint(ctx: JobContext):
-    setup_langfuse()
     ctx.log_context_fields = {
         "room": ctx.room.name,
     }
@@ -49,12 +62,43 @@ async def entrypoint(ctx: JobContext):
         target_lexical_item=None,  # Will be set dynamically from participant attributes
     )
 
+    # Measure event loop stalls for the whole job (agent construction, RPCs, ...)
+    loop_monitor = LoopStallMonitor(session_info.metrics)
+    loop_monitor.start()
+
+    # Startup runs as a dependency graph: everything that doesn't need participant
+    # data starts now and overlaps with the room connection
+    startup = StartupGraph(session_info.metrics)
+    startup.add("langfuse", lambda: asyncio.to_thread(setup_langfuse))
+    startup.add("connect", ctx.connect)
+    # The turn detector reads its language table from disk, so build it off the loop
+    startup.add("turn_detector", lambda: asyncio.to_thread(MultilingualModel))
+    startup.add("credentials", lambda: asyncio.to_thread(parse_google_credentials))
+    startup.add(
+        "prompts", lambda: asyncio.to_thread(load_prompt, "native_explain_agent")
+    )
+    startup.add("greetings", lambda: asyncio.to_thread(get_greeting_cache))
+    warm_providers = warmup_enabled()
+    if warm_providers:
+        # Every agent listens through Deepgram, so its connection can warm up
+        # alongside the room connection, before any metadata is known
+        startup.add("stt_warmup", lambda: warm_deepgram(session_info.metrics))
+
+    # Models shared by the session and every agent built for it, so agent
+    # construction never loads them again
+    shared_models = {
+        "vad": ctx.proc.userdata["vad"],
+        "turn_detection": await startup.wait("turn_detector"),
+        # STT/LLM/TTS clients reused by agents for later cards in this room
+        "providers": ProviderPool(),
+    }
+
     # Set up a session - agents will now provide their own STT/TTS configuration
     session = AgentSession(
         # VAD and turn detection are used to determine when the user is speaking and when the agent should respond
         # See more at https://docs.livekit.io/agents/build/turns
-        turn_detection=MultilingualModel(),
-        vad=ctx.proc.userdata["vad"],
+        turn_detection=shared_models["turn_detection"],
+        vad=shared_models["vad"],
         # allow the LLM to generate a response while waiting for the end of turn
         # See more at https://docs.livekit.io/agents/build/audio/#preemptive-generation
         preemptive_generation=True,
@@ -83,15 +127,82 @@ async def entrypoint(ctx: JobContext):
     def _on_metrics_collected(ev: MetricsCollectedEvent):
         metrics.log_metrics(ev.metrics)
         usage_collector.collect(ev.metrics)
+        # Per-turn latency components, used to compare agent modes
+        if isinstance(ev.metrics, metrics.LLMMetrics):
+            session_info.metrics.increment("llm.requests")
+            session_info.metrics.record("llm.ttft", ev.metrics.ttft)
+        elif isinstance(ev.metrics, metrics.TTSMetrics):
+            if "tts.ttfb" not in session_info.metrics.timings:
+                # The greeting - where lazy provider handshakes used to land
+                session_info.metrics.record("tts.first_ttfb", ev.metrics.ttfb)
+            session_info.metrics.record("tts.ttfb", ev.metrics.ttfb)
+        elif isinstance(ev.metrics, metrics.EOUMetrics):
+            session_info.metrics.record(
+                "eou.end_of_utterance_delay", ev.metrics.end_of_utterance_delay
+            )
+            session_info.metrics.record(
+                "eou.on_user_turn_completed_delay",
+                ev.metrics.on_user_turn_completed_delay,
+            )
+
+    # Time from tool execution to the agent speaking the result - compares
+    # tool results spoken directly against another LLM round-trip
+    tools_executed_at = None
+
+    @session.on("function_tools_executed")
+    def _on_function_tools_executed(ev: FunctionToolsExecutedEvent):
+        nonlocal tools_executed_at
+        tools_executed_at = time.perf_counter()
+
+    # Time from a "next_card" request to the new agent's first words
+    card_requested_at = None
+
+    # User-perceived reply latency: end of the user's speech to the agent's first
+    # audio, tagged with NativeExplainAgent's SPANISH_VALIDATION_MODE
+    user_stopped_at = None
+
+    @session.on("user_state_changed")
+    def _on_user_state_changed(ev: UserStateChangedEvent):
+        nonlocal user_stopped_at
+        if ev.old_state == "speaking" and ev.new_state == "listening":
+            user_stopped_at = time.perf_counter()
+
+    @session.on("agent_state_changed")
+    def _on_agent_state_changed(ev: AgentStateChangedEvent):
+        nonlocal tools_executed_at, card_requested_at, user_stopped_at
+        if ev.new_state != "speaking":
+            return
+        if user_stopped_at is not None:
+            mode = getattr(session.current_agent, "validation_mode", None)
+            session_info.metrics.record(
+                f"reply_latency.{mode}" if mode else "reply_latency",
+                time.perf_counter() - user_stopped_at,
+            )
+            user_stopped_at = None
+        if tools_executed_at is not None:
+            session_info.metrics.record(
+                "tool_results.reply_latency", time.perf_counter() - tools_executed_at
+            )
+            tools_executed_at = None
+        if card_requested_at is not None:
+            latency = time.perf_counter() - card_requested_at
+            session_info.metrics.record("card_transition.latency", latency)
+            logger.info(
+                f"🔀 [Agent] Card {session_info.card_index} greeting started {latency * 1000:.0f}ms after next_card"
+            )
+            card_requested_at = None
 
     async def log_usage():
         summary = usage_collector.get_summary()
         logger.info(f"Usage: {summary}")
+        await loop_monitor.aclose()
+        session_info.metrics.log_summary(ctx.room.name)
 
     ctx.add_shutdown_callback(log_usage)
 
     # Variable to store the selected agent
     selected_agent = None
+    pending_builds: set[asyncio.Task] = set()
 
     # Handle participant connection to determine agent and get data
     @ctx.room.on("participant_connected")
@@ -108,12 +219,21 @@ async def entrypoint(ctx: JobContext):
             f"🎯 [Agent] 🔄 CLOUD DEBUG: Participant metadata: {getattr(participant, 'metadata', 'None')}"
         )
 
-        new_agent = process_participant_data(participant, session)
+        # Room event callbacks are synchronous - only schedule the agent build here
+        task = asyncio.create_task(select_agent_for(participant))
+        pending_builds.add(task)
+        task.add_done_callback(pending_builds.discard)
+
+    async def select_agent_for(participant):
+        nonlocal selected_agent
+        new_agent = await build_agent(participant, session, shared_models)
         if new_agent is not None:
             selected_agent = new_agent
             logger.info(
                 f"🎯 [Agent] ✅ Selected agent: {type(selected_agent).__name__}"
             )
+            if warm_providers:
+                await warm_agent_tts(new_agent, session_info.metrics)
             # If session is already started, we need to update the agent dynamically
             if hasattr(session, "_agent") and session._agent is not None:
                 logger.info(
@@ -121,9 +241,34 @@ async def entrypoint(ctx: JobContext):
                 )
         else:
             logger.warning(
-                "🎯 [Agent] ⚠️ CLOUD DEBUG: process_participant_data returned None - will retry on next connection"
+                "🎯 [Agent] ⚠️ CLOUD DEBUG: build_agent returned None - will retry on next connection"
             )
 
+    # Several cards can be practiced in one room: the frontend sends the next
+    # card's metadata (same shape as the token metadata) and the running session
+    # hands off to a new agent, reusing models and provider connections
+    async def handle_next_card(data: rtc.RpcInvocationData) -> str:
+        nonlocal selected_agent, card_requested_at
+        start = time.perf_counter()
+        logger.info(f"🔀 [Agent] next_card requested by {data.caller_identity}")
+
+        new_agent = await start_next_card(data.payload, session, shared_models)
+        if new_agent is None:
+            return json.dumps({"status": "error", "reason": "invalid_card_metadata"})
+
+        selected_agent = new_agent
+        card_requested_at = start
+        if warm_providers:
+            # Skipped for voices already used in this room
+            asyncio.create_task(warm_agent_tts(new_agent, session_info.metrics))  # noqa: RUF006
+        session_info.metrics.record(
+            "card_transition.handoff", time.perf_counter() - start
+        )
+        logger.info(
+            f"🔀 [Agent] Switched to {type(new_agent).__name__} for card {session_info.card_index}"
+        )
+        return json.dumps({"status": "ok", "card_index": session_info.card_index})
+
     # Add retry mechanism for metadata processing
     retry_count = 0
     max_retries = 5
@@ -145,7 +290,7 @@ async def entrypoint(ctx: JobContext):
             logger.info(
                 f"🎯 [Agent] 🔄 RETRY: Processing participant {participant.identity}"
             )
-            new_agent = process_participant_data(participant, session)
+            new_agent = await build_agent(participant, session, shared_models)
             if new_agent is not None:
                 selected_agent = new_agent
                 logger.info(
@@ -154,8 +299,6 @@ async def entrypoint(ctx: JobContext):
                 return
 
         # Schedule another retry after a delay
-        import asyncio
-
         await asyncio.sleep(2.0)  # Wait 2 seconds before next retry
         await retry_participant_processing()
 
@@ -174,7 +317,7 @@ async def entrypoint(ctx: JobContext):
                 f"🎯 [Agent] 🔄 CLOUD DEBUG: Existing participant metadata: {getattr(participant, 'metadata', 'None')}"
             )
 
-            new_agent = process_participant_data(participant, session)
+            new_agent = await build_agent(participant, session, shared_models)
             if new_agent is not None:
                 selected_agent = new_agent
                 logger.info(
@@ -182,52 +325,75 @@ async def entrypoint(ctx: JobContext):
                 )
             else:
                 logger.warning(
-                    "🎯 [Agent] ⚠️ CLOUD DEBUG: process_participant_data returned None for existing participant - will wait for proper connection"
+                    "🎯 [Agent] ⚠️ CLOUD DEBUG: build_agent returned None for existing participant - will wait for proper connection"
                 )
 
-    # Connect to room first to check for participants
-    await ctx.connect()
-
-    # Check for existing participants after connecting
-    logger.info("🎯 [Agent] Agent connected, checking for existing participants...")
-    await check_existing_participants()
+    async def select_initial_agent():
+        nonlocal selected_agent
+        # The local participant only exists once connected
+        ctx.room.local_participant.register_rpc_method("next_card", handle_next_card)
 
-    # Wait for proper agent selection - don't fallback to NativeExplainAgent
-    if not selected_agent:
-        logger.info(
-            "🎯 [Agent] 🔄 CLOUD DEBUG: No valid agent selected yet - starting retry mechanism"
-        )
-        # Try retry mechanism before creating waiting agent
-        await retry_participant_processing()
+        # Check for existing participants after connecting
+        logger.info("🎯 [Agent] Agent connected, checking for existing participants...")
+        await check_existing_participants()
 
+        # Wait for proper agent selection - don't fallback to NativeExplainAgent
         if not selected_agent:
             logger.info(
-                "🎯 [Agent] 🔄 CLOUD DEBUG: Still no valid agent after retries - creating waiting ContextAgent"
+                "🎯 [Agent] 🔄 CLOUD DEBUG: No valid agent selected yet - starting retry mechanism"
             )
-            # Create a minimal waiting agent that just waits for proper connection
-            from agents.context_agent import ContextAgent
+            # Try retry mechanism before creating waiting agent
+            await retry_participant_processing()
 
-            # Create ContextAgent with no scenario data - it will use defaults but won't start inappropriate conversation
-            selected_agent = ContextAgent(scenario_data=None)
-            logger.info(
-                "🎯 [Agent] Created waiting ContextAgent - waiting for user connection with proper scenario data"
-            )
-        else:
-            logger.info(
-                "🎯 [Agent] ✅ RETRY SUCCESS: Got valid agent from retry mechanism"
-            )
+            if not selected_agent:
+                logger.info(
+                    "🎯 [Agent] 🔄 CLOUD DEBUG: Still no valid agent after retries - creating waiting ContextAgent"
+                )
+                # Create a minimal waiting agent that just waits for proper connection
+                from agents.context_agent import ContextAgent
 
-    # Start the session with the selected agent
-    await session.start(
-        agent=selected_agent,
-        room=ctx.room,
-        room_input_options=RoomInputOptions(
-            # LiveKit Cloud enhanced noise cancellation
-            # - If self-hosting, omit this parameter
-            # - For telephony applications, use `BVCTelephony` for best results
-            noise_cancellation=noise_cancellation.BVC(),
-        ),
+                # Create ContextAgent with no scenario data - it will use defaults but won't start inappropriate conversation
+                selected_agent = await asyncio.to_thread(
+                    ContextAgent, scenario_data=None, **shared_models
+                )
+                logger.info(
+                    "🎯 [Agent] Created waiting ContextAgent - waiting for user connection with proper scenario data"
+                )
+            else:
+                logger.info(
+                    "🎯 [Agent] ✅ RETRY SUCCESS: Got valid agent from retry mechanism"
+                )
+
+    async def start_session():
+        # Start the session with the selected agent
+        await session.start(
+            agent=selected_agent,
+            room=ctx.room,
+            room_input_options=RoomInputOptions(
+                # LiveKit Cloud enhanced noise cancellation
+                # - If self-hosting, omit this parameter
+                # - For telephony applications, use `BVCTelephony` for best results
+                noise_cancellation=noise_cancellation.BVC(),
+            ),
+        )
+
+    # Agent selection needs the room connection plus whatever agent constructors read
+    startup.add(
+        "select_agent",
+        select_initial_agent,
+        after=("connect", "credentials", "prompts", "greetings"),
     )
+    # Tracing must be configured before the session starts emitting spans
+    startup.add("session_start", start_session, after=("langfuse", "select_agent"))
+    if warm_providers:
+        # The persona voice is known once the agent is selected; authenticate its
+        # TTS client while the session starts instead of on the greeting
+        startup.add(
+            "tts_warmup",
+            lambda: warm_agent_tts(selected_agent, session_info.metrics),
+            after=("select_agent",),
+        )
+    await startup.join()
 
     # Agent is already started and connected
 
@@ -7,11 +7,19 @@ from livekit.agents import (
     ChatContext,
     ChatMessage,
 )
-from livekit.plugins import deepgram, google, openai, silero
+from livekit.plugins import silero
 from livekit.plugins.turn_detector.multilingual import MultilingualModel
 
-from config.credentials import parse_google_credentials
+from models.session import MySessionInfo
+from prompts.greetings import (
+    CONTEXT_GREETING_PROMPT_VERSION,
+    context_agent_instructions,
+    context_greeting_instructions,
+)
 from services.context_evaluator import ContextEvaluator
+from services.evaluation_queue import EvaluationQueue
+from services.greeting_cache import greet
+from services.provider_pool import ProviderPool
 from services.terminal_state_manager import TerminalStateManager
 
 logger = logging.getLogger("agent.context")
@@ -21,13 +29,22 @@ class ContextAgent(Agent):
     """Agent for context-based phrasal verb practice with role-playing scenarios."""
 
     def __init__(
-        self, scenario_data: Optional[dict] = None, voice_persona: Optional[dict] = None
+        self,
+        scenario_data: Optional[dict] = None,
+        voice_persona: Optional[dict] = None,
+        vad: Optional[silero.VAD] = None,
+        turn_detection: Optional[MultilingualModel] = None,
+        providers: Optional[ProviderPool] = None,
     ):
         self.max_turns = 5
         self.turn_count = 0
         self.success = False
         self.evaluator = ContextEvaluator()
         self.voice_persona = voice_persona or {}
+        # Turns are evaluated one at a time, in order; terminal states fire once
+        self._evaluation_queue = EvaluationQueue(
+            self._evaluate_and_notify, name="context"
+        )
 
         # Extract scenario data
         if scenario_data:
@@ -36,6 +53,7 @@ class ContextAgent(Agent):
             self.phrasal_verb = scenario_data.get("phrasalVerb", "go on")
             self.phrasal_verb_definition = scenario_data.get("phrasalVerbDefinition")
             self.phrasal_verb_examples = scenario_data.get("phrasalVerbExamples", [])
+            self.phrasal_verb_inflections = scenario_data.get("phrasalVerbInflections")
             self.context_text = scenario_data.get("contextText", "")
             self.conversation_starter = scenario_data.get("conversationStarter", "")
             self.max_turns = scenario_data.get("maxTurns", 5)
@@ -59,25 +77,17 @@ class ContextAgent(Agent):
             self.phrasal_verb = "go on"
             self.phrasal_verb_definition = "Happen, take place"  # Default for testing
             self.context_text = "You need to speak with Mr. Yang"
+            self.phrasal_verb_examples = []
+            self.phrasal_verb_inflections = None
+            self.conversation_starter = ""
 
         # Build agent instructions with persona information
         persona_info = self.voice_persona.get("persona", {})
         teaching_style = persona_info.get("teaching_style", "professional and clear")
 
-        instructions = f"""You are {self.character} in this scenario: {self.situation}
-
-Teaching style: {teaching_style}
-
-Your role:
-1. Act naturally as {self.character} - you are NOT talking to someone with the same name as you
-2. The user is your colleague/employee, address them appropriately (not by your own name)
-3. Keep conversations brief and natural - do NOT provide lengthy explanations upfront
-4. Be vague initially about problems - let the user ask for details
-5. Do NOT mention the phrasal verb directly
-6. Stay in character at all times
-7. Speak concisely - one or two sentences maximum per turn
-
-Context: {self.context_text}"""
+        instructions = context_agent_instructions(
+            self.character, self.situation, teaching_style, self.context_text
+        )
 
         # Configure TTS with voice persona data
         voice_info = self.voice_persona.get("voice", {})
@@ -85,18 +95,18 @@ Context: {self.context_text}"""
         voice_name = voice_info.get(
             "name", "en-US-Chirp3-HD-Achernar"
         )  # Default CHIRP 3 HD voice
+        self.voice_name = voice_name
 
+        # Clients shared with earlier cards in this session, if any
+        providers = providers or ProviderPool()
         super().__init__(
             instructions=instructions,
-            stt=deepgram.STT(model="nova-3", language="multi"),
-            llm=openai.LLM(model="gpt-4o-mini"),
-            tts=google.TTS(
-                language=language_code,
-                voice_name=voice_name,
-                credentials_info=parse_google_credentials(),
-            ),
-            vad=silero.VAD.load(),
-            turn_detection=MultilingualModel(),
+            stt=providers.stt(),
+            llm=providers.llm(),
+            tts=providers.google_tts(language_code, voice_name),
+            # Prefer the models pre-built once per process/session
+            vad=vad or silero.VAD.load(),
+            turn_detection=turn_detection or MultilingualModel(),
         )
         logger.info(
             f"🎭 [ContextAgent] Initialized as {self.character} for phrasal verb: {self.phrasal_verb}"
@@ -125,85 +135,106 @@ Context: {self.context_text}"""
             f"🎯 [ContextAgent] Turn {self.turn_count}/{self.max_turns}: User said: {user_text}"
         )
 
-        # Start background evaluation - don't block conversation
-        self._evaluation_task = asyncio.create_task(
-            self._evaluate_and_notify(user_text)
-        )
+        # Queue background evaluation - don't block conversation
+        if self._evaluation_queue.submit(self.turn_count, user_text):
+            # Allow conversation to continue immediately while evaluation runs in background
+            logger.info(
+                "⚡ [ContextAgent] Evaluation queued in background, conversation continues"
+            )
 
-        # Allow conversation to continue immediately while evaluation runs in background
-        logger.info(
-            "⚡ [ContextAgent] Evaluation started in background, conversation continues"
+    async def _evaluate_and_notify(self, turn_number: int, user_text: str) -> None:
+        """Evaluate phrasal verb usage in background and notify UI accordingly.
+
+        Runs inside the evaluation queue, so calls never overlap. `turn_number` is
+        the turn being evaluated, which may lag behind `self.turn_count`. Errors
+        propagate to the queue, which logs them and counts them as failed.
+        """
+        # Evaluate phrasal verb usage
+        evaluation = await self.evaluator.evaluate_usage(
+            user_text=user_text,
+            lexical_item=self.phrasal_verb,
+            lexical_item_definition=self.phrasal_verb_definition,
+            scenario=self.situation,
+            lexical_item_examples=self.phrasal_verb_examples,
+            character=self.character,
+            on_verdict=lambda verdict: self._on_verdict(turn_number, verdict),
+            lexical_item_inflections=self.phrasal_verb_inflections,
+            # Feedback is only shown when the last turn fails
+            include_feedback=turn_number >= self.max_turns,
         )
 
-    async def _evaluate_and_notify(self, user_text: str) -> None:
-        """Evaluate phrasal verb usage in background and notify UI accordingly."""
-        try:
-            # Evaluate phrasal verb usage
-            evaluation = await self.evaluator.evaluate_usage(
-                user_text=user_text,
-                lexical_item=self.phrasal_verb,
-                lexical_item_definition=self.phrasal_verb_definition,
-                scenario=self.situation,
-                lexical_item_examples=self.phrasal_verb_examples,
-                character=self.character,
-            )
+        logger.info(f"📊 [ContextAgent] Background evaluation completed: {evaluation}")
 
-            logger.info(
-                f"📊 [ContextAgent] Background evaluation completed: {evaluation}"
-            )
+        if evaluation["used_correctly"]:
+            # Success! Usually already fired from the streamed verdict
+            self._handle_success()
 
-            if evaluation["used_correctly"]:
-                # Success! User used the phrasal verb correctly
-                self.success = True
-                # Schedule terminal success state with delay to allow agent to finish speaking
-                asyncio.create_task(  # noqa: RUF006
-                    TerminalStateManager.handle_success(
-                        f"Excellent! You used '{self.phrasal_verb}' correctly in context! 🎯",
-                        delay_seconds=3.5,  # Shorter delay for context conversations
-                    )
-                )
-                logger.info(
-                    f"✅ [ContextAgent] Success! User correctly used '{self.phrasal_verb}'"
+        elif turn_number >= self.max_turns and not self.success:
+            # Failed - out of turns
+            if not self._evaluation_queue.decide():
+                return
+            feedback = evaluation.get(
+                "feedback",
+                f"You could have said something like: 'Could you {self.phrasal_verb} with your explanation?'",
+            )
+            # Schedule terminal failure state with delay to allow agent to finish speaking
+            asyncio.create_task(  # noqa: RUF006
+                TerminalStateManager.handle_failure(
+                    "Out of turns. Time to move on!",
+                    feedback,
+                    delay_seconds=2.5,  # Shorter delay for failure messages
                 )
+            )
+            logger.info("❌ [ContextAgent] Failed - out of turns without correct usage")
 
-            elif self.turn_count >= self.max_turns and not self.success:
-                # Failed - out of turns
-                feedback = evaluation.get(
-                    "feedback",
-                    f"You could have said something like: 'Could you {self.phrasal_verb} with your explanation?'",
+        else:
+            # Still have turns remaining
+            remaining = self.max_turns - turn_number
+            if evaluation.get("used_verb") and not evaluation.get("used_correctly"):
+                logger.info(
+                    f"⚠️ [ContextAgent] Incorrect usage attempt detected. {remaining} turns remaining"
                 )
-                # Schedule terminal failure state with delay to allow agent to finish speaking
-                asyncio.create_task(  # noqa: RUF006
-                    TerminalStateManager.handle_failure(
-                        "Out of turns. Time to move on!",
-                        feedback,
-                        delay_seconds=2.5,  # Shorter delay for failure messages
-                    )
+            elif not evaluation.get("used_verb"):
+                # Send warning toast when user doesn't use the verb at all
+                await self._send_warning_toast()
+                logger.info(
+                    f"⏳ [ContextAgent] No verb usage detected - sent warning toast. {remaining} turns remaining"
                 )
+            else:
                 logger.info(
-                    "❌ [ContextAgent] Failed - out of turns without correct usage"
+                    f"⏳ [ContextAgent] Evaluation completed. {remaining} turns remaining"
                 )
 
-            else:
-                # Still have turns remaining
-                remaining = self.max_turns - self.turn_count
-                if evaluation.get("used_verb") and not evaluation.get("used_correctly"):
-                    logger.info(
-                        f"⚠️ [ContextAgent] Incorrect usage attempt detected. {remaining} turns remaining"
-                    )
-                elif not evaluation.get("used_verb"):
-                    # Send warning toast when user doesn't use the verb at all
-                    await self._send_warning_toast()
-                    logger.info(
-                        f"⏳ [ContextAgent] No verb usage detected - sent warning toast. {remaining} turns remaining"
-                    )
-                else:
-                    logger.info(
-                        f"⏳ [ContextAgent] Evaluation completed. {remaining} turns remaining"
-                    )
+    def _on_verdict(self, turn_number: int, verdict: dict[str, bool]) -> None:
+        """Fire the success state as soon as the streamed verdict is known."""
+        if verdict["used_correctly"]:
+            logger.info(
+                f"⚡ [ContextAgent] Early verdict for turn {turn_number}: correct usage, feedback still streaming"
+            )
+            self._handle_success()
+
+    def _handle_success(self) -> None:
+        """Enter the success terminal state once per session."""
+        if not self._evaluation_queue.decide():
+            return
+        self.success = True
+        # Schedule terminal success state with delay to allow agent to finish speaking
+        asyncio.create_task(  # noqa: RUF006
+            TerminalStateManager.handle_success(
+                f"Excellent! You used '{self.phrasal_verb}' correctly in context! 🎯",
+                delay_seconds=3.5,  # Shorter delay for context conversations
+            )
+        )
+        logger.info(
+            f"✅ [ContextAgent] Success! User correctly used '{self.phrasal_verb}'"
+        )
 
-        except Exception as e:
-            logger.error(f"❌ [ContextAgent] Background evaluation failed: {e}")
+    async def on_exit(self) -> None:
+        """Called when the agent is replaced or the session closes."""
+        await self._evaluation_queue.aclose()
+        logger.info(
+            f"📊 [ContextAgent] Evaluation stats: {self._evaluation_queue.stats}"
+        )
 
     async def _send_warning_toast(self) -> None:
         """Send a warning toast to remind the user to use the target phrasal verb."""
@@ -239,25 +270,22 @@ Context: {self.context_text}"""
         logger.info(f"📝 [ContextAgent] Scenario: {self.situation}")
         logger.info(f"🔢 [ContextAgent] Max turns: {self.max_turns}")
 
-        # Use conversationStarter from scenario data
-        if self.conversation_starter:
-            # Remove [username] placeholder if present
-            greeting = self.conversation_starter.replace("[username]", "").strip()
-
-            # Special case: For Mr. Williams "go on" scenario, be more vague initially
-            # This specific greeting gives away too much detail upfront
-            if "Mr. Williams" in self.character and "bad has happened" in greeting:
-                greeting = "I need to speak with you about something urgent."
-                instruction_prefix = (
-                    "Start with this brief opener and wait for their response: "
-                )
-            else:
-                # For other scenarios (pick up, come back, close down), use the original starter
-                # These are appropriately contextual without giving away the solution
-                instruction_prefix = "Start the conversation naturally: "
-        else:
-            greeting = "Hello! Where were we?"
-            instruction_prefix = "Start with this greeting: "
-
-        logger.info(f"🗣️ [ContextAgent] Starting conversation with: {greeting}")
-        self.session.generate_reply(instructions=f"{instruction_prefix}'{greeting}'")
+        session_info = self.session.userdata
+        if not isinstance(session_info, MySessionInfo):
+            session_info = None
+        card_id = (session_info and session_info.card_id) or (
+            f"context-{self.phrasal_verb}-{self.character}"
+        )
+        logger.info(
+            f"🗣️ [ContextAgent] Starting conversation with: {self.conversation_starter}"
+        )
+        greet(
+            self,
+            card_id=card_id,
+            persona=self.voice_name,
+            prompt_version=CONTEXT_GREETING_PROMPT_VERSION,
+            instructions=context_greeting_instructions(
+                self.character, self.conversation_starter
+            ),
+            metrics=session_info.metrics if session_info else None,
+        )
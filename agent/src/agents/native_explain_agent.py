@@ -1,6 +1,9 @@
 import asyncio
 import json
 import logging
+import os
+import time
+from typing import Optional
 
 from livekit.agents import (
     Agent,
@@ -8,37 +11,87 @@ from livekit.agents import (
     get_job_context,
 )
 from livekit.agents.llm import ChatContext, ChatMessage, function_tool
-from livekit.plugins import deepgram, google, openai, silero
+from livekit.plugins import openai, silero
 from livekit.plugins.turn_detector.multilingual import MultilingualModel
 
-from config.credentials import parse_google_credentials
-from models.session import MySessionInfo
+from models.session import MySessionInfo, TargetLexicalItem
+from prompts.greetings import (
+    NATIVE_EXPLAIN_GREETING_PROMPT_VERSION,
+    native_explain_greeting_instructions,
+)
+from services.greeting_cache import greet
+from services.provider_pool import ProviderPool
+from services.session_metrics import SessionMetrics
 from services.terminal_state_manager import TerminalStateManager
 
 logger = logging.getLogger("agent.native_explain")
 
+TTS_VOICE = "es-US-Chirp3-HD-Schedar"
+
+# "sequential": validate Spanish answers before the main reply (adds one LLM latency)
+# "parallel": start validation alongside the main reply and apply the verdict when it lands
+VALIDATION_MODES = ("sequential", "parallel")
+
 
 class NativeExplainAgent(Agent):
-    def __init__(self) -> None:
+    """Agent that asks the learner to explain a phrasal verb, accepting Spanish answers.
+
+    Spanish answers are checked by a separate validation LLM call. In parallel mode
+    the verdict may arrive after the main reply has started, so the session follows
+    one contradiction policy:
+
+    - The first terminal decision wins, whether it comes from a tool call or from
+      the validator. Later disagreeing verdicts are logged and counted, never applied.
+    - A positive validator verdict is applied mid-turn through the same path as
+      `correct_sense_explained` and spoken right after the current reply.
+    - A negative validator verdict never ends the session on its own; it is fed
+      into the next turn as a system note for the main LLM to weigh.
+    """
+
+    def __init__(
+        self,
+        validation_mode: Optional[str] = None,
+        speak_tool_results: Optional[bool] = None,
+        vad: Optional[silero.VAD] = None,
+        turn_detection: Optional[MultilingualModel] = None,
+        providers: Optional[ProviderPool] = None,
+    ) -> None:
         from prompts.loader import load_prompt
 
         instructions = load_prompt("native_explain_agent")
+        # Clients shared with earlier cards in this session, if any
+        providers = providers or ProviderPool()
         super().__init__(
             instructions=instructions,
-            stt=deepgram.STT(model="nova-3", language="multi"),
-            llm=openai.LLM(model="gpt-4o-mini"),
-            tts=google.TTS(
-                language="es-US",
-                voice_name="es-US-Chirp3-HD-Schedar",
-                credentials_info=parse_google_credentials(),
-            ),
-            vad=silero.VAD.load(),
-            turn_detection=MultilingualModel(),
+            stt=providers.stt(),
+            llm=providers.llm(),
+            tts=providers.google_tts("es-US", TTS_VOICE),
+            # Prefer the models pre-built once per process/session
+            vad=vad or silero.VAD.load(),
+            turn_detection=turn_detection or MultilingualModel(),
         )
         self.spanish_validation_result = None  # Store RAG validation results
+        self.validation_mode = validation_mode or os.getenv(
+            "SPANISH_VALIDATION_MODE", "sequential"
+        )
+        if self.validation_mode not in VALIDATION_MODES:
+            raise ValueError(
+                f"Unknown SPANISH_VALIDATION_MODE '{self.validation_mode}', expected one of {VALIDATION_MODES}"
+            )
+        self.validation_llm = openai.LLM(model="gpt-4o-mini")
+        # Terminal tools hand their closing line straight to TTS instead of
+        # asking the LLM to rephrase it, saving one round-trip per session
+        if speak_tool_results is None:
+            speak_tool_results = (
+                os.getenv("SPEAK_TOOL_RESULTS_DIRECTLY", "true").lower() == "true"
+            )
+        self.speak_tool_results = speak_tool_results
+        self._decision: Optional[str] = None  # "success" or "failure", first one wins
+        self._validation_task: Optional[asyncio.Task] = None
+        self._pending_validation_note: Optional[str] = None
 
         logger.info(
-            "🔧 [Agent] NativeExplainAgent initialized with Spanish translation support"
+            f"🔧 [Agent] NativeExplainAgent initialized with Spanish translation support ({self.validation_mode} validation)"
         )
 
     @function_tool
@@ -53,43 +106,11 @@ class NativeExplainAgent(Agent):
         """
         logger.info(f"User correctly explained sense {sense_number}")
 
-        session_info = context.session.userdata
-        if isinstance(session_info, MySessionInfo) and session_info.target_lexical_item:
-            session_info.target_lexical_item.mark_sense_explained(sense_number)
-            remaining = session_info.target_lexical_item.remaining_senses
-
-            # Send RPC to frontend for toast notification (not terminal state, continue learning)
-            try:
-                # Find the first remote participant (should be the student)
-                for participant in get_job_context().room.remote_participants.values():
-                    await get_job_context().room.local_participant.perform_rpc(
-                        destination_identity=participant.identity,
-                        method="show_toast",
-                        payload=json.dumps(
-                            {
-                                "type": "success",
-                                "message": f"Great job! You explained sense {sense_number} correctly! ✓",
-                            }
-                        ),
-                        response_timeout=1.0,
-                    )
-                    logger.info(f"Sent success toast RPC to {participant.identity}")
-                    break
-            except Exception as e:
-                logger.error(f"Failed to send RPC: {e}")
-
-            # END SESSION AFTER ONE CORRECT SENSE
-            # Schedule terminal success state immediately for single correct answer
-            asyncio.create_task(  # noqa: RUF006
-                TerminalStateManager.handle_success(
-                    f"Excellent! You correctly explained sense {sense_number} of this phrasal verb! 🎉",
-                    delay_seconds=5.0,  # Delay to allow agent to finish speaking
-                )
-            )
-
-            return f"Excellent! You correctly explained sense {sense_number}. Great job understanding this phrasal verb!"
+        if self._decision is not None:
+            return self._already_decided_reply("success")
 
-        return "Good work on explaining that sense!"
+        speech = await self._complete_correct_sense(context.session, sense_number)
+        return self._final_speech(context, speech)
 
     @function_tool
     async def wrong_answer(
@@ -107,6 +128,10 @@ class NativeExplainAgent(Agent):
         """
         logger.info("User provided incorrect explanation")
 
+        if self._decision is not None:
+            return self._already_decided_reply("failure")
+        self._decision = "failure"
+
         # END SESSION FOR WRONG ANSWERS
         response = f"Not quite right. The correct definition is: {correct_definition}"
         if helpful_hint:
@@ -122,7 +147,7 @@ class NativeExplainAgent(Agent):
             )
         )
 
-        return response
+        return self._final_speech(context, response)
 
     @function_tool
     async def all_senses_completed(self, context: RunContext):
@@ -131,6 +156,10 @@ class NativeExplainAgent(Agent):
         This should only be called once all senses have been correctly explained and marked as complete."""
         logger.info("All senses completed successfully")
 
+        if self._decision is not None:
+            return self._already_decided_reply("success")
+        self._decision = "success"
+
         session_info = context.session.userdata
         if isinstance(session_info, MySessionInfo) and session_info.target_lexical_item:
             phrase = session_info.target_lexical_item.phrase
@@ -144,7 +173,10 @@ class NativeExplainAgent(Agent):
                 )
             )
 
-            return f"Congratulations {session_info.user_name}! You've successfully explained all {total_senses} senses of '{phrase}'. Great work on expanding your vocabulary!"
+            return self._final_speech(
+                context,
+                f"Congratulations {session_info.user_name}! You've successfully explained all {total_senses} senses of '{phrase}'. Great work on expanding your vocabulary!",
+            )
 
         # Schedule terminal success state for fallback case with delay
         asyncio.create_task(  # noqa: RUF006
@@ -154,7 +186,10 @@ class NativeExplainAgent(Agent):
             )
         )
 
-        return "Congratulations! You've completed explaining all the senses of this phrasal verb."
+        return self._final_speech(
+            context,
+            "Congratulations! You've completed explaining all the senses of this phrasal verb.",
+        )
 
     @function_tool
     async def request_clarification(
@@ -181,25 +216,27 @@ class NativeExplainAgent(Agent):
         if isinstance(session_info, MySessionInfo) and session_info.target_lexical_item:
             target_item = session_info.target_lexical_item
 
-            # Build the initial instructions with the target phrasal verb data
-            instructions = f"""The TARGET LEXICAL ITEM IS '{target_item.phrase}'. This phrasal verb has {target_item.total_senses} different meanings.
-
-Ask the user to explain what this phrasal verb means. When they explain a meaning, determine which of the {target_item.total_senses} senses they are explaining and whether it's correct.
-
-The {target_item.total_senses} senses are:
-"""
-            for sense in target_item.senses:
-                instructions += f"{sense.sense_number}. {sense.definition} (Example: {sense.examples[0]})\n"
-
-            instructions += (
-                f"\nStart by asking '¿Qué significa esta palabra, o verbo frasal?' without mentioning '{target_item.phrase}'. "
-                f"Only reveal the target word when they ask what word you're referring to."
-            )
-
             logger.info(f"🎯 [Agent] Starting conversation about: {target_item.phrase}")
 
-            # Generate the initial message to the user
-            self.session.generate_reply(instructions=instructions)
+            # Generate the initial message to the user (or reuse a cached one)
+            greet(
+                self,
+                card_id=session_info.card_id or target_item.phrase,
+                persona=TTS_VOICE,
+                prompt_version=NATIVE_EXPLAIN_GREETING_PROMPT_VERSION,
+                instructions=native_explain_greeting_instructions(
+                    target_item.phrase,
+                    [
+                        {
+                            "senseNumber": sense.sense_number,
+                            "definition": sense.definition,
+                            "examples": sense.examples,
+                        }
+                        for sense in target_item.senses
+                    ],
+                ),
+                metrics=session_info.metrics,
+            )
         else:
             # Fallback if no target lexical item is set
             logger.warning("🎯 [Agent] No target lexical item found in session")
@@ -210,18 +247,59 @@ The {target_item.total_senses} senses are:
     async def on_user_turn_completed(
         self, turn_ctx: ChatContext, new_message: ChatMessage
     ) -> None:
-        """RAG method to validate Spanish translations before LLM processing."""
+        """RAG method to validate Spanish translations alongside LLM processing."""
         session_info = self.session.userdata
 
         if (
             not isinstance(session_info, MySessionInfo)
             or not session_info.target_lexical_item
+            or self._decision is not None
         ):
             return
 
         target_item = session_info.target_lexical_item
-        user_response = new_message.content
+        user_response = new_message.text_content or ""
+
+        # A verdict that arrived too late for the previous turn informs this one
+        if self._pending_validation_note:
+            turn_ctx.add_message(role="system", content=self._pending_validation_note)
+            self._pending_validation_note = None
+
+        if self.validation_mode == "parallel":
+            # Don't block the main reply - the verdict is applied when it lands
+            if self._validation_task and not self._validation_task.done():
+                self._validation_task.cancel()
+            self._validation_task = asyncio.create_task(
+                self._apply_parallel_validation(target_item, user_response)
+            )
+            return
+
+        result = await self._validate_spanish(target_item, user_response)
+        if result is None:
+            return
+
+        # If Spanish translation was detected, add context to guide the agent
+        note = self._validation_note(result)
+        if note:
+            turn_ctx.add_message(role="system", content=note)
+            if result.get("correct_sense"):
+                logger.info(
+                    f"✅ Spanish translation validated for sense {result['correct_sense']}: {user_response}"
+                )
+            else:
+                logger.info(
+                    f"❌ Incorrect Spanish translation detected: {user_response}"
+                )
 
+    async def on_exit(self) -> None:
+        """Called when the agent is replaced or the session closes."""
+        if self._validation_task and not self._validation_task.done():
+            self._validation_task.cancel()
+
+    async def _validate_spanish(
+        self, target_item: TargetLexicalItem, user_response: str
+    ) -> Optional[dict]:
+        """Ask the validation LLM whether the response is a correct Spanish translation."""
         # Build sense definitions for RAG validation
         senses_info = ""
         for sense in target_item.senses:
@@ -256,51 +334,183 @@ Respond in JSON format:
 {{"is_spanish": boolean, "correct_sense": number or null, "explanation": "brief explanation"}}
 """
 
+        chat_ctx = ChatContext()
+        chat_ctx.add_message(
+            role="system",
+            content="You are a language validation assistant. Respond only in JSON format.",
+        )
+        chat_ctx.add_message(role="user", content=validation_prompt)
+
+        metrics = self._session_metrics()
+        start = time.perf_counter()
         try:
-            # Create a simple LLM instance for RAG validation
-            llm = openai.LLM(model="gpt-4o-mini")
-            validation_response = await llm.chat(
-                messages=[
-                    ChatMessage.system(
-                        "You are a language validation assistant. Respond only in JSON format."
-                    ),
-                    ChatMessage.user(validation_prompt),
-                ]
+            chunks: list[str] = []
+            async with self.validation_llm.chat(
+                chat_ctx=chat_ctx, response_format={"type": "json_object"}
+            ) as stream:
+                async for chunk in stream:
+                    if chunk.delta and chunk.delta.content:
+                        chunks.append(chunk.delta.content)
+
+            result = json.loads("".join(chunks))
+        except Exception as e:
+            logger.error(f"Failed to validate Spanish translation: {e}")
+            # Continue without validation on error
+            self.spanish_validation_result = None
+            return None
+        finally:
+            latency = time.perf_counter() - start
+            if metrics:
+                metrics.record(f"spanish_validation.latency.{self.validation_mode}", latency)
+            logger.info(
+                f"⏱️ [Agent] Spanish validation took {latency * 1000:.0f}ms ({self.validation_mode} mode)"
             )
 
-            # Parse the validation result
-            import json
+        # Store result for function tools to use
+        self.spanish_validation_result = result
+        return result
 
-            result = json.loads(validation_response.content)
+    async def _apply_parallel_validation(
+        self, target_item: TargetLexicalItem, user_response: str
+    ) -> None:
+        """Apply a validator verdict that finished while the main reply was generating."""
+        result = await self._validate_spanish(target_item, user_response)
+        if result is None or not result.get("is_spanish"):
+            return
 
-            # Store result for function tools to use
-            self.spanish_validation_result = result
+        metrics = self._session_metrics()
+        sense_number = self._valid_sense_number(target_item, result.get("correct_sense"))
 
-            # If Spanish translation is correct, add context to help the agent
-            if result.get("is_spanish") and result.get("correct_sense"):
-                # Inject context into the chat to guide the agent
-                turn_ctx.messages.append(
-                    ChatMessage.system(
-                        f"[SPANISH TRANSLATION DETECTED] The user provided a correct Spanish translation for sense {result['correct_sense']}. "
-                        f"Call correct_sense_explained with sense_number={result['correct_sense']} immediately."
-                    )
+        if self._decision is not None:
+            # First decision wins - only record disagreement
+            if (self._decision == "success") != (sense_number is not None):
+                if metrics:
+                    metrics.increment("spanish_validation.contradictions")
+                logger.warning(
+                    f"⚠️ [Agent] Validator verdict {result} contradicts earlier '{self._decision}' decision - keeping the earlier one"
                 )
-                logger.info(
-                    f"✅ Spanish translation validated for sense {result['correct_sense']}: {user_response}"
-                )
-            elif result.get("is_spanish") and not result.get("correct_sense"):
-                # Spanish but incorrect
-                turn_ctx.messages.append(
-                    ChatMessage.system(
-                        f"[SPANISH TRANSLATION DETECTED] The user provided a Spanish response but it doesn't correctly match any sense. "
-                        f"Call wrong_answer and provide the correct definition."
+            return
+
+        if sense_number is not None:
+            logger.info(
+                f"✅ Spanish translation validated mid-turn for sense {sense_number}: {user_response}"
+            )
+            if metrics:
+                metrics.increment("spanish_validation.applied_mid_turn")
+            speech = await self._complete_correct_sense(self.session, sense_number)
+            self.session.say(speech)
+        else:
+            # Never fail the learner on the lenient validator alone
+            if metrics:
+                metrics.increment("spanish_validation.deferred_to_next_turn")
+            self._pending_validation_note = self._validation_note(result)
+            logger.info(
+                f"❌ Incorrect Spanish translation detected, deferring to next turn: {user_response}"
+            )
+
+    async def _complete_correct_sense(self, session, sense_number: int) -> str:
+        """Shared success path for the tool call and the parallel validator."""
+        self._decision = "success"
+
+        session_info = session.userdata
+        if isinstance(session_info, MySessionInfo) and session_info.target_lexical_item:
+            session_info.target_lexical_item.mark_sense_explained(sense_number)
+
+            # Send RPC to frontend for toast notification (not terminal state, continue learning)
+            try:
+                # Find the first remote participant (should be the student)
+                for participant in get_job_context().room.remote_participants.values():
+                    await get_job_context().room.local_participant.perform_rpc(
+                        destination_identity=participant.identity,
+                        method="show_toast",
+                        payload=json.dumps(
+                            {
+                                "type": "success",
+                                "message": f"Great job! You explained sense {sense_number} correctly! ✓",
+                            }
+                        ),
+                        response_timeout=1.0,
                     )
+                    logger.info(f"Sent success toast RPC to {participant.identity}")
+                    break
+            except Exception as e:
+                logger.error(f"Failed to send RPC: {e}")
+
+            # END SESSION AFTER ONE CORRECT SENSE
+            # Schedule terminal success state immediately for single correct answer
+            asyncio.create_task(  # noqa: RUF006
+                TerminalStateManager.handle_success(
+                    f"Excellent! You correctly explained sense {sense_number} of this phrasal verb! 🎉",
+                    delay_seconds=5.0,  # Delay to allow agent to finish speaking
                 )
-                logger.info(
-                    f"❌ Incorrect Spanish translation detected: {user_response}"
-                )
+            )
 
-        except Exception as e:
-            logger.error(f"Failed to validate Spanish translation: {e}")
-            # Continue without validation on error
-            self.spanish_validation_result = None
+            return f"Excellent! You correctly explained sense {sense_number}. Great job understanding this phrasal verb!"
+
+        return "Good work on explaining that sense!"
+
+    def _final_speech(self, context: RunContext, text: str) -> Optional[str]:
+        """Return a terminal tool result, speaking it directly when enabled.
+
+        Returning None from a tool tells the framework no follow-up reply is
+        needed, so the text goes to TTS without another LLM call.
+        """
+        metrics = self._session_metrics()
+        if not self.speak_tool_results:
+            if metrics:
+                metrics.increment("tool_results.via_llm")
+            return text
+
+        if metrics:
+            metrics.increment("tool_results.spoken_directly")
+        context.session.say(text)
+        return None
+
+    def _already_decided_reply(self, attempted: str) -> Optional[str]:
+        """Tool result once the session is decided: silent if consistent, steering if not."""
+        if attempted == self._decision:
+            # Whoever decided first has already produced the closing speech
+            return None
+
+        metrics = self._session_metrics()
+        if metrics:
+            metrics.increment("spanish_validation.contradictions")
+        logger.warning(
+            f"⚠️ [Agent] Tool tried to record '{attempted}' after '{self._decision}' was decided - keeping the earlier decision"
+        )
+        if self._decision == "success":
+            return "This answer was already accepted as correct. Do not contradict it; briefly congratulate the user."
+        return "This session has already ended with the correct definition. Do not change the verdict; briefly encourage the user."
+
+    @staticmethod
+    def _valid_sense_number(
+        target_item: TargetLexicalItem, correct_sense
+    ) -> Optional[int]:
+        try:
+            sense_number = int(correct_sense)
+        except (TypeError, ValueError):
+            return None
+        if any(sense.sense_number == sense_number for sense in target_item.senses):
+            return sense_number
+        return None
+
+    @staticmethod
+    def _validation_note(result: dict) -> Optional[str]:
+        if result.get("is_spanish") and result.get("correct_sense"):
+            return (
+                f"[SPANISH TRANSLATION DETECTED] The user provided a correct Spanish translation for sense {result['correct_sense']}. "
+                f"Call correct_sense_explained with sense_number={result['correct_sense']} immediately."
+            )
+        if result.get("is_spanish"):
+            return (
+                "[SPANISH TRANSLATION DETECTED] The user provided a Spanish response but it doesn't correctly match any sense. "
+                "Call wrong_answer and provide the correct definition."
+            )
+        return None
+
+    def _session_metrics(self) -> Optional[SessionMetrics]:
+        """Metrics of the current session, or None outside a MySessionInfo session."""
+        session_info = self.session.userdata
+        if isinstance(session_info, MySessionInfo):
+            return session_info.metrics
+        return None
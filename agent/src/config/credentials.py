@@ -1,4 +1,5 @@
 import base64
+import functools
 import json
 import logging
 import os
@@ -6,11 +7,13 @@ import os
 logger = logging.getLogger("agent.config")
 
 
+@functools.cache
 def parse_google_credentials():
     """Parse Google Cloud credentials from environment variable with proper error handling.
 
     Supports both regular JSON and base64-encoded JSON for better compatibility
-    with different deployment environments.
+    with different deployment environments. Parsed once per process and shared
+    by every TTS client; callers must not mutate the returned dict.
     """
     credentials_b64 = os.getenv("GOOGLE_APPLICATION_CREDENTIALS_B64")
     credentials_json = os.getenv("GOOGLE_APPLICATION_CREDENTIALS_JSON")
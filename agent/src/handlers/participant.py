@@ -1,15 +1,181 @@
+import asyncio
+import functools
 import json
 import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, NamedTuple, Optional
 
-from livekit.agents import AgentSession
+from livekit.agents import Agent, AgentSession
 
-from models.session import MySessionInfo, create_target_lexical_item
+from models.session import MySessionInfo, TargetLexicalItem, create_target_lexical_item
+from services.terminal_state_manager import TerminalStateManager
+from services.voice_catalog import expand_voice_persona
 
 logger = logging.getLogger("agent.handlers")
 
+AgentBuilder = Callable[[], Agent]
 
-def process_participant_data(participant, session: AgentSession):
-    """Process participant data and return appropriate agent based on activity type."""
+
+@dataclass
+class CardState:
+    """Per-card session state, applied only once the card's agent is built."""
+
+    card_id: Optional[str]
+    target_lexical_item: Optional[TargetLexicalItem] = None
+
+    def apply(self, session: AgentSession) -> None:
+        session_info = session.userdata
+        if isinstance(session_info, MySessionInfo):
+            session_info.card_id = self.card_id
+            session_info.target_lexical_item = self.target_lexical_item
+
+
+class AgentSelection(NamedTuple):
+    builder: AgentBuilder
+    card: CardState
+
+
+async def build_agent(
+    participant,
+    session: AgentSession,
+    shared_models: Optional[dict[str, Any]] = None,
+    in_executor: Optional[bool] = None,
+) -> Optional[Agent]:
+    """Async factory for the agent matching this participant's metadata.
+
+    Metadata parsing is cheap and stays on the event loop. The agent constructor
+    (plugin clients, credentials, any model not supplied in `shared_models`) runs
+    in a worker thread so it can't stall audio for other tracks.
+    `asyncio.to_thread` copies context vars, so the job context stays visible.
+    """
+    return await build_agent_from_metadata(
+        extract_participant_metadata(participant), session, shared_models, in_executor
+    )
+
+
+async def build_agent_from_metadata(
+    metadata_json: Optional[str],
+    session: AgentSession,
+    shared_models: Optional[dict[str, Any]] = None,
+    in_executor: Optional[bool] = None,
+) -> Optional[Agent]:
+    """Async factory for the agent described by card metadata (token or RPC payload)."""
+    prepared = await prepare_agent_from_metadata(
+        metadata_json, session, shared_models, in_executor
+    )
+    if prepared is None:
+        return None
+
+    agent, card = prepared
+    card.apply(session)
+    return agent
+
+
+async def prepare_agent_from_metadata(
+    metadata_json: Optional[str],
+    session: AgentSession,
+    shared_models: Optional[dict[str, Any]] = None,
+    in_executor: Optional[bool] = None,
+) -> Optional[tuple[Agent, CardState]]:
+    """Build the card's agent without touching the session.
+
+    Returns None if the metadata is invalid or the agent constructor rejects it
+    (ValueError); the caller applies the returned card state when it actually
+    switches to the agent.
+    """
+    selection = select_agent_builder_for_metadata(metadata_json, session, shared_models)
+    if selection is None:
+        return None
+
+    if in_executor is None:
+        in_executor = os.getenv("BUILD_AGENTS_IN_EXECUTOR", "true").lower() == "true"
+
+    start = time.perf_counter()
+    try:
+        agent = (
+            await asyncio.to_thread(selection.builder)
+            if in_executor
+            else selection.builder()
+        )
+    except ValueError as e:
+        logger.error(f"🎯 [Agent] ❌ Could not build the card's agent: {e}")
+        return None
+    elapsed = time.perf_counter() - start
+
+    session_info = session.userdata
+    if isinstance(session_info, MySessionInfo):
+        session_info.metrics.record("agent_factory.build", elapsed)
+    logger.info(
+        f"🏗️ [Agent] Built {type(agent).__name__} in {elapsed * 1000:.0f}ms ({'executor' if in_executor else 'inline'})"
+    )
+    return agent, selection.card
+
+
+async def start_next_card(
+    metadata_json: Optional[str],
+    session: AgentSession,
+    shared_models: Optional[dict[str, Any]] = None,
+    in_executor: Optional[bool] = None,
+) -> Optional[Agent]:
+    """Hand a running session off to the agent for the next card.
+
+    The agent is built first: if the metadata is invalid or construction fails,
+    None is returned and the current card keeps its state and pending closures.
+    """
+    try:
+        prepared = await prepare_agent_from_metadata(
+            metadata_json, session, shared_models, in_executor
+        )
+    except Exception as e:
+        logger.error(f"🔀 [Agent] ❌ Failed to build the next card's agent: {e}")
+        return None
+    if prepared is None:
+        return None
+
+    agent, card = prepared
+    TerminalStateManager.start_new_card()
+    session_info = session.userdata
+    if isinstance(session_info, MySessionInfo):
+        session_info.reset_for_next_card()
+    card.apply(session)
+    # Interrupt whatever the previous card was saying, then hand off
+    session.interrupt()
+    session.update_agent(agent)
+    return agent
+
+
+def process_participant_data(
+    participant,
+    session: AgentSession,
+    shared_models: Optional[dict[str, Any]] = None,
+) -> Optional[Agent]:
+    """Process participant data and return appropriate agent based on activity type.
+
+    Builds the agent inline and blocks the caller; prefer `build_agent` on the
+    event loop.
+    """
+    selection = select_agent_builder(participant, session, shared_models)
+    if selection is None:
+        return None
+    selection.card.apply(session)
+    return selection.builder()
+
+
+def select_agent_builder(
+    participant,
+    session: AgentSession,
+    shared_models: Optional[dict[str, Any]] = None,
+) -> Optional[AgentSelection]:
+    """Pick the agent for this participant's activity type without constructing it."""
+    return select_agent_builder_for_metadata(
+        extract_participant_metadata(participant), session, shared_models
+    )
+
+
+def extract_participant_metadata(participant) -> Optional[str]:
+    """Card metadata JSON from the participant token, or legacy voice card attributes."""
     logger.info("🎯 [Agent] ========== PROCESSING PARTICIPANT ==========")
     logger.info(f"🎯 [Agent] Processing participant: {participant.identity}")
     logger.info(f"🎯 [Agent] 🔄 CLOUD DEBUG: Participant type: {type(participant)}")
@@ -50,8 +216,25 @@ def process_participant_data(participant, session: AgentSession):
             )
         else:
             logger.warning("🎯 [Agent] ⚠️ NO VOICE CARD DATA in attributes either")
+            logger.warning(
+                f"🎯 [Agent] Available attribute keys: {list(participant.attributes.keys())}"
+            )
+
+    return metadata_json
 
-    session_info = session.userdata
+
+def select_agent_builder_for_metadata(
+    metadata_json: Optional[str],
+    session: AgentSession,
+    shared_models: Optional[dict[str, Any]] = None,
+) -> Optional[AgentSelection]:
+    """Pick the agent for this card's activity type without constructing it.
+
+    `shared_models` holds pre-built instances (e.g. `vad`, `turn_detection`) that
+    are passed to the agent constructor instead of loading new ones. The card's
+    session state comes back alongside the builder rather than being written here.
+    """
+    shared_models = shared_models or {}
 
     # Determine which agent to use based on metadata
     if metadata_json:
@@ -77,21 +260,36 @@ def process_participant_data(participant, session: AgentSession):
                         "🎭 [Agent] ⚠️ WARNING: voicePersona is missing from metadata. Using fallback voice configuration."
                     )
                     voice_persona = {}  # Will use fallback in ContextAgent
+                else:
+                    # Clients send only the voice name and card-specific persona fields
+                    voice_persona = expand_voice_persona(voice_persona)
 
                 logger.info(
                     f"🎭 [Agent] ✅ Voice persona: {voice_persona.get('persona', {}).get('name', 'Fallback') if voice_persona else 'Using fallback'}"
                 )
 
                 # Merge target lexical item info into scenario
-                scenario_data["phrasalVerb"] = target_phrasal.get("lexicalItem", "go on")
+                scenario_data["phrasalVerb"] = target_phrasal.get(
+                    "lexicalItem", "go on"
+                )
                 scenario_data["phrasalVerbDefinition"] = target_phrasal.get(
                     "definition", None
                 )
                 scenario_data["phrasalVerbExamples"] = target_phrasal.get(
                     "examples", []
                 )
+                # Precomputed by the content generator; absent on older cards
+                scenario_data["phrasalVerbInflections"] = target_phrasal.get(
+                    "inflections"
+                )
                 # conversationStarter should already be in scenario_data from frontend
 
+                # Older clients don't send the card id; the verb and character identify the card
+                card = CardState(
+                    card_id=metadata.get("cardId")
+                    or f"context-{scenario_data['phrasalVerb']}-{scenario_data.get('character', '')}"
+                )
+
                 logger.info("🎭 [Agent] ✅ SUCCESS: Creating ContextAgent for scenario")
                 logger.info(
                     f"🎭 [Agent] 🔄 CLOUD DEBUG: Scenario data: {scenario_data}"
@@ -109,9 +307,13 @@ def process_participant_data(participant, session: AgentSession):
                     f"🎭 [Agent] 🔄 CLOUD DEBUG: Phrasal verb: {scenario_data.get('phrasalVerb', 'NOT_FOUND')}"
                 )
 
-                return ContextAgent(
-                    scenario_data=scenario_data, voice_persona=voice_persona
+                builder = functools.partial(
+                    ContextAgent,
+                    scenario_data=scenario_data,
+                    voice_persona=voice_persona,
+                    **shared_models,
                 )
+                return AgentSelection(builder, card)
 
             else:
                 # Default to voice card explanation mode
@@ -138,22 +340,23 @@ def process_participant_data(participant, session: AgentSession):
                     f"🎯 [Agent] Created target lexical item with {target_item.total_senses} senses"
                 )
 
-                # Update session info with dynamic data
-                if isinstance(session_info, MySessionInfo):
-                    session_info.target_lexical_item = target_item
-                    session.userdata = session_info
-
+                card = CardState(
+                    card_id=voice_card_data.get("id") or verb,
+                    target_lexical_item=target_item,
+                )
                 logger.info(
-                    f"🎯 [Agent] ✅ COMPLETE: Updated session with voice card data for: {verb}"
+                    f"🎯 [Agent] ✅ COMPLETE: Parsed voice card data for: {verb}"
                 )
 
                 # Return the NativeExplainAgent for voice card mode
                 # The agent will access the session data and start the conversation
                 from agents.native_explain_agent import NativeExplainAgent
 
-                return NativeExplainAgent()
+                return AgentSelection(
+                    functools.partial(NativeExplainAgent, **shared_models), card
+                )
 
-        except (json.JSONDecodeError, KeyError) as e:
+        except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
             logger.error(f"🎯 [Agent] ❌ Failed to parse metadata: {e}")
             logger.error(f"🎯 [Agent] Raw JSON that failed: {metadata_json}")
             logger.error(
@@ -162,15 +365,7 @@ def process_participant_data(participant, session: AgentSession):
             # Don't fallback to NativeExplainAgent - return None to wait for proper metadata
             return None
     else:
-        logger.warning(
-            "🎯 [Agent] ❌ No metadata found in token or participant attributes"
-        )
-        logger.warning(
-            f"🎯 [Agent] Available attribute keys: {list(participant.attributes.keys())}"
-        )
-        logger.warning(
-            f"🎯 [Agent] Participant metadata: {getattr(participant, 'metadata', 'None')}"
-        )
+        logger.warning("🎯 [Agent] ❌ No card metadata found")
         logger.warning(
             "🎯 [Agent] 🔄 CLOUD DEBUG: No metadata found - returning None to wait for proper connection"
         )
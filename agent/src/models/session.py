@@ -1,6 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
+from services.session_metrics import SessionMetrics
+
 
 @dataclass
 class LexicalSense:
@@ -46,6 +48,18 @@ class MySessionInfo:
     user_name: str
     age: int
     target_lexical_item: Optional[TargetLexicalItem]
+    metrics: SessionMetrics = field(default_factory=SessionMetrics)
+    card_index: int = 0  # position of the current card within this room
+    card_id: Optional[str] = None
+
+    def reset_for_next_card(self) -> None:
+        """Clear per-card state before the next card starts in the same room.
+
+        The learner and the session metrics carry over.
+        """
+        self.target_lexical_item = None
+        self.card_id = None
+        self.card_index += 1
 
 
 def create_target_lexical_item(
@@ -0,0 +1,77 @@
+"""Instructions for the opening line of each agent.
+
+Kept free of LiveKit imports so the content pipeline can pre-generate greetings
+with exactly the prompts the agents use. The greeting cache key hashes the
+agent's system prompt and these instructions; bump the version for changes the
+prompts don't show, such as a different greeting model.
+"""
+
+CONTEXT_GREETING_PROMPT_VERSION = "context-v1"
+NATIVE_EXPLAIN_GREETING_PROMPT_VERSION = "native-explain-v1"
+
+
+def context_agent_instructions(
+    character: str, situation: str, teaching_style: str, context_text: str
+) -> str:
+    """ContextAgent's system prompt for one scenario."""
+    return f"""You are {character} in this scenario: {situation}
+
+Teaching style: {teaching_style}
+
+Your role:
+1. Act naturally as {character} - you are NOT talking to someone with the same name as you
+2. The user is your colleague/employee, address them appropriately (not by your own name)
+3. Keep conversations brief and natural - do NOT provide lengthy explanations upfront
+4. Be vague initially about problems - let the user ask for details
+5. Do NOT mention the phrasal verb directly
+6. Stay in character at all times
+7. Speak concisely - one or two sentences maximum per turn
+
+Context: {context_text}"""
+
+
+def context_greeting_instructions(character: str, conversation_starter: str) -> str:
+    """Instructions for ContextAgent's first turn."""
+    # Use conversationStarter from scenario data
+    if conversation_starter:
+        # Remove [username] placeholder if present
+        greeting = conversation_starter.replace("[username]", "").strip()
+
+        # Special case: For Mr. Williams "go on" scenario, be more vague initially
+        # This specific greeting gives away too much detail upfront
+        if "Mr. Williams" in character and "bad has happened" in greeting:
+            greeting = "I need to speak with you about something urgent."
+            instruction_prefix = (
+                "Start with this brief opener and wait for their response: "
+            )
+        else:
+            # For other scenarios (pick up, come back, close down), use the original starter
+            # These are appropriately contextual without giving away the solution
+            instruction_prefix = "Start the conversation naturally: "
+    else:
+        greeting = "Hello! Where were we?"
+        instruction_prefix = "Start with this greeting: "
+
+    return f"{instruction_prefix}'{greeting}'"
+
+
+def native_explain_greeting_instructions(phrase: str, senses: list[dict]) -> str:
+    """Instructions for NativeExplainAgent's first turn.
+
+    `senses` are dicts with `senseNumber`, `definition` and `examples`, as in the
+    card JSON.
+    """
+    instructions = f"""The TARGET LEXICAL ITEM IS '{phrase}'. This phrasal verb has {len(senses)} different meanings.
+
+Ask the user to explain what this phrasal verb means. When they explain a meaning, determine which of the {len(senses)} senses they are explaining and whether it's correct.
+
+The {len(senses)} senses are:
+"""
+    for sense in senses:
+        instructions += f"{sense['senseNumber']}. {sense['definition']} (Example: {sense['examples'][0]})\n"
+
+    instructions += (
+        f"\nStart by asking '¿Qué significa esta palabra, o verbo frasal?' without mentioning '{phrase}'. "
+        f"Only reveal the target word when they ask what word you're referring to."
+    )
+    return instructions
@@ -1,11 +1,15 @@
+import functools
 import os
 
 import yaml
 
 
+@functools.cache
 def load_prompt(prompt_name: str) -> str:
     """Load a prompt from a YAML file.
 
+    Prompts are read once per process; later calls return the cached text.
+
     Args:
         prompt_name: The name of the prompt file (without .yaml extension)
 
@@ -0,0 +1,168 @@
+"""Sharded card storage with a small index for O(1) single-card reads.
+
+Cards are written as compact JSON lines into one shard per lexical item
+(`<slug>.jsonl`), and `index.json` lists every card with its id, type,
+difficulty, lexical item, shard file, byte offset and length. Reading one card
+is a single seek + read of its own bytes instead of parsing the whole deck.
+
+Shard an existing monolithic deck from the agent directory:
+
+    python src/services/card_store.py build ../app/generated_data/voice-cards.json
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+from collections.abc import Iterator
+from typing import IO, Any, Optional
+
+logger = logging.getLogger("agent.card_store")
+
+INDEX_FILE = "index.json"
+CARDS_DIR = "cards"
+INDEX_VERSION = 1
+
+
+def card_slug(lexical_item: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", lexical_item.lower()).strip("-") or "card"
+
+
+def _card_lexical_item(card: dict) -> str:
+    return card.get("targetLexicalItem", {}).get("lexicalItem", "")
+
+
+class CardShardWriter:
+    """Appends cards to per-lexical-item shards and records their offsets."""
+
+    def __init__(self, cards_dir: str):
+        self.cards_dir = cards_dir
+        os.makedirs(cards_dir, exist_ok=True)
+        self.entries: list[dict[str, Any]] = []
+        self._shards: dict[str, IO[bytes]] = {}
+
+    def add(self, card: dict) -> dict[str, Any]:
+        lexical_item = _card_lexical_item(card)
+        file_name = f"{card_slug(lexical_item)}.jsonl"
+        shard = self._shards.get(file_name)
+        if shard is None:
+            # Truncate on first use so rebuilding over an old directory starts clean
+            shard = self._shards[file_name] = open(  # noqa: SIM115 - stays open across add() calls until close()
+                os.path.join(self.cards_dir, file_name), "wb"
+            )
+
+        line = (
+            json.dumps(card, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            + b"\n"
+        )
+        entry = {
+            "id": card["id"],
+            "type": card["type"],
+            "difficulty": card.get("difficulty"),
+            "lexicalItem": lexical_item,
+            "file": file_name,
+            "offset": shard.tell(),
+            "length": len(line),
+        }
+        shard.write(line)
+        self.entries.append(entry)
+        return entry
+
+    def close(self, metadata: Optional[dict[str, Any]] = None) -> str:
+        """Flush the shards and write the index (atomically). Returns its path."""
+        for shard in self._shards.values():
+            shard.close()
+        self._shards.clear()
+
+        index = {
+            "version": INDEX_VERSION,
+            **(metadata or {}),
+            "totalCards": len(self.entries),
+            "cards": self.entries,
+        }
+        index_path = os.path.join(self.cards_dir, INDEX_FILE)
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, index_path)
+        return index_path
+
+
+def write_card_shards(
+    cards: list[dict], cards_dir: str, metadata: Optional[dict[str, Any]] = None
+) -> str:
+    writer = CardShardWriter(cards_dir)
+    for card in cards:
+        writer.add(card)
+    return writer.close(metadata)
+
+
+class CardStore:
+    """Reads single cards (or filtered subsets) through the index."""
+
+    def __init__(self, cards_dir: str):
+        self.cards_dir = cards_dir
+        with open(os.path.join(cards_dir, INDEX_FILE), encoding="utf-8") as f:
+            self.index: dict[str, Any] = json.load(f)
+        self.entries: list[dict[str, Any]] = self.index["cards"]
+        self._by_id = {entry["id"]: entry for entry in self.entries}
+
+    @staticmethod
+    def exists(cards_dir: str) -> bool:
+        return os.path.exists(os.path.join(cards_dir, INDEX_FILE))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def read(self, entry: dict[str, Any]) -> dict:
+        with open(os.path.join(self.cards_dir, entry["file"]), "rb") as f:
+            f.seek(entry["offset"])
+            return json.loads(f.read(entry["length"]))
+
+    def get(self, card_id: str) -> Optional[dict]:
+        entry = self._by_id.get(card_id)
+        return self.read(entry) if entry else None
+
+    def at(self, position: int) -> dict:
+        return self.read(self.entries[position])
+
+    def find(
+        self, card_type: Optional[str] = None, lexical_item: Optional[str] = None
+    ) -> list[dict]:
+        """Index entries matching a card type and/or lexical item (case-insensitive)."""
+        wanted = lexical_item.lower() if lexical_item else None
+        return [
+            entry
+            for entry in self.entries
+            if (card_type is None or entry["type"] == card_type)
+            and (wanted is None or entry["lexicalItem"].lower() == wanted)
+        ]
+
+    def iter_cards(self, card_type: Optional[str] = None) -> Iterator[dict]:
+        for entry in self.find(card_type=card_type):
+            yield self.read(entry)
+
+
+def shard_voice_cards(voice_cards_path: str, cards_dir: Optional[str] = None) -> str:
+    """Shard a monolithic voice-cards.json into `cards/` next to it."""
+    with open(voice_cards_path, encoding="utf-8") as f:
+        data = json.load(f)
+    cards_dir = cards_dir or os.path.join(
+        os.path.dirname(os.path.abspath(voice_cards_path)), CARDS_DIR
+    )
+    metadata = {
+        k: v for k, v in data.items() if k not in ("voiceCardTypes", "totalCards")
+    }
+    return write_card_shards(data["voiceCardTypes"], cards_dir, metadata)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] != "build":
+        sys.exit(
+            "Usage: python src/services/card_store.py build <voice-cards.json> [cards_dir]"
+        )
+    index_path = shard_voice_cards(
+        sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None
+    )
+    print(f"✅ Wrote card index to {index_path}")
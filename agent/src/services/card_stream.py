@@ -0,0 +1,190 @@
+"""Append-only NDJSON stream of cards, written as the generator finishes them.
+
+`CardStreamWriter` appends one compact JSON line per card and fsyncs in
+batches (every `fsync_every` cards or `fsync_interval` seconds), so a crash
+loses at most one batch and readers never see a half-written card. When the
+run ends a trailer line (`{"streamComplete": true, ...}`) marks the stream as
+finished. `tail_cards` follows a stream while it's being written, and
+`compact_card_stream` turns a finished stream into the sharded, indexed deck
+from `services.card_store`.
+
+Follow a stream from the agent directory:
+
+    python src/services/card_stream.py tail ../content-generation/output/<run>/cards.ndjson
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any, Optional
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.card_store import CardShardWriter
+
+logger = logging.getLogger("agent.card_stream")
+
+STREAM_FILE = "cards.ndjson"
+TRAILER_KEY = "streamComplete"
+
+
+class CardStreamWriter:
+    """Thread-safe NDJSON appender with batched fsync."""
+
+    def __init__(self, path: str, fsync_every: int = 16, fsync_interval: float = 1.0):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.cards_written = 0
+        self.fsyncs = 0
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "ab")  # noqa: SIM115 - long-lived append handle, closed in close()
+
+    def append(self, *cards: dict) -> None:
+        lines = b"".join(
+            json.dumps(card, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            + b"\n"
+            for card in cards
+        )
+        with self._lock:
+            # One write per call, so a tailer sees whole lines or nothing new
+            self._file.write(lines)
+            self._file.flush()
+            self.cards_written += len(cards)
+            self._pending += len(cards)
+            if (
+                self._pending >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._sync()
+
+    def _sync(self) -> None:
+        os.fsync(self._file.fileno())
+        self.fsyncs += 1
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self, metadata: Optional[dict[str, Any]] = None) -> None:
+        """Write the trailer and make everything durable."""
+        with self._lock:
+            trailer = {
+                TRAILER_KEY: True,
+                "totalCards": self.cards_written,
+                **(metadata or {}),
+            }
+            self._file.write(
+                json.dumps(trailer, separators=(",", ":")).encode("utf-8") + b"\n"
+            )
+            self._file.flush()
+            self._sync()
+            self._file.close()
+
+
+def _scan(
+    path: str, follow: bool, poll_interval: float
+) -> Iterator[tuple[int, int, dict]]:
+    """(offset, length, record) for every complete line, trailer included."""
+    while follow and not os.path.exists(path):
+        time.sleep(poll_interval)
+
+    with open(path, "rb") as f:
+        offset = 0
+        partial = b""
+        while True:
+            chunk = f.readline()
+            if not chunk:
+                if not follow:
+                    return
+                time.sleep(poll_interval)
+                continue
+            partial += chunk
+            if not partial.endswith(b"\n"):
+                continue  # Writer is mid-line; wait for the rest
+            line, length = partial, len(partial)
+            partial = b""
+            record = json.loads(line)
+            yield offset, length, record
+            offset += length
+            if follow and record.get(TRAILER_KEY):
+                return
+
+
+def tail_cards(
+    path: str, follow: bool = True, poll_interval: float = 0.5
+) -> Iterator[dict]:
+    """Yield cards as they're appended; stops at the trailer (or at EOF without `follow`)."""
+    for _, _, record in _scan(path, follow, poll_interval):
+        if not record.get(TRAILER_KEY):
+            yield record
+
+
+def read_trailer(path: str) -> Optional[dict]:
+    """The last trailer of a finished stream, or None if the run didn't complete."""
+    trailer = None
+    for _, _, record in _scan(path, follow=False, poll_interval=0):
+        trailer = record if record.get(TRAILER_KEY) else None
+    return trailer
+
+
+def compact_card_stream(
+    stream_path: str,
+    cards_dir: str,
+    metadata: Optional[dict[str, Any]] = None,
+    order: Optional[list[str]] = None,
+) -> str:
+    """Rewrite a stream into per-verb shards plus index.json. Returns the index path.
+
+    Only offsets are held in memory; cards are copied one at a time. `order` lists
+    card ids in deck order (stream order is completion order); later duplicates of
+    an id (e.g. from a resumed run) replace earlier ones. Index metadata defaults
+    to the last trailer's.
+    """
+    offsets: dict[str, tuple[int, int]] = {}
+    trailer: dict[str, Any] = {}
+    for offset, length, record in _scan(stream_path, follow=False, poll_interval=0):
+        if record.get(TRAILER_KEY):
+            trailer = record
+        else:
+            offsets[record["id"]] = (offset, length)
+    if metadata is None:
+        metadata = {
+            k: v for k, v in trailer.items() if k not in (TRAILER_KEY, "totalCards")
+        }
+
+    ids = (
+        [card_id for card_id in order if card_id in offsets] if order else list(offsets)
+    )
+    missing = [card_id for card_id in (order or []) if card_id not in offsets]
+    if missing:
+        logger.warning(
+            f"⚠️ {len(missing)} cards missing from {stream_path}: {missing[:5]}"
+        )
+
+    writer = CardShardWriter(cards_dir)
+    with open(stream_path, "rb") as f:
+        for card_id in ids:
+            offset, length = offsets[card_id]
+            f.seek(offset)
+            writer.add(json.loads(f.read(length)))
+    return writer.close(metadata)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("tail", "compact"):
+        sys.exit(
+            "Usage: python src/services/card_stream.py tail <cards.ndjson>\n"
+            "       python src/services/card_stream.py compact <cards.ndjson> <cards_dir>"
+        )
+    if sys.argv[1] == "tail":
+        for card in tail_cards(sys.argv[2]):
+            print(f"🃏 {card['id']} ({card['type']})", flush=True)
+    else:
+        print(f"✅ Wrote card index to {compact_card_stream(sys.argv[2], sys.argv[3])}")
@@ -1,11 +1,19 @@
+import inspect
 import json
 import logging
-from typing import Any, Optional
+import os
+import time
+from collections.abc import Awaitable
+from typing import Any, Callable, Optional, Union
 
 from pydantic import BaseModel, Field
 from livekit.agents import ChatContext
 from livekit.plugins import openai
 
+from services.local_usage_scorer import LocalUsageScorer
+from services.phrasal_verb_matcher import PhrasalVerbMatch, get_phrasal_verb_matcher
+from services.streaming_json import IncrementalJsonObjectParser
+
 # Make Langfuse optional
 try:
     from langfuse import observe
@@ -18,6 +26,10 @@ except ImportError:
 
 logger = logging.getLogger("agent.context_evaluator")
 
+# Called with {"used_verb": bool, "used_correctly": bool} as soon as both are known
+VerdictCallback = Callable[[dict[str, bool]], Union[Awaitable[None], None]]
+VERDICT_FIELDS = ("used_verb", "used_correctly")
+
 
 class EvaluationResult(BaseModel):
     """Structured output for lexical item evaluation."""
@@ -32,12 +44,52 @@ class EvaluationResult(BaseModel):
     )
 
 
+class VerdictResult(BaseModel):
+    """Verdict-only structured output, used when the LLM doesn't write feedback."""
+    used_verb: bool = Field(
+        ..., description="True if the lexical item appears in ANY recognizable form in the student's response"
+    )
+    used_correctly: bool = Field(
+        ..., description="True if the lexical item usage is semantically and contextually appropriate for the given meaning"
+    )
+
+
+def local_tier_enabled() -> bool:
+    return os.getenv("CONTEXT_EVALUATOR_LOCAL_TIER", "true").lower() == "true"
+
+
+def llm_feedback_enabled() -> bool:
+    # "template" fills feedback locally; the LLM only returns the verdict
+    return os.getenv("CONTEXT_EVALUATOR_FEEDBACK", "llm").lower() == "llm"
+
+
 class ContextEvaluator:
-    """Service for evaluating lexical item usage in context using GPT-4-mini."""
+    """Service for evaluating lexical item usage in context using GPT-4-mini.
 
-    def __init__(self):
+    With the local tier enabled, `LocalUsageScorer` rejects the clear-cut failures
+    (lexical item absent, bare or trailing-off fragments, scrambled) on the CPU; every
+    answer that might be correct is sent to the LLM.
+
+    Feedback is only written by the LLM when the caller will show it and
+    `llm_feedback` is on; otherwise the LLM returns just the boolean verdict and
+    feedback, if needed, comes from local templates.
+    """
+
+    def __init__(self, local_tier: Optional[bool] = None, llm_feedback: Optional[bool] = None):
         self.llm = openai.LLM(model="gpt-4o-mini")
         self._cache: dict[str, dict[str, Any]] = {}
+        self.local_scorer = (
+            LocalUsageScorer() if (local_tier_enabled() if local_tier is None else local_tier) else None
+        )
+        self.llm_feedback = llm_feedback_enabled() if llm_feedback is None else llm_feedback
+        self.matcher = get_phrasal_verb_matcher()
+        # Evaluations answered per tier, their latency and LLM output tokens
+        self.stats: dict[str, Any] = {
+            "local": 0,
+            "llm": 0,
+            "latency": {"local": [], "llm": []},
+            "completion_tokens": {"with_feedback": [], "verdict_only": []},
+        }
 
     @observe()
     async def evaluate_usage(
@@ -48,10 +100,20 @@ class ContextEvaluator:
         scenario: str,
         lexical_item_examples: Optional[list[str]] = None,
         character: Optional[str] = None,
+        on_verdict: Optional[VerdictCallback] = None,
+        lexical_item_inflections: Optional[dict] = None,
+        include_feedback: bool = True,
     ) -> dict[str, Any]:
         """
         Evaluate if the user correctly used the lexical item in context.
 
+        The structured output is parsed incrementally while it streams. Because the
+        verdict fields precede `feedback` in `EvaluationResult`, `on_verdict` fires
+        before the feedback text has finished generating, once both booleans are
+        complete and consistent. If the stream then breaks off or fails to parse,
+        the returned evaluation keeps that verdict, since the caller may already
+        have acted on it.
+
         Args:
             user_text: What the user said
             lexical_item: The target lexical item (e.g., "break down", "pull in")
@@ -59,12 +121,19 @@ class ContextEvaluator:
             lexical_item_examples: Examples of correct usage from the frontend
             scenario: The conversation scenario/context
             character: Optional character name for context
+            on_verdict: Optional callback (sync or async) receiving the boolean
+                verdict as soon as it is complete in the stream
+            lexical_item_inflections: The card's precomputed inflection table, used
+                by the local tier instead of deriving verb forms at runtime
+            include_feedback: False when the caller won't show feedback; the LLM
+                then returns only the verdict and `feedback` is empty
 
         Returns:
             Dictionary with:
                 - used_correctly: bool - whether the lexical item was used correctly
                 - used_verb: bool - whether the lexical item was used at all
                 - feedback: str - explanation of why usage was incorrect (empty if correct)
+                - tier: str - "local" or "llm", whichever produced the verdict
         """
 
         # Fail loudly if definition is missing
@@ -74,12 +143,48 @@ class ContextEvaluator:
             )
 
         # Create cache key to avoid duplicate evaluations (include definition for specificity)
-        cache_key = f"{user_text}:{lexical_item}:{lexical_item_definition}:{scenario}"
-        if cache_key in self._cache:
+        base_key = f"{user_text}:{lexical_item}:{lexical_item_definition}:{scenario}"
+        cache_key = f"{base_key}:{'feedback' if include_feedback else 'verdict'}"
+        # An evaluation with feedback also answers a verdict-only request
+        cached = self._cache.get(f"{base_key}:feedback") or self._cache.get(cache_key)
+        if cached is not None:
             logger.info(
                 f"Using cached evaluation for: {lexical_item} ({lexical_item_definition})"
             )
-            return self._cache[cache_key]
+            await self._publish_verdict(on_verdict, cached)
+            return cached
+
+        started_at = time.perf_counter()
+        if self.local_scorer is not None:
+            verdict = self.local_scorer.score(
+                user_text,
+                lexical_item,
+                lexical_item_definition,
+                lexical_item_examples,
+                lexical_item_inflections,
+            )
+            if verdict.confident:
+                evaluation = {
+                    "used_verb": verdict.used_verb,
+                    "used_correctly": verdict.used_correctly,
+                    "feedback": self._template_feedback(
+                        verdict.used_verb,
+                        verdict.used_correctly,
+                        verdict.reason,
+                        user_text,
+                        lexical_item,
+                        lexical_item_definition,
+                    ),
+                    "tier": "local",
+                }
+                self._record_tier("local", started_at)
+                # Templated feedback is free, so local results always carry it
+                self._cache[f"{base_key}:feedback"] = evaluation
+                await self._publish_verdict(on_verdict, evaluation)
+                logger.info(
+                    f"⚡ Local evaluation for '{lexical_item}' ({verdict.reason}): {evaluation}"
+                )
+                return evaluation
 
         # Format examples if provided
         examples_text = ""
@@ -89,6 +194,7 @@ class ContextEvaluator:
                 for example in lexical_item_examples[:3]  # Limit to 3 examples
             )
 
+        write_feedback = include_feedback and self.llm_feedback
         evaluation_prompt = f"""You are evaluating if a student correctly used the lexical item "{lexical_item}" in a conversation.
 
 Scenario: {scenario}
@@ -137,7 +243,10 @@ GENERAL PRINCIPLES:
 - Consider the scenario context when evaluating appropriateness
 
 Provide your evaluation as a structured response."""
+        if not write_feedback:
+            evaluation_prompt += " Only the two booleans are needed - do not write feedback."
 
+        published: Optional[dict[str, bool]] = None
         try:
             # Use the LLM to evaluate with structured output
             chat_ctx = ChatContext()
@@ -147,38 +256,77 @@ Provide your evaluation as a structured response."""
             )
             chat_ctx.add_message(role="user", content=evaluation_prompt)
 
-            # Use structured output with Pydantic model
-            result_text = ""
+            # Use structured output with Pydantic model, parsed as it streams
+            parser = IncrementalJsonObjectParser()
+            verdict_checked = False
+            completion_tokens = None
             async with self.llm.chat(
                 chat_ctx=chat_ctx,
-                response_format=EvaluationResult
+                response_format=EvaluationResult if write_feedback else VerdictResult
             ) as stream:
                 async for chunk in stream:
-                    if chunk.delta and chunk.delta.content:
-                        result_text += chunk.delta.content
+                    if chunk.usage is not None:
+                        completion_tokens = chunk.usage.completion_tokens
+                    if not (chunk.delta and chunk.delta.content):
+                        continue
+                    parser.feed(chunk.delta.content)
+                    if not verdict_checked and all(
+                        field in parser.fields for field in VERDICT_FIELDS
+                    ):
+                        verdict_checked = True
+                        published = self._validated_verdict(parser.fields)
+                        if published is not None:
+                            await self._publish_verdict(on_verdict, published)
+            result_text = parser.text
 
             # Parse the structured response
             try:
                 # The response should be valid JSON that matches our Pydantic model
                 result_json = json.loads(result_text.strip())
-                result = EvaluationResult(**result_json)
-                
+                if write_feedback:
+                    result = EvaluationResult(**result_json)
+                    feedback = result.feedback
+                else:
+                    result = VerdictResult(**result_json)
+                    feedback = ""
+                    if include_feedback:
+                        feedback = self._template_feedback(
+                            result.used_verb,
+                            result.used_correctly,
+                            None,
+                            user_text,
+                            lexical_item,
+                            lexical_item_definition,
+                        )
+
                 evaluation = {
                     "used_verb": result.used_verb,
                     "used_correctly": result.used_correctly,
-                    "feedback": result.feedback,
+                    "feedback": feedback,
+                    "tier": "llm",
                 }
+                self._record_tier("llm", started_at)
+                if completion_tokens is not None:
+                    mode = "with_feedback" if write_feedback else "verdict_only"
+                    self.stats["completion_tokens"][mode].append(completion_tokens)
 
                 # Cache the result
                 self._cache[cache_key] = evaluation
 
+                if published is None:
+                    await self._publish_verdict(on_verdict, evaluation)
+
                 logger.info(f"Evaluation for '{lexical_item}': {evaluation}")
                 return evaluation
-            
+
             except (json.JSONDecodeError, ValueError) as e:
                 logger.error(f"Failed to parse structured output: {e}")
                 logger.error(f"Response was: {result_text}")
-                
+                if published is not None:
+                    return self._published_evaluation(
+                        published, include_feedback, user_text, lexical_item, lexical_item_definition
+                    )
+
                 return {
                     "used_verb": False,
                     "used_correctly": False,
@@ -187,12 +335,105 @@ Provide your evaluation as a structured response."""
 
         except Exception as e:
             logger.error(f"Error during lexical item evaluation: {e}")
+            if published is not None:
+                return self._published_evaluation(
+                    published, include_feedback, user_text, lexical_item, lexical_item_definition
+                )
             return {
                 "used_verb": False,
                 "used_correctly": False,
                 "feedback": f"Try using '{lexical_item}' naturally in conversation. Evaluation error: {e!s}",
             }
 
+    @staticmethod
+    def _validated_verdict(fields: dict[str, Any]) -> Optional[dict[str, bool]]:
+        """The streamed verdict if both fields are real booleans that agree, else None."""
+        verdict = {field: fields[field] for field in VERDICT_FIELDS}
+        if not all(isinstance(value, bool) for value in verdict.values()):
+            return None
+        if verdict["used_correctly"] and not verdict["used_verb"]:
+            return None
+        return verdict
+
+    def _published_evaluation(
+        self,
+        verdict: dict[str, bool],
+        include_feedback: bool,
+        user_text: str,
+        lexical_item: str,
+        definition: str,
+    ) -> dict[str, Any]:
+        """Result for a stream that failed after its verdict was already published."""
+        logger.warning(
+            f"⚠️ Keeping the streamed verdict for '{lexical_item}' after the rest of the response failed"
+        )
+        feedback = ""
+        if include_feedback:
+            feedback = self._template_feedback(
+                verdict["used_verb"],
+                verdict["used_correctly"],
+                None,
+                user_text,
+                lexical_item,
+                definition,
+            )
+        return {**verdict, "feedback": feedback, "tier": "llm"}
+
+    @staticmethod
+    async def _publish_verdict(
+        on_verdict: Optional[VerdictCallback], fields: dict[str, Any]
+    ) -> None:
+        """Deliver the boolean verdict to the caller without failing the evaluation."""
+        if on_verdict is None:
+            return
+        verdict = {field: bool(fields[field]) for field in VERDICT_FIELDS}
+        try:
+            result = on_verdict(verdict)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.error(f"Verdict callback failed: {e}")
+
+    def detect_lexical_items(self, text: str) -> list[PhrasalVerbMatch]:
+        """Every PHaVE phrasal verb the user produced, not just the target."""
+        if self.matcher is None:
+            return []
+        return self.matcher.find(text)
+
+    def _template_feedback(
+        self,
+        used_verb: bool,
+        used_correctly: bool,
+        reason: Optional[str],
+        user_text: str,
+        lexical_item: str,
+        definition: str,
+    ) -> str:
+        """Deterministic feedback; `reason` is the local tier's, None for LLM verdicts."""
+        if used_correctly:
+            return ""
+        if reason == "incomplete":
+            return f"Try saying a complete sentence that uses '{lexical_item}' to mean '{definition}'."
+        if reason in ("scrambled", "ungrammatical"):
+            return f"Check the word order - use '{lexical_item}' as a verb in a complete sentence."
+        if used_verb:
+            return (
+                f"You used '{lexical_item}', but not quite to mean '{definition}'. "
+                f"Try a complete sentence where it means '{definition}'."
+            )
+        others = [
+            match.lemma.lower()
+            for match in self.detect_lexical_items(user_text)
+            if match.lemma != lexical_item.upper()
+        ]
+        if others:
+            return f"You used '{others[0]}' - try using '{lexical_item}' to mean '{definition}'."
+        return f"Try using '{lexical_item}' in your response to mean '{definition}'."
+
+    def _record_tier(self, tier: str, started_at: float) -> None:
+        self.stats[tier] += 1
+        self.stats["latency"][tier].append(time.perf_counter() - started_at)
+
     def clear_cache(self):
         """Clear the evaluation cache."""
         self._cache.clear()
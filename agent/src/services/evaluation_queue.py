@@ -0,0 +1,132 @@
+import asyncio
+import contextlib
+import logging
+from collections.abc import Awaitable
+from typing import Callable, Optional
+
+logger = logging.getLogger("agent.evaluation_queue")
+
+EvaluateFn = Callable[[int, str], Awaitable[None]]
+
+
+class EvaluationQueue:
+    """Per-session pipeline that evaluates user turns one at a time, in order.
+
+    Turns are submitted as they complete and processed by a single worker task,
+    so evaluations never overlap and never race on agent state. Once the session
+    is decided (success or failure), queued turns are dropped without calling the
+    LLM and any in-flight evaluation is cancelled.
+    """
+
+    def __init__(self, evaluate: EvaluateFn, name: str = "session"):
+        self._evaluate = evaluate
+        self._name = name
+        self._queue: asyncio.Queue[tuple[int, str]] = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._current: Optional[asyncio.Task] = None
+        self._decided = False
+        self._closed = False
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,  # in-flight evaluations cancelled after a decision
+            "avoided": 0,  # queued or late turns never sent to the LLM
+        }
+
+    @property
+    def decided(self) -> bool:
+        return self._decided
+
+    def submit(self, turn_number: int, user_text: str) -> bool:
+        """Queue a turn for evaluation. Returns False if the turn was skipped."""
+        if self._decided or self._closed:
+            self.stats["avoided"] += 1
+            logger.info(
+                f"⏭️ [EvaluationQueue:{self._name}] Turn {turn_number} skipped - session already decided"
+            )
+            return False
+
+        self.stats["submitted"] += 1
+        self._queue.put_nowait((turn_number, user_text))
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+        return True
+
+    def decide(self) -> bool:
+        """Mark the session as decided.
+
+        Returns True only for the first caller, so terminal handlers guarded by this
+        call fire exactly once. Pending turns are dropped and an in-flight
+        evaluation is cancelled unless it is the caller itself.
+        """
+        if self._decided:
+            return False
+
+        self._decided = True
+        self._drop_pending()
+
+        current = self._current
+        if (
+            current is not None
+            and not current.done()
+            and current is not asyncio.current_task()
+        ):
+            current.cancel()
+
+        logger.info(f"🏁 [EvaluationQueue:{self._name}] Session decided: {self.stats}")
+        return True
+
+    async def aclose(self) -> None:
+        """Stop the worker and cancel any outstanding evaluation."""
+        self._closed = True
+        self._drop_pending()
+
+        if self._current is not None and not self._current.done():
+            self._current.cancel()
+
+        if self._worker is not None:
+            self._worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._worker
+            self._worker = None
+
+        logger.info(f"📊 [EvaluationQueue:{self._name}] Closed: {self.stats}")
+
+    def _drop_pending(self) -> None:
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self.stats["avoided"] += 1
+
+    async def _run(self) -> None:
+        while True:
+            turn_number, user_text = await self._queue.get()
+            try:
+                if self._decided:
+                    self.stats["avoided"] += 1
+                    continue
+
+                self._current = asyncio.create_task(
+                    self._evaluate(turn_number, user_text)
+                )
+                try:
+                    await self._current
+                    self.stats["completed"] += 1
+                except asyncio.CancelledError:
+                    if not self._current.cancelled():
+                        # The worker itself is being cancelled
+                        raise
+                    self.stats["cancelled"] += 1
+                    logger.info(
+                        f"🛑 [EvaluationQueue:{self._name}] Cancelled evaluation of turn {turn_number}"
+                    )
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    logger.error(
+                        f"❌ [EvaluationQueue:{self._name}] Evaluation of turn {turn_number} failed: {e}",
+                        exc_info=True,
+                    )
+            finally:
+                self._current = None
+                self._queue.task_done()
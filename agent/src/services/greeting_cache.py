@@ -0,0 +1,186 @@
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+from services.session_metrics import SessionMetrics
+
+# Only the runtime half needs LiveKit; the content pipeline imports GreetingCache
+if TYPE_CHECKING:
+    from livekit.agents import Agent
+
+logger = logging.getLogger("agent.greeting_cache")
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data",
+    "greetings.json",
+)
+
+
+class GreetingCache:
+    """Opening lines per (card id, persona voice, prompt version and prompt hash).
+
+    Each key holds a variety pool of up to `pool_size` greetings. Until a pool is
+    full, lookups miss so the LLM generates another variant, which is added to
+    the pool; afterwards greetings are picked at random. Pools can be filled
+    offline by the content pipeline and are persisted to a JSON file shared by
+    all job processes.
+    """
+
+    def __init__(self, path: Optional[str] = None, pool_size: Optional[int] = None):
+        self.path = path or os.getenv("GREETING_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.pool_size = pool_size or int(os.getenv("GREETING_POOL_SIZE", "3"))
+        self._pools: dict[str, list[str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(card_id: str, persona: str, prompt_version: str, *prompts: str) -> str:
+        """Cache key for one greeting pool.
+
+        `prompts` (the agent's system prompt and greeting instructions) are hashed
+        into the version, so editing either never serves greetings made from the
+        old text.
+        """
+        if prompts:
+            digest = hashlib.sha256("\0".join(prompts).encode("utf-8")).hexdigest()
+            prompt_version = f"{prompt_version}-{digest[:12]}"
+        return f"{card_id}|{persona}|{prompt_version}"
+
+    def pick(self, key: str) -> Optional[str]:
+        """A cached greeting for this key, or None if the pool still needs variants."""
+        pool = self._pools.get(key, [])
+        if len(pool) < self.pool_size:
+            return None
+        return random.choice(pool)
+
+    def variants(self, key: str) -> list[str]:
+        return list(self._pools.get(key, []))
+
+    def add(self, key: str, text: str) -> bool:
+        """Add a generated greeting to the pool. Returns False if it wasn't needed."""
+        text = text.strip()
+        if not text:
+            return False
+        with self._lock:
+            pool = self._pools.setdefault(key, [])
+            if text in pool or len(pool) >= self.pool_size:
+                return False
+            pool.append(text)
+        return True
+
+    def load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"❌ [GreetingCache] Failed to load {self.path}: {e}")
+            return
+
+        with self._lock:
+            for key, greetings in data.get("greetings", {}).items():
+                pool = self._pools.setdefault(key, [])
+                for text in greetings:
+                    if text not in pool and len(pool) < self.pool_size:
+                        pool.append(text)
+        logger.info(f"📚 [GreetingCache] Loaded {len(self._pools)} greeting pools")
+
+    def save(self) -> None:
+        """Merge with what other processes wrote and atomically replace the file."""
+        on_disk = GreetingCache(self.path, self.pool_size)
+        on_disk.load()
+        with self._lock:
+            for key, greetings in self._pools.items():
+                for text in greetings:
+                    on_disk.add(key, text)
+            self._pools = on_disk._pools
+
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=directory, suffix=".tmp", delete=False
+        ) as f:
+            json.dump({"greetings": self._pools}, f, indent=2, ensure_ascii=False)
+            tmp_path = f.name
+        os.replace(tmp_path, self.path)
+
+
+@functools.cache
+def get_greeting_cache() -> GreetingCache:
+    """Process-wide cache, loaded from disk on first use (call it off the event loop)."""
+    cache = GreetingCache()
+    cache.load()
+    return cache
+
+
+def greet(
+    agent: "Agent",
+    card_id: str,
+    persona: str,
+    prompt_version: str,
+    instructions: str,
+    metrics: Optional[SessionMetrics] = None,
+) -> None:
+    """Speak the agent's opening line, from the cache when possible.
+
+    A cached greeting goes straight to TTS with `session.say`, skipping the LLM.
+    Otherwise the greeting is generated as before and added to the pool.
+    """
+    session = agent.session
+    cache = get_greeting_cache()
+    key = GreetingCache.make_key(
+        card_id, persona, prompt_version, agent.instructions, instructions
+    )
+    entered_at = time.perf_counter()
+    cached = cache.pick(key)
+
+    if cached:
+        source = "cached"
+        logger.info(f"⚡ [GreetingCache] Speaking cached greeting for {key}")
+        session.say(cached)
+    else:
+        source = "generated"
+        handle = session.generate_reply(instructions=instructions)
+
+        def _store(speech) -> None:
+            if speech.interrupted:
+                return
+            for item in speech.chat_items:
+                if item.type == "message" and item.role == "assistant":
+                    if item.text_content and cache.add(key, item.text_content):
+                        asyncio.create_task(_save(cache))  # noqa: RUF006
+                    break
+
+        handle.add_done_callback(_store)
+
+    if metrics is None:
+        return
+    metrics.increment(f"greeting.{source}")
+
+    def _on_state_changed(ev) -> None:
+        if ev.new_state != "speaking":
+            return
+        session.off("agent_state_changed", _on_state_changed)
+        elapsed = time.perf_counter() - entered_at
+        metrics.record(f"greeting.time_to_first_word.{source}", elapsed)
+        logger.info(
+            f"🗣️ [GreetingCache] First word after {elapsed * 1000:.0f}ms ({source})"
+        )
+
+    session.on("agent_state_changed", _on_state_changed)
+
+
+async def _save(cache: GreetingCache) -> None:
+    try:
+        await asyncio.to_thread(cache.save)
+    except Exception as e:
+        logger.error(f"❌ [GreetingCache] Failed to save greetings: {e}")
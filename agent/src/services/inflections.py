@@ -0,0 +1,118 @@
+"""Inflected forms and match patterns for phrasal verbs.
+
+Pure Python so the content pipeline can compute the tables at build time and
+store them with the card JSON and the PHaVE data (`inflection_table`). The
+agent then matches against the stored forms (`forms_from_table`) instead of
+deriving them per session; `verb_inflections` is only the fallback for cards
+built before the tables existed.
+"""
+
+import re
+from typing import Optional
+
+# Max words between verb and particle in separable use ("pull the changes in")
+SEPARABLE_WINDOW = 3
+
+# Irregular past forms for verbs common in phrasal verbs; regular forms are derived
+IRREGULAR_FORMS = {
+    "become": ("became",),
+    "blow": ("blew", "blown"),
+    "break": ("broke", "broken"),
+    "bring": ("brought",),
+    "build": ("built",),
+    "catch": ("caught",),
+    "come": ("came",),
+    "cut": ("cut",),
+    "fall": ("fell", "fallen"),
+    "find": ("found",),
+    "get": ("got", "gotten"),
+    "give": ("gave", "given"),
+    "go": ("went", "gone"),
+    "grow": ("grew", "grown"),
+    "hang": ("hung",),
+    "hold": ("held",),
+    "keep": ("kept",),
+    "lay": ("laid",),
+    "make": ("made",),
+    "pay": ("paid",),
+    "put": ("put",),
+    "run": ("ran",),
+    "send": ("sent",),
+    "set": ("set",),
+    "shut": ("shut",),
+    "sit": ("sat",),
+    "stand": ("stood",),
+    "take": ("took", "taken"),
+    "think": ("thought",),
+    "throw": ("threw", "thrown"),
+    "wake": ("woke", "woken"),
+    "wind": ("wound",),
+    "write": ("wrote", "written"),
+}
+
+_VOWELS = "aeiou"
+
+
+def verb_inflections(verb: str) -> set[str]:
+    """Base form plus -s, -ing, -ed and known irregular forms of an English verb."""
+    verb = verb.lower()
+    forms = {verb}
+
+    if verb.endswith(("s", "x", "z", "ch", "sh", "o")):
+        forms.add(verb + "es")
+    elif verb.endswith("y") and len(verb) > 1 and verb[-2] not in _VOWELS:
+        forms.add(verb[:-1] + "ies")
+    else:
+        forms.add(verb + "s")
+
+    # Short CVC verbs double the final consonant (set -> setting, pull -> pulling)
+    doubles = (
+        len(verb) >= 3
+        and verb[-1] not in _VOWELS + "wxy"
+        and verb[-2] in _VOWELS
+        and verb[-3] not in _VOWELS
+        and sum(ch in _VOWELS for ch in verb) == 1
+    )
+    if verb.endswith("ie"):
+        stem = verb[:-2] + "y"
+    elif verb.endswith("e") and not verb.endswith("ee"):
+        stem = verb[:-1]
+    elif doubles:
+        stem = verb + verb[-1]
+    else:
+        stem = verb
+    forms.add(stem + "ing")
+
+    if verb in IRREGULAR_FORMS:
+        forms.update(IRREGULAR_FORMS[verb])
+    elif verb.endswith("e"):
+        forms.add(verb + "d")
+    elif verb.endswith("y") and len(verb) > 1 and verb[-2] not in _VOWELS:
+        forms.add(verb[:-1] + "ied")
+    else:
+        forms.add((verb + verb[-1] if doubles else verb) + "ed")
+    return forms
+
+
+def inflection_table(lexical_item: str, window: int = SEPARABLE_WINDOW) -> dict:
+    """Forms and regex patterns for a phrasal verb, as stored in the card JSON."""
+    verb, *particles = lexical_item.lower().split()
+    forms = sorted(verb_inflections(verb))
+    alternation = "|".join(sorted(forms, key=len, reverse=True))
+    particle = r"\s+".join(re.escape(p) for p in particles)
+    return {
+        "verb": verb,
+        "verbForms": forms,
+        "particles": particles,
+        "separableWindow": window,
+        "contiguousPattern": rf"\b(?:{alternation})\s+{particle}\b",
+        "separablePattern": rf"\b(?:{alternation})(?:\s+[\w']+){{1,{window}}}?\s+{particle}\b",
+    }
+
+
+def forms_from_table(table: Optional[dict], lexical_item: str) -> set[str]:
+    """Verb forms from a stored table, computing them only if the table is missing."""
+    if table and table.get("verbForms"):
+        return set(table["verbForms"])
+    parts = lexical_item.lower().split()
+    return verb_inflections(parts[0]) if parts else set()
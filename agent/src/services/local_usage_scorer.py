@@ -0,0 +1,147 @@
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from services.inflections import IRREGULAR_FORMS, forms_from_table
+
+_TOKEN_RE = re.compile(r"[a-záéíóúñü']+")
+
+# fmt: off
+STOPWORDS = frozenset({
+    "a", "an", "the", "and", "or", "but", "if", "then", "so", "to", "of", "for", "on",
+    "at", "by", "with", "from", "as", "is", "are", "was", "were", "be", "been", "being",
+    "am", "do", "does", "did", "have", "has", "had", "i", "you", "he", "she", "it",
+    "we", "they", "me", "him", "her", "us", "them", "my", "your", "his", "its", "our",
+    "their", "this", "that", "these", "those", "there", "here", "what", "which", "who",
+    "how", "when", "where", "why", "can", "could", "should", "would", "will", "shall",
+    "may", "might", "must", "let", "lets", "let's", "just", "really", "very", "also",
+    "too", "not", "no", "yes", "know", "okay", "ok", "well", "um", "uh", "like", "need",
+    "needs", "want", "wants", "go", "going", "get", "gets", "up", "out", "down", "in",
+    "off", "over", "back"
+})
+# fmt: on
+
+# "We are pull in ..." - a finite form of "be" directly before the bare verb
+_BE_AUXILIARIES = frozenset(
+    {"am", "is", "are", "was", "were", "i'm", "we're", "you're", "they're"}
+)
+
+# Hesitations that don't make a bare "break down" a sentence
+_FILLERS = frozenset({"um", "uh", "er", "so", "well", "okay", "ok", "to"})
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+@dataclass
+class LocalVerdict:
+    """Outcome of the local tier. `confident` verdicts are returned without the LLM."""
+
+    used_verb: bool
+    used_correctly: bool
+    confident: bool
+    reason: str
+
+
+class LocalUsageScorer:
+    """CPU-only first tier for lexical item evaluation.
+
+    Decides the clear-cut failures without an LLM call:
+
+    - the verb is absent in every form (including Spanish answers) -> not used
+    - the verb only appears scrambled (particle before verb) -> used incorrectly
+    - the answer trails off ("we need to break down...") or is the bare
+      phrasal verb with no subject and no object ("break down") -> incomplete
+
+    Anything else with the verb in it, pronoun objects and modal or imperative
+    frames included ("Could you pull them in?"), is a sentence for the LLM to
+    judge. So is "be" + bare verb: "we are pull in" is wrong, but "what I want
+    to do is break down the epic" is not. Whether a sentence uses the right sense
+    is always left to the LLM too: n-gram similarity to the sense examples can't
+    tell senses of the same verb apart, so the local tier never marks an answer
+    correct.
+    """
+
+    def __init__(self, window: int = 3):
+        self.window = (
+            window  # max words between verb and particle ("pull the changes in")
+        )
+
+    def score(
+        self,
+        user_text: str,
+        lexical_item: str,
+        definition: str,
+        examples: Optional[list[str]] = None,
+        inflections: Optional[dict] = None,
+    ) -> LocalVerdict:
+        """Score one answer. `inflections` is the card's precomputed table, if any."""
+        parts = tokenize(lexical_item)
+        tokens = tokenize(user_text)
+        if not parts:
+            return LocalVerdict(False, False, False, "no_lexical_item")
+
+        verb_forms = forms_from_table(inflections, lexical_item)
+        particles = (inflections or {}).get("particles") or parts[1:]
+        verb_positions = [i for i, token in enumerate(tokens) if token in verb_forms]
+
+        span = self._find_span(tokens, verb_positions, particles)
+        if span is None:
+            if (
+                verb_positions
+                and particles
+                and self._scrambled(tokens, verb_positions, particles)
+            ):
+                return LocalVerdict(True, False, True, "scrambled")
+            if not verb_positions:
+                return LocalVerdict(False, False, True, "verb_absent")
+            # Verb without its particle - could be elliptical, let the LLM judge
+            return LocalVerdict(False, False, False, "particle_missing")
+
+        start, end = span
+        bare = tokens[start] == parts[0] and parts[0] not in IRREGULAR_FORMS.get(
+            parts[0], ()
+        )  # "is put in" is fine
+        if bare and start > 0 and tokens[start - 1] in _BE_AUXILIARIES:
+            return LocalVerdict(True, False, False, "ungrammatical")
+
+        trails_off = user_text.rstrip().endswith(("...", "…"))
+        # Anything but the verb, its particles and fillers - a subject, an object
+        # inside the span ("break it down"), a modal - makes it a sentence
+        words = [
+            token
+            for i, token in enumerate(tokens)
+            if not (i == start or (start < i <= end and token in particles))
+            and token not in _FILLERS
+        ]
+        if trails_off or not words:
+            return LocalVerdict(True, False, True, "incomplete")
+
+        return LocalVerdict(True, False, False, "uncertain")
+
+    def _find_span(
+        self, tokens: list[str], verb_positions: list[int], particles: list[str]
+    ) -> Optional[tuple[int, int]]:
+        """First verb occurrence followed by its particles within the window."""
+        for position in verb_positions:
+            cursor = position
+            for particle in particles:
+                limit = min(len(tokens), cursor + self.window + 2)
+                try:
+                    cursor = tokens.index(particle, cursor + 1, limit)
+                except ValueError:
+                    break
+            else:
+                return position, cursor
+        return None
+
+    @staticmethod
+    def _scrambled(
+        tokens: list[str], verb_positions: list[int], particles: list[str]
+    ) -> bool:
+        first_verb = verb_positions[0]
+        return all(
+            particle in tokens[:first_verb] and particle not in tokens[first_verb + 1 :]
+            for particle in particles
+        )
@@ -0,0 +1,54 @@
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Optional
+
+from services.session_metrics import SessionMetrics
+
+logger = logging.getLogger("agent.loop_monitor")
+
+
+class LoopStallMonitor:
+    """Measures how late the event loop wakes a periodic sleeper.
+
+    Any lag beyond the sleep interval is time the loop spent running something
+    else without yielding - exactly what delays audio frames for other tracks.
+    Lag samples go to `event_loop.lag` and lags above `threshold` are counted as
+    `event_loop.stalls` and logged.
+    """
+
+    def __init__(
+        self,
+        metrics: SessionMetrics,
+        interval: float = 0.05,
+        threshold: float = 0.1,
+    ):
+        self._metrics = metrics
+        self._interval = interval
+        self._threshold = threshold
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def aclose(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self._interval
+            await asyncio.sleep(self._interval)
+            lag = max(0.0, time.perf_counter() - expected)
+            self._metrics.record("event_loop.lag", lag)
+            if lag >= self._threshold:
+                self._metrics.increment("event_loop.stalls")
+                logger.warning(
+                    f"🐢 [LoopMonitor] Event loop stalled for {lag * 1000:.0f}ms"
+                )
@@ -0,0 +1,208 @@
+"""Detect every known phrasal verb in an utterance in a single pass.
+
+The matcher is built once from the PHaVE list: every inflected form of every
+verb maps to the particles it combines with, so scanning a transcript is one
+tokenizer pass plus a short look-ahead after each verb token, independent of
+how many phrasal verbs are known.
+
+Benchmark against a loop of per-verb regexes from the agent directory:
+
+    python src/services/phrasal_verb_matcher.py
+"""
+
+import functools
+import json
+import logging
+import os
+import re
+import sys
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Optional
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.inflections import forms_from_table, verb_inflections
+
+logger = logging.getLogger("agent.phrasal_verb_matcher")
+
+DEFAULT_PHAVE_PATH = os.path.join(
+    os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    ),
+    "content-generation",
+    "data",
+    "phrasal_verbs_phave_list.json",
+)
+
+# Words, plus sentence punctuation so a particle never matches across sentences
+_SCAN_RE = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)?|[.!?;]")
+_BOUNDARIES = frozenset(".!?;")
+
+
+@dataclass(frozen=True)
+class PhrasalVerbMatch:
+    lemma: str  # as listed, e.g. "BREAK DOWN"
+    start: int  # character span of the whole match, verb to particle
+    end: int
+    particle_start: int
+    particle_end: int
+    separated: bool  # words between verb and particle ("break the story down")
+
+    @property
+    def span(self) -> tuple[int, int]:
+        return self.start, self.end
+
+
+class PhrasalVerbMatcher:
+    """Multi-pattern matcher over phrasal verbs and their inflections."""
+
+    def __init__(
+        self,
+        lexical_items: Iterable[str],
+        window: int = 3,
+        inflections: Optional[dict[str, dict]] = None,
+    ):
+        """`inflections` maps lexical items to precomputed tables (see inflections.py)."""
+        self.window = window  # max words between verb and particle
+        inflections = inflections or {}
+        # inflected verb form -> {particle: lemma}
+        self._forms: dict[str, dict[str, str]] = {}
+        self.lemmas: list[str] = []
+        for item in lexical_items:
+            _verb, *particles = item.lower().split()
+            if not particles:
+                continue
+            lemma = item.upper()
+            self.lemmas.append(lemma)
+            for form in forms_from_table(inflections.get(lemma), item):
+                self._forms.setdefault(form, {})[" ".join(particles)] = lemma
+
+    @classmethod
+    def from_phave(
+        cls, path: str = DEFAULT_PHAVE_PATH, **kwargs
+    ) -> "PhrasalVerbMatcher":
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+        tables = {entry["verb"].upper(): entry.get("inflections") for entry in entries}
+        return cls([entry["verb"] for entry in entries], inflections=tables, **kwargs)
+
+    def find(self, text: str) -> list[PhrasalVerbMatch]:
+        """Every phrasal verb in the text, in order of appearance.
+
+        An adjacent particle wins ("go back out" is GO BACK); otherwise the
+        nearest particle within the window ("pull the changes in").
+        """
+        tokens = [
+            (m.group().lower(), m.start(), m.end()) for m in _SCAN_RE.finditer(text)
+        ]
+        matches = []
+        for i, (token, start, _) in enumerate(tokens):
+            particles = self._forms.get(token)
+            if particles is None:
+                continue
+            for offset, (candidate, p_start, p_end) in enumerate(
+                tokens[i + 1 : i + 2 + self.window]
+            ):
+                if candidate in _BOUNDARIES:
+                    break
+                lemma = particles.get(candidate)
+                if lemma is None and i + offset + 2 < len(tokens):
+                    # Two-word particles such as "out of" are keyed with a space
+                    lemma = particles.get(f"{candidate} {tokens[i + offset + 2][0]}")
+                    if lemma is not None:
+                        p_end = tokens[i + offset + 2][2]
+                if lemma is not None:
+                    matches.append(
+                        PhrasalVerbMatch(
+                            lemma, start, p_end, p_start, p_end, offset > 0
+                        )
+                    )
+                    break
+        return matches
+
+    def lemmas_in(self, text: str) -> list[str]:
+        """Distinct phrasal verbs in the text, in order of first appearance."""
+        return list(dict.fromkeys(match.lemma for match in self.find(text)))
+
+
+@functools.cache
+def get_phrasal_verb_matcher() -> Optional[PhrasalVerbMatcher]:
+    """Process-wide matcher over the PHaVE list, or None if the list isn't available."""
+    path = os.getenv("PHAVE_LIST_PATH", DEFAULT_PHAVE_PATH)
+    try:
+        matcher = PhrasalVerbMatcher.from_phave(path)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"⚠️ [PhrasalVerbMatcher] PHaVE list unavailable ({e})")
+        return None
+    logger.info(
+        f"📚 [PhrasalVerbMatcher] Built matcher for {len(matcher.lemmas)} phrasal verbs"
+    )
+    return matcher
+
+
+def naive_find(
+    patterns: list[tuple[str, re.Pattern]], text: str
+) -> list[tuple[str, int, int]]:
+    """Baseline for the benchmark: one regex per phrasal verb."""
+    return [
+        (lemma, m.start(), m.end())
+        for lemma, pattern in patterns
+        for m in pattern.finditer(text)
+    ]
+
+
+def naive_patterns(
+    lexical_items: Iterable[str], window: int = 3
+) -> list[tuple[str, re.Pattern]]:
+    patterns = []
+    for item in lexical_items:
+        verb, *particles = item.lower().split()
+        forms = "|".join(sorted(verb_inflections(verb), key=len, reverse=True))
+        pattern = (
+            rf"\b(?:{forms})\b(?:\s+[\w']+){{0,{window}}}?\s+{' '.join(particles)}\b"
+        )
+        patterns.append((item.upper(), re.compile(pattern, re.IGNORECASE)))
+    return patterns
+
+
+def _benchmark() -> None:
+    with open(DEFAULT_PHAVE_PATH, encoding="utf-8") as f:
+        phave = json.load(f)
+    items = [entry["verb"] for entry in phave]
+    utterances = [
+        example
+        for entry in phave
+        for sense in entry["senses"]
+        for example in sense["examples"]
+    ]
+
+    started_at = time.perf_counter()
+    matcher = PhrasalVerbMatcher(items)
+    patterns = naive_patterns(items)
+    print(
+        f"🔧 Built both matchers in {(time.perf_counter() - started_at) * 1000:.1f}ms"
+    )
+
+    found = sum(bool(matcher.find(text)) for text in utterances)
+    print(f"🎯 Examples with a phrasal verb detected: {found}/{len(utterances)}")
+
+    rounds = 20
+    for name, scan in (
+        ("automaton", matcher.find),
+        ("per-verb regex loop", lambda text: naive_find(patterns, text)),
+    ):
+        started_at = time.perf_counter()
+        for _ in range(rounds):
+            for text in utterances:
+                scan(text)
+        elapsed = time.perf_counter() - started_at
+        print(
+            f"⚡ {name:<20} {rounds * len(utterances) / elapsed:>10,.0f} utterances/s"
+        )
+
+
+if __name__ == "__main__":
+    _benchmark()
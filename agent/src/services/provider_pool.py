@@ -0,0 +1,51 @@
+import logging
+import threading
+
+from livekit.plugins import deepgram, google, openai
+
+from config.credentials import parse_google_credentials
+
+logger = logging.getLogger("agent.provider_pool")
+
+
+class ProviderPool:
+    """Plugin clients shared by every agent in one session.
+
+    Agents built for later cards in the same room reuse the STT, LLM and TTS
+    instances (and the connections they already opened) instead of creating
+    new ones. TTS instances are keyed by voice, since personas differ per card.
+    Agents are built in worker threads, hence the lock.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stt: deepgram.STT | None = None
+        self._llm: openai.LLM | None = None
+        self._tts: dict[tuple[str, str], google.TTS] = {}
+
+    def stt(self) -> deepgram.STT:
+        with self._lock:
+            if self._stt is None:
+                self._stt = deepgram.STT(model="nova-3", language="multi")
+            return self._stt
+
+    def llm(self) -> openai.LLM:
+        with self._lock:
+            if self._llm is None:
+                self._llm = openai.LLM(model="gpt-4o-mini")
+            return self._llm
+
+    def google_tts(self, language: str, voice_name: str) -> google.TTS:
+        key = (language, voice_name)
+        with self._lock:
+            tts = self._tts.get(key)
+            if tts is None:
+                tts = google.TTS(
+                    language=language,
+                    voice_name=voice_name,
+                    credentials_info=parse_google_credentials(),
+                )
+                self._tts[key] = tts
+            else:
+                logger.info(f"♻️ [ProviderPool] Reusing TTS for {voice_name}")
+            return tts
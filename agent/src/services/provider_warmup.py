@@ -0,0 +1,77 @@
+import logging
+import os
+import time
+from typing import Optional
+
+from livekit.agents import Agent, utils
+from livekit.plugins import google
+
+from services.session_metrics import SessionMetrics
+
+logger = logging.getLogger("agent.provider_warmup")
+
+DEEPGRAM_WARMUP_URL = "https://api.deepgram.com/v1/projects"
+
+
+def warmup_enabled() -> bool:
+    return os.getenv("WARM_PROVIDER_CONNECTIONS", "true").lower() == "true"
+
+
+async def warm_deepgram(metrics: Optional[SessionMetrics] = None) -> None:
+    """Open an authenticated keep-alive connection to Deepgram.
+
+    The STT plugin opens its websocket through the job's shared aiohttp session,
+    so the pooled connection (DNS, TCP and TLS already done) is reused for the
+    upgrade when the agent starts listening.
+    """
+    api_key = os.getenv("DEEPGRAM_API_KEY")
+    if not api_key:
+        return
+
+    start = time.perf_counter()
+    try:
+        async with utils.http_context.http_session().get(
+            DEEPGRAM_WARMUP_URL, headers={"Authorization": f"Token {api_key}"}
+        ) as response:
+            await response.read()
+            if response.status >= 400:
+                logger.warning(
+                    f"⚠️ [Warmup] Deepgram warm-up returned HTTP {response.status}"
+                )
+    except Exception as e:
+        logger.warning(f"⚠️ [Warmup] Deepgram warm-up failed: {e}")
+        return
+
+    elapsed = time.perf_counter() - start
+    if metrics is not None:
+        metrics.record("provider_warmup.stt", elapsed)
+    logger.info(f"🔥 [Warmup] Deepgram connection ready in {elapsed * 1000:.0f}ms")
+
+
+async def warm_agent_tts(
+    agent: Agent, metrics: Optional[SessionMetrics] = None
+) -> None:
+    """Create and authenticate the agent's Google TTS client before its first reply.
+
+    The plugin builds its gRPC client lazily on the first synthesis, which then
+    pays for the OAuth token fetch and channel setup. Listing the voices for the
+    persona's language does both without synthesizing any audio.
+    """
+    tts = agent.tts
+    if not isinstance(tts, google.TTS) or tts._client is not None:
+        # Not Google, or a client already reused from an earlier card
+        return
+
+    start = time.perf_counter()
+    try:
+        # No public hook for this - the plugin only exposes its lazy client getter
+        client = tts._ensure_client()
+        await client.list_voices(language_code=tts._opts.voice.language_code)
+    except Exception as e:
+        logger.warning(f"⚠️ [Warmup] Google TTS warm-up failed: {e}")
+        return
+
+    elapsed = time.perf_counter() - start
+    if metrics is not None:
+        metrics.record("provider_warmup.tts", elapsed)
+    logger.info(f"🔥 [Warmup] Google TTS client ready in {elapsed * 1000:.0f}ms")
@@ -0,0 +1,233 @@
+"""Precomputed sense vectors for every phrasal verb in the PHaVE list.
+
+`build_sense_index` compiles each sense (definition plus examples) into a row of
+a normalized float32 matrix of hashed bag-of-n-gram features, saved as
+`vectors.npy` next to `senses.json` with the id table. `SenseIndex.load`
+memory-maps the matrix, so job processes share its pages, and `SenseIndex.query`
+answers a batch of utterances with one matrix product. The evaluator doesn't
+consult it: the hashed features only pick the right sense of a verb somewhat
+more often than its most frequent sense does (see `benchmark`), which is not
+reliable enough to decide answers without the LLM.
+
+Build and benchmark from the agent directory:
+
+    python src/services/sense_index.py build
+    python src/services/sense_index.py benchmark
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import zlib
+
+import numpy as np
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.local_usage_scorer import STOPWORDS, tokenize
+
+_AGENT_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+DEFAULT_INDEX_DIR = os.path.join(_AGENT_DIR, "data", "sense_index")
+DEFAULT_PHAVE_PATH = os.path.join(
+    os.path.dirname(_AGENT_DIR),
+    "content-generation",
+    "data",
+    "phrasal_verbs_phave_list.json",
+)
+
+# 288 senses x 4096 float32 is ~4.7MB
+INDEX_DIM = 1 << 12
+CHAR_NGRAM_SIZES = (3, 4, 5)
+VECTORS_FILE = "vectors.npy"
+SENSES_FILE = "senses.json"
+
+
+def _feature_indices(text: str, dim: int) -> np.ndarray:
+    """Hashed word unigram/bigram and character n-gram features of a text."""
+    words = [token for token in tokenize(text) if token not in STOPWORDS]
+    features = list(words)
+    features.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+    for word in words:
+        padded = f" {word} "
+        for n in CHAR_NGRAM_SIZES:
+            features.extend(padded[i : i + n] for i in range(len(padded) - n + 1))
+    # crc32 is stable across processes, unlike hash()
+    return np.fromiter(
+        (zlib.crc32(feature.encode()) % dim for feature in features),
+        dtype=np.int64,
+        count=len(features),
+    )
+
+
+def vectorize_batch(texts: list[str], dim: int = INDEX_DIM) -> np.ndarray:
+    """L2-normalized bag-of-n-gram vectors, one row per text."""
+    rows = [_feature_indices(text, dim) for text in texts]
+    offsets = np.repeat(
+        np.arange(len(texts), dtype=np.int64) * dim, [len(r) for r in rows]
+    )
+    flat = np.concatenate(rows) + offsets if rows else np.zeros(0, dtype=np.int64)
+    matrix = np.bincount(flat, minlength=len(texts) * dim).astype(np.float32)
+    matrix = matrix.reshape(len(texts), dim)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def sense_text(verb: str, sense: dict, with_examples: bool = True) -> str:
+    examples = sense.get("examples", []) if with_examples else []
+    return " ".join([verb.lower(), sense["definition"], *examples])
+
+
+def build_sense_index(
+    phave_path: str = DEFAULT_PHAVE_PATH,
+    index_dir: str = DEFAULT_INDEX_DIR,
+    dim: int = INDEX_DIM,
+) -> int:
+    """Compile the PHaVE list into `vectors.npy` + `senses.json`. Returns the sense count."""
+    with open(phave_path, encoding="utf-8") as f:
+        verbs = json.load(f)
+
+    senses = []
+    texts = []
+    for entry in verbs:
+        verb = entry["verb"]
+        for sense in entry["senses"]:
+            senses.append(
+                {
+                    "verb": verb,
+                    "senseNumber": sense["senseNumber"],
+                    "definition": sense["definition"],
+                    "confidencePercent": sense.get("confidencePercent", 0),
+                }
+            )
+            texts.append(sense_text(verb, sense))
+
+    os.makedirs(index_dir, exist_ok=True)
+    np.save(os.path.join(index_dir, VECTORS_FILE), vectorize_batch(texts, dim))
+    with open(os.path.join(index_dir, SENSES_FILE), "w", encoding="utf-8") as f:
+        json.dump({"dim": dim, "senses": senses}, f, indent=2, ensure_ascii=False)
+    return len(senses)
+
+
+class SenseIndex:
+    """Batched cosine top-k lookup over the precomputed sense vectors."""
+
+    def __init__(self, vectors: np.ndarray, senses: list[dict], dim: int):
+        self.vectors = vectors
+        self.senses = senses
+        self.dim = dim
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_DIR) -> "SenseIndex":
+        """Memory-map `vectors.npy` from an index directory written by `build_sense_index`."""
+        with open(os.path.join(path, SENSES_FILE), encoding="utf-8") as f:
+            table = json.load(f)
+        vectors = np.load(os.path.join(path, VECTORS_FILE), mmap_mode="r")
+        return cls(vectors, table["senses"], table["dim"])
+
+    def __len__(self) -> int:
+        return len(self.senses)
+
+    def query(self, texts: list[str], k: int = 3) -> list[list[tuple[str, int, float]]]:
+        """Top-k `(verb, senseNumber, score)` per text, highest cosine first."""
+        if not texts:
+            return []
+        k = min(k, len(self.senses))
+        scores = vectorize_batch(texts, self.dim) @ self.vectors.T
+        best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, candidates in zip(scores, best):
+            ordered = candidates[np.argsort(-row[candidates])]
+            results.append(
+                [
+                    (
+                        self.senses[i]["verb"],
+                        self.senses[i]["senseNumber"],
+                        float(row[i]),
+                    )
+                    for i in ordered
+                ]
+            )
+        return results
+
+
+def held_out_accuracy(verbs: list[dict], dim: int = INDEX_DIM) -> dict[str, int]:
+    """Sense disambiguation on examples the vectors were not built from.
+
+    For every verb with more than one sense, each sense vector is built from the
+    definition alone and each example is matched against that verb's senses.
+    `baseline` counts examples whose sense is also the verb's most frequent one.
+    """
+    counts = {"examples": 0, "hits": 0, "baseline": 0}
+    for entry in verbs:
+        senses = entry["senses"]
+        if len(senses) < 2:
+            continue
+        vectors = vectorize_batch(
+            [sense_text(entry["verb"], sense, with_examples=False) for sense in senses],
+            dim,
+        )
+        most_frequent = max(
+            range(len(senses)), key=lambda i: senses[i].get("confidencePercent", 0)
+        )
+        for expected, sense in enumerate(senses):
+            examples = sense.get("examples", [])
+            if not examples:
+                continue
+            predicted = np.argmax(vectorize_batch(examples, dim) @ vectors.T, axis=1)
+            counts["examples"] += len(examples)
+            counts["hits"] += int(np.sum(predicted == expected))
+            counts["baseline"] += len(examples) * (expected == most_frequent)
+    return counts
+
+
+def _benchmark(phave_path: str) -> None:
+    with open(phave_path, encoding="utf-8") as f:
+        verbs = json.load(f)
+    counts = held_out_accuracy(verbs)
+    total = counts["examples"]
+    print(
+        f"🎯 Held-out sense disambiguation over {total} examples of multi-sense verbs:"
+    )
+    print(
+        f"   hashed n-grams {counts['hits']}/{total} ({counts['hits'] / total:.0%}), "
+        f"most frequent sense {counts['baseline']}/{total} ({counts['baseline'] / total:.0%})"
+    )
+
+    examples = [
+        example
+        for entry in verbs
+        for sense in entry["senses"]
+        for example in sense.get("examples", [])
+    ]
+    with tempfile.TemporaryDirectory() as index_dir:
+        build_sense_index(phave_path, index_dir)
+        index = SenseIndex.load(index_dir)
+        print(f"⚡ Top-3 queries against all {len(index)} senses:")
+        for batch_size in (1, 32, 256):
+            batch = (examples * (batch_size // len(examples) + 1))[:batch_size]
+            rounds = max(1, 2048 // batch_size)
+            started_at = time.perf_counter()
+            for _ in range(rounds):
+                index.query(batch, k=3)
+            elapsed = time.perf_counter() - started_at
+            print(
+                f"   batch {batch_size:>3}: {rounds * batch_size / elapsed:,.0f} utterances/s "
+                f"({elapsed / rounds * 1000:.2f}ms per batch)"
+            )
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "build"
+    if command == "build":
+        target = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_INDEX_DIR
+        count = build_sense_index(index_dir=target)
+        print(f"✅ Wrote {count} sense vectors to {target}")
+    elif command == "benchmark":
+        _benchmark(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PHAVE_PATH)
+    else:
+        sys.exit(f"Unknown command '{command}' (expected build or benchmark)")
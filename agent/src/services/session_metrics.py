@@ -0,0 +1,41 @@
+import logging
+import statistics
+from collections import defaultdict
+from typing import Any
+
+logger = logging.getLogger("agent.session_metrics")
+
+
+class SessionMetrics:
+    """Counters and latency samples collected over one agent session.
+
+    Complements the LiveKit UsageCollector with app-level measurements such as
+    validation latency or avoided LLM calls. Durations are stored in seconds and
+    reported in milliseconds.
+    """
+
+    def __init__(self) -> None:
+        self.counters: dict[str, int] = defaultdict(int)
+        self.timings: dict[str, list[float]] = defaultdict(list)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        self.counters[name] += amount
+
+    def record(self, name: str, seconds: float) -> None:
+        self.timings[name].append(seconds)
+
+    def summary(self) -> dict[str, Any]:
+        timings = {}
+        for name, samples in self.timings.items():
+            if not samples:
+                continue
+            timings[name] = {
+                "count": len(samples),
+                "mean_ms": round(statistics.fmean(samples) * 1000, 1),
+                "p50_ms": round(statistics.median(samples) * 1000, 1),
+                "max_ms": round(max(samples) * 1000, 1),
+            }
+        return {"counters": dict(self.counters), "timings": timings}
+
+    def log_summary(self, label: str = "session") -> None:
+        logger.info(f"📊 [SessionMetrics] {label}: {self.summary()}")
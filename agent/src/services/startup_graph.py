@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Iterable
+from typing import Any, Callable, Optional
+
+from services.session_metrics import SessionMetrics
+
+logger = logging.getLogger("agent.startup")
+
+PhaseFn = Callable[[], Awaitable[Any]]
+
+
+class StartupGraph:
+    """Runs job startup phases as async tasks ordered only by their dependencies.
+
+    Each phase starts as soon as the phases listed in `after` have finished, so
+    independent work (room connection, credentials, prompts, provider clients)
+    overlaps instead of running back to back. Per-phase timings are recorded as
+    `startup.<phase>` and the critical path is logged once startup completes.
+    """
+
+    def __init__(self, metrics: Optional[SessionMetrics] = None):
+        self._metrics = metrics
+        self._origin = time.perf_counter()
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._deps: dict[str, tuple[str, ...]] = {}
+        # phase -> (start, end) offsets
+        self.timings: dict[str, tuple[float, float]] = {}
+
+    def add(self, name: str, fn: PhaseFn, after: Iterable[str] = ()) -> asyncio.Task:
+        """Schedule a phase. Dependencies must already have been added."""
+        if name in self._tasks:
+            raise ValueError(f"Startup phase '{name}' already added")
+        deps = tuple(after)
+        missing = [dep for dep in deps if dep not in self._tasks]
+        if missing:
+            raise ValueError(
+                f"Startup phase '{name}' depends on unknown phases {missing}"
+            )
+
+        self._deps[name] = deps
+        task = asyncio.create_task(
+            self._run_phase(name, fn, deps), name=f"startup:{name}"
+        )
+        self._tasks[name] = task
+        return task
+
+    async def wait(self, name: str) -> Any:
+        """Wait for a phase and return its result."""
+        return await self._tasks[name]
+
+    async def join(self) -> dict[str, Any]:
+        """Wait for every phase, log the report and return results by phase name."""
+        results = await asyncio.gather(*self._tasks.values())
+        self.log_report()
+        return dict(zip(self._tasks, results))
+
+    def critical_path(self) -> tuple[list[str], float]:
+        """Chain of phases that determined the total startup time."""
+        if not self.timings:
+            return [], 0.0
+        current = max(self.timings, key=lambda name: self.timings[name][1])
+        total = self.timings[current][1]
+        path = [current]
+        while True:
+            deps = [dep for dep in self._deps[current] if dep in self.timings]
+            if not deps:
+                break
+            current = max(deps, key=lambda name: self.timings[name][1])
+            path.append(current)
+        return list(reversed(path)), total
+
+    def log_report(self) -> None:
+        path, total = self.critical_path()
+        busy = sum(end - start for start, end in self.timings.values())
+        phases = ", ".join(
+            f"{name}={(end - start) * 1000:.0f}ms@{start * 1000:.0f}"
+            for name, (start, end) in sorted(
+                self.timings.items(), key=lambda item: item[1][0]
+            )
+        )
+        logger.info(
+            f"🚀 [Startup] {total * 1000:.0f}ms wall vs {busy * 1000:.0f}ms sequential; "
+            f"critical path: {' -> '.join(path)}; phases: {phases}"
+        )
+        if self._metrics is not None:
+            self._metrics.record("startup.total", total)
+
+    async def _run_phase(self, name: str, fn: PhaseFn, deps: tuple[str, ...]) -> Any:
+        if deps:
+            await asyncio.gather(*(self._tasks[dep] for dep in deps))
+
+        start = time.perf_counter()
+        try:
+            return await fn()
+        finally:
+            end = time.perf_counter()
+            self.timings[name] = (start - self._origin, end - self._origin)
+            if self._metrics is not None:
+                self._metrics.record(f"startup.{name}", end - start)
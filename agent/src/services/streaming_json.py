@@ -0,0 +1,124 @@
+import json
+from typing import Any, Optional
+
+_WHITESPACE = " \t\r\n"
+
+
+class IncrementalJsonObjectParser:
+    """Incremental parser for a streamed JSON object.
+
+    Chunks are fed as they arrive from the LLM. Each top-level field is decoded as
+    soon as its value is complete, so callers can act on early fields (such as the
+    boolean verdict of an evaluation) before the rest of the object has streamed.
+    Nested values are captured whole and decoded once they close.
+    """
+
+    def __init__(self) -> None:
+        self.fields: dict[str, Any] = {}
+        self._chunks: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._key_chars: Optional[list[str]] = None
+        self._key: Optional[str] = None
+        self._value_chars: Optional[list[str]] = None
+        self._closed = False
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return "".join(self._chunks)
+
+    @property
+    def complete(self) -> bool:
+        """True once the closing brace of the top-level object has been seen."""
+        return self._closed
+
+    def feed(self, chunk: str) -> dict[str, Any]:
+        """Consume a chunk and return the top-level fields it completed."""
+        self._chunks.append(chunk)
+        completed: dict[str, Any] = {}
+        for char in chunk:
+            self._consume(char, completed)
+        self.fields.update(completed)
+        return completed
+
+    def _consume(self, char: str, completed: dict[str, Any]) -> None:
+        if self._closed:
+            return
+
+        if self._depth == 0:
+            if char == "{":
+                self._depth = 1
+                self._expect_key = True
+            return
+
+        # Inside a top-level key
+        if self._key_chars is not None:
+            self._track_string(char, self._key_chars)
+            if not self._in_string:
+                self._key = json.loads("".join(self._key_chars))
+                self._key_chars = None
+            return
+
+        # Inside a top-level value
+        if self._value_chars is not None:
+            if self._in_string:
+                self._track_string(char, self._value_chars)
+                if not self._in_string and self._depth == 1:
+                    self._finish_value(completed)
+                return
+
+            if char == '"':
+                self._in_string = True
+                self._value_chars.append(char)
+            elif char in "{[":
+                self._depth += 1
+                self._value_chars.append(char)
+            elif char in "}]" and self._depth > 1:
+                self._depth -= 1
+                self._value_chars.append(char)
+                if self._depth == 1:
+                    self._finish_value(completed)
+            elif self._depth == 1 and char in ",}":
+                self._finish_value(completed)
+                self._end_of_member(char)
+            else:
+                self._value_chars.append(char)
+            return
+
+        # Between members of the top-level object
+        if char in _WHITESPACE:
+            return
+        if self._expect_key and char == '"':
+            self._key_chars = [char]
+            self._in_string = True
+            self._expect_key = False
+        elif char == ":" and self._key is not None:
+            self._value_chars = []
+        elif char in ",}":
+            self._end_of_member(char)
+
+    def _track_string(self, char: str, target: list[str]) -> None:
+        target.append(char)
+        if self._escape:
+            self._escape = False
+        elif char == "\\":
+            self._escape = True
+        elif char == '"':
+            self._in_string = False
+
+    def _finish_value(self, completed: dict[str, Any]) -> None:
+        raw = "".join(self._value_chars or []).strip()
+        if self._key is not None and raw:
+            completed[self._key] = json.loads(raw)
+        self._key = None
+        self._value_chars = None
+
+    def _end_of_member(self, char: str) -> None:
+        if char == ",":
+            self._expect_key = True
+        else:
+            self._depth = 0
+            self._closed = True
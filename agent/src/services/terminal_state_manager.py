@@ -11,6 +11,15 @@ logger = logging.getLogger("agent.terminal_state")
 class TerminalStateManager:
     """Shared service for handling terminal states across all agents with graceful session closure."""
 
+    # Bumped on every in-session card handoff so a delayed closure scheduled by
+    # the previous card never closes the next one
+    _card_generation = 0
+
+    @staticmethod
+    def start_new_card() -> None:
+        """Invalidate pending session closures from the current card."""
+        TerminalStateManager._card_generation += 1
+
     @staticmethod
     async def handle_terminal_state(
         state_type: Literal["success", "failure"],
@@ -43,7 +52,10 @@ class TerminalStateManager:
                 # Schedule delayed session closure to allow agent to finish speaking
                 asyncio.create_task(  # noqa: RUF006
                     TerminalStateManager._send_delayed_session_closure(
-                        participant_identity, state_type, delay_seconds
+                        participant_identity,
+                        state_type,
+                        delay_seconds,
+                        TerminalStateManager._card_generation,
                     )
                 )
 
@@ -87,6 +99,7 @@ class TerminalStateManager:
         participant_identity: str,
         state_type: str,
         delay_seconds: float,
+        card_generation: int = 0,
     ) -> None:
         """Send delayed session closure instruction after agent finishes speaking."""
         try:
@@ -96,6 +109,12 @@ class TerminalStateManager:
             )
             await asyncio.sleep(delay_seconds)
 
+            if card_generation != TerminalStateManager._card_generation:
+                logger.info(
+                    "⏭️ [TerminalState] Skipping session closure - the learner already moved to the next card"
+                )
+                return
+
             # Send session closure instruction
             closure_payload = {
                 "action": "close_session",
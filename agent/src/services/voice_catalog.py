@@ -0,0 +1,330 @@
+"""Compact, memory-mapped catalog of the Google voice personas.
+
+`build_voice_catalog` compiles `google_voice_personas.json` (~670KB of nested
+JSON) into a small binary file:
+
+    header   magic "VPC1", version, fields per record, record count, string
+             count and the offsets of the three sections below
+    records  one fixed-width row of uint32 string ids per persona, sorted by
+             voice name (0xFFFFFFFF = empty)
+    offsets  string_count + 1 uint32 offsets into the blob
+    blob     every distinct string once, UTF-8
+
+`VoiceCatalog` memory-maps the file and resolves a voice name with a binary
+search over the records, decoding only the strings it touches, so looking up
+one persona never parses the whole catalog. The content generator samples
+personas from it and the agent worker expands the slim `voicePersona` sent in
+room metadata with it.
+
+Build and benchmark from the agent directory:
+
+    python src/services/voice_catalog.py build
+    python src/services/voice_catalog.py benchmark
+"""
+
+import functools
+import json
+import logging
+import mmap
+import os
+import struct
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from typing import Optional
+
+logger = logging.getLogger("agent.voice_catalog")
+
+_AGENT_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+DEFAULT_CATALOG_PATH = os.path.join(_AGENT_DIR, "data", "voice_catalog.bin")
+DEFAULT_PERSONAS_PATH = os.path.join(
+    os.path.dirname(_AGENT_DIR),
+    "content-generation",
+    "data",
+    "google_voice_personas.json",
+)
+
+MAGIC = b"VPC1"
+VERSION = 1
+NONE = 0xFFFFFFFF
+LIST_SLOTS = 3  # personality_traits / preferred_contexts hold 3 items each
+
+VOICE_FIELDS = ("name", "language_code", "language_name", "gender", "voice_type")
+PERSONA_FIELDS = ("name", "teaching_style", "expertise")
+LIST_FIELDS = ("personality_traits", "preferred_contexts")
+FIELD_COUNT = len(VOICE_FIELDS) + len(PERSONA_FIELDS) + LIST_SLOTS * len(LIST_FIELDS)
+
+HEADER = struct.Struct("<4sHHIIIII")
+RECORD = struct.Struct(f"<{FIELD_COUNT}I")
+# Field positions used for lookups and bucketing without decoding the full record
+VOICE_NAME, LANGUAGE_CODE, GENDER, VOICE_TYPE = 0, 1, 3, 4
+
+
+def build_voice_catalog(
+    personas_path: str = DEFAULT_PERSONAS_PATH, catalog_path: str = DEFAULT_CATALOG_PATH
+) -> int:
+    """Compile the personas JSON into the binary catalog. Returns the record count."""
+    with open(personas_path, encoding="utf-8") as f:
+        personas = sorted(json.load(f)["personas"], key=lambda p: p["voice"]["name"])
+
+    strings: dict[str, int] = {}
+
+    def intern(value: Optional[str]) -> int:
+        if value is None:
+            return NONE
+        return strings.setdefault(value, len(strings))
+
+    records = bytearray()
+    for persona in personas:
+        voice, info = persona["voice"], persona["persona"]
+        row = [intern(voice.get(field)) for field in VOICE_FIELDS]
+        row += [intern(info.get(field)) for field in PERSONA_FIELDS]
+        for field in LIST_FIELDS:
+            items = info.get(field, [])[:LIST_SLOTS]
+            row += [intern(item) for item in items] + [NONE] * (LIST_SLOTS - len(items))
+        records += RECORD.pack(*row)
+
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+
+    records_offset = HEADER.size
+    offsets_offset = records_offset + len(records)
+    blob_offset = offsets_offset + 4 * len(offsets)
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        FIELD_COUNT,
+        len(personas),
+        len(encoded),
+        records_offset,
+        offsets_offset,
+        blob_offset,
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(catalog_path)), exist_ok=True)
+    tmp_path = f"{catalog_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(records)
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(b"".join(encoded))
+    os.replace(tmp_path, catalog_path)
+    return len(personas)
+
+
+class VoiceCatalog:
+    """Read-only view over a built catalog file."""
+
+    def __init__(self, path: str = DEFAULT_CATALOG_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            field_count,
+            self.count,
+            self.string_count,
+            self._records_offset,
+            self._offsets_offset,
+            self._blob_offset,
+        ) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION or field_count != FIELD_COUNT:
+            raise ValueError(f"{path} is not a v{VERSION} voice catalog")
+        self._strings: dict[int, str] = {}
+
+    @staticmethod
+    def exists(path: str = DEFAULT_CATALOG_PATH) -> bool:
+        return os.path.exists(path)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> dict:
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return self.record(index)
+
+    def string(self, string_id: int) -> Optional[str]:
+        if string_id == NONE:
+            return None
+        value = self._strings.get(string_id)
+        if value is None:
+            start, end = struct.unpack_from(
+                "<II", self._mm, self._offsets_offset + 4 * string_id
+            )
+            value = self._strings[string_id] = self._mm[
+                self._blob_offset + start : self._blob_offset + end
+            ].decode("utf-8")
+        return value
+
+    def field(self, index: int, field: int) -> Optional[str]:
+        """One field of one record, e.g. field(i, LANGUAGE_CODE)."""
+        offset = self._records_offset + index * RECORD.size + 4 * field
+        return self.string(struct.unpack_from("<I", self._mm, offset)[0])
+
+    def find(self, voice_name: str) -> Optional[int]:
+        """Record index for a voice name (binary search), or None."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            name = self.field(mid, VOICE_NAME)
+            if name == voice_name:
+                return mid
+            if name < voice_name:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def record(self, index: int) -> dict:
+        """A persona in the same shape as google_voice_personas.json."""
+        row = [
+            self.string(i)
+            for i in RECORD.unpack_from(
+                self._mm, self._records_offset + index * RECORD.size
+            )
+        ]
+        voice = dict(zip(VOICE_FIELDS, row[: len(VOICE_FIELDS)]))
+        persona = dict(
+            zip(
+                PERSONA_FIELDS,
+                row[len(VOICE_FIELDS) : len(VOICE_FIELDS) + len(PERSONA_FIELDS)],
+            )
+        )
+        start = len(VOICE_FIELDS) + len(PERSONA_FIELDS)
+        for i, field in enumerate(LIST_FIELDS):
+            slots = row[start + i * LIST_SLOTS : start + (i + 1) * LIST_SLOTS]
+            persona[field] = [item for item in slots if item is not None]
+        return {"voice": voice, "persona": persona}
+
+    def get(self, voice_name: str) -> Optional[dict]:
+        index = self.find(voice_name)
+        return self.record(index) if index is not None else None
+
+    def voice_names(self) -> Iterator[str]:
+        for index in range(self.count):
+            yield self.field(index, VOICE_NAME)
+
+
+@functools.lru_cache(maxsize=1)
+def get_voice_catalog() -> Optional[VoiceCatalog]:
+    """Process-wide catalog, or None if it hasn't been built."""
+    path = os.getenv("VOICE_CATALOG_PATH", DEFAULT_CATALOG_PATH)
+    if not VoiceCatalog.exists(path):
+        logger.info(
+            f"🎭 [VoiceCatalog] No catalog at {path}; using voicePersona as sent"
+        )
+        return None
+    return VoiceCatalog(path)
+
+
+def expand_voice_persona(
+    voice_persona: dict, catalog: Optional[VoiceCatalog] = None
+) -> dict:
+    """Fill a slim {"voice": {"name"}, "persona": {...}} blob from the catalog.
+
+    Fields sent by the client (the card's own persona name, teaching style, ...)
+    win over the catalog's defaults. Without a catalog the language code is taken
+    from the voice name prefix (e.g. "en-GB-Chirp3-HD-Kore" -> "en-GB").
+    """
+    voice = dict(voice_persona.get("voice") or {})
+    voice_name = voice.get("name")
+    if not voice_name or voice.get("language_code"):
+        return voice_persona
+
+    catalog = catalog if catalog is not None else get_voice_catalog()
+    base = catalog.get(voice_name) if catalog else None
+    if base is None:
+        voice["language_code"] = "-".join(voice_name.split("-")[:2])
+        return {**voice_persona, "voice": voice}
+    return {
+        **voice_persona,
+        "voice": {**base["voice"], **voice},
+        "persona": {**base["persona"], **(voice_persona.get("persona") or {})},
+    }
+
+
+def _measure(
+    method: str, personas_path: str, catalog_path: str, voice_name: str
+) -> None:
+    """Runs in a fresh interpreter: load cost and RSS growth of one lookup method."""
+
+    def rss_kb() -> int:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+    before = rss_kb()
+    started_at = time.perf_counter()
+    if method == "json":
+        with open(personas_path, encoding="utf-8") as f:
+            by_name = {p["voice"]["name"]: p for p in json.load(f)["personas"]}
+        persona = by_name[voice_name]
+    else:
+        persona = VoiceCatalog(catalog_path).get(voice_name)
+    elapsed_ms = (time.perf_counter() - started_at) * 1000
+    assert persona["voice"]["name"] == voice_name
+    print(json.dumps({"ms": elapsed_ms, "rss_kb": rss_kb() - before}))
+
+
+def _benchmark(personas_path: str, catalog_path: str) -> None:
+    if not VoiceCatalog.exists(catalog_path):
+        build_voice_catalog(personas_path, catalog_path)
+    voice_name = "en-GB-Chirp3-HD-Kore"
+    print(
+        f"🎭 Resolving one persona: JSON {os.path.getsize(personas_path) / 1024:.0f}KB vs "
+        f"catalog {os.path.getsize(catalog_path) / 1024:.0f}KB (median of 5 fresh processes)"
+    )
+    for method in ("json", "catalog"):
+        runs = [
+            json.loads(
+                subprocess.check_output(
+                    [
+                        sys.executable,
+                        __file__,
+                        "_measure",
+                        method,
+                        personas_path,
+                        catalog_path,
+                        voice_name,
+                    ]
+                )
+            )
+            for _ in range(5)
+        ]
+        ms = sorted(r["ms"] for r in runs)[2]
+        rss = sorted(r["rss_kb"] for r in runs)[2]
+        print(f"   {method:<8} load + lookup {ms:>7.2f}ms   RSS +{rss:>6}KB")
+
+    catalog = VoiceCatalog(catalog_path)
+    names = list(catalog.voice_names())
+    started_at = time.perf_counter()
+    for name in names:
+        catalog.get(name)
+    per_lookup_us = (time.perf_counter() - started_at) / len(names) * 1e6
+    print(f"   catalog.get: {per_lookup_us:.1f}us per lookup over {len(names)} voices")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "build"
+    if command == "_measure":
+        _measure(*sys.argv[2:6])
+    elif command == "build":
+        personas_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PERSONAS_PATH
+        catalog_path = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_CATALOG_PATH
+        count = build_voice_catalog(personas_path, catalog_path)
+        print(
+            f"✅ Wrote {count} personas ({os.path.getsize(catalog_path) / 1024:.0f}KB) to {catalog_path}"
+        )
+    elif command == "benchmark":
+        _benchmark(
+            sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PERSONAS_PATH,
+            sys.argv[3] if len(sys.argv) > 3 else DEFAULT_CATALOG_PATH,
+        )
+    else:
+        sys.exit(f"Unknown command '{command}' (expected build or benchmark)")
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the tiered ContextEvaluator on the master dataset.
+
+Reports how many cases the local tier rejects without an LLM call, how fast it
+is, and how its verdicts compare with the expected labels. With
+--llm, the same cases are also sent to gpt-4o-mini to measure agreement
+between the two tiers, and with --feedback the escalated cases are evaluated
+with and without LLM-written feedback to compare output tokens and latency
+(both require OPENAI_API_KEY).
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any
+
+# Add src to path so we can import the evaluator
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from services.local_usage_scorer import LocalUsageScorer
+
+DATASET_PATH = Path(__file__).parent / "all_lexical_items_comprehensive_test_cases.json"
+
+
+def load_cases() -> list[dict[str, Any]]:
+    with open(DATASET_PATH) as f:
+        return json.load(f)["test_cases"]
+
+
+def run_local(cases: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    scorer = LocalUsageScorer()
+    results = []
+    for case in cases:
+        inp = case["input"]
+        started_at = time.perf_counter()
+        verdict = scorer.score(
+            inp["user_text"],
+            inp["phrasal_verb"],
+            inp["phrasal_verb_definition"],
+            inp.get("phrasal_verb_examples"),
+        )
+        results.append(
+            {
+                "case": case,
+                "verdict": verdict,
+                "latency": time.perf_counter() - started_at,
+            }
+        )
+    return results
+
+
+def make_llm_evaluator():
+    from dotenv import load_dotenv
+
+    load_dotenv(Path(__file__).parent.parent.parent.parent / ".env.local")
+    from services.context_evaluator import ContextEvaluator
+
+    return ContextEvaluator(local_tier=False)
+
+
+async def run_llm(
+    cases: list[dict[str, Any]], evaluator=None, include_feedback: bool = True
+) -> list[dict[str, bool]]:
+    evaluator = evaluator or make_llm_evaluator()
+    semaphore = asyncio.Semaphore(5)
+
+    async def evaluate(case: dict[str, Any]) -> dict[str, bool]:
+        inp = case["input"]
+        async with semaphore:
+            return await evaluator.evaluate_usage(
+                user_text=inp["user_text"],
+                lexical_item=inp["phrasal_verb"],
+                lexical_item_definition=inp["phrasal_verb_definition"],
+                scenario=inp["scenario"],
+                lexical_item_examples=inp.get("phrasal_verb_examples"),
+                character=inp.get("character"),
+                include_feedback=include_feedback,
+            )
+
+    return await asyncio.gather(*[evaluate(case) for case in cases])
+
+
+async def compare_feedback_modes(cases: list[dict[str, Any]]) -> None:
+    print(
+        f"\n📝 Evaluating {len(cases)} escalated cases with and without LLM feedback..."
+    )
+    for include_feedback, mode in ((True, "with_feedback"), (False, "verdict_only")):
+        evaluator = make_llm_evaluator()
+        await run_llm(cases, evaluator, include_feedback=include_feedback)
+        tokens = evaluator.stats["completion_tokens"][mode]
+        latency_ms = [t * 1000 for t in evaluator.stats["latency"]["llm"]]
+        print(
+            f"   {mode:<14} {statistics.mean(tokens) if tokens else 0:>6.1f} output tokens, "
+            f"median {statistics.median(latency_ms):.0f}ms per evaluation"
+        )
+
+
+def labels(source: Any) -> tuple:
+    if isinstance(source, dict):
+        return (source["used_verb"], source["used_correctly"])
+    return (source.used_verb, source.used_correctly)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--llm", action="store_true", help="also measure agreement with gpt-4o-mini"
+    )
+    parser.add_argument(
+        "--feedback",
+        action="store_true",
+        help="compare LLM evaluations with and without feedback",
+    )
+    args = parser.parse_args()
+
+    cases = load_cases()
+    results = run_local(cases)
+    confident = [r for r in results if r["verdict"].confident]
+    latencies_ms = sorted(r["latency"] * 1000 for r in results)
+
+    print(f"🧪 Tiered evaluator benchmark on {len(cases)} master dataset cases")
+    print(
+        f"⚡ Local tier hit rate: {len(confident)}/{len(cases)} ({len(confident) / len(cases):.0%})"
+    )
+    print(
+        f"⏱️  Local latency: median {statistics.median(latencies_ms):.2f}ms, "
+        f"p95 {latencies_ms[int(len(latencies_ms) * 0.95) - 1]:.2f}ms"
+    )
+
+    correct = [
+        r
+        for r in confident
+        if labels(r["verdict"]) == labels(r["case"]["expected_output"])
+    ]
+    print(
+        f"🎯 Local verdicts matching expected labels: {len(correct)}/{len(confident)}"
+    )
+
+    by_category = defaultdict(Counter)
+    for r in results:
+        category = r["case"]["metadata"]["category"]
+        by_category[category]["total"] += 1
+        if r["verdict"].confident:
+            by_category[category]["local"] += 1
+    print("\n📊 By category (answered locally / total):")
+    for category, counts in sorted(by_category.items()):
+        print(f"   {category:<18} {counts['local']:>3}/{counts['total']}")
+
+    mismatches = [r for r in confident if r not in correct]
+    if mismatches:
+        print("\n⚠️  Local verdicts disagreeing with expected labels:")
+        for r in mismatches:
+            print(f"   [{r['verdict'].reason}] {r['case']['input']['user_text']}")
+
+    if args.feedback:
+        await compare_feedback_modes(
+            [r["case"] for r in results if not r["verdict"].confident]
+        )
+
+    if not args.llm:
+        return
+
+    print(
+        f"\n🤖 Evaluating {len(confident)} locally answered cases with gpt-4o-mini..."
+    )
+    started_at = time.perf_counter()
+    llm_results = await run_llm([r["case"] for r in confident])
+    elapsed = time.perf_counter() - started_at
+    agree = sum(
+        labels(r["verdict"]) == labels(llm) for r, llm in zip(confident, llm_results)
+    )
+    print(
+        f"🤝 Agreement with LLM tier: {agree}/{len(confident)} ({agree / max(len(confident), 1):.0%})"
+    )
+    print(
+        f"⏱️  LLM tier: {elapsed / max(len(confident), 1) * 1000:.0f}ms per case (5 concurrent)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
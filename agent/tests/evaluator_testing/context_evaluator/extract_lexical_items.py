@@ -6,15 +6,37 @@ This script analyzes the voice-cards data and prepares it for comprehensive test
 
 import json
 import os
-from typing import Dict, List, Any
+import sys
+from collections.abc import Iterable
 from pathlib import Path
+from typing import Any, Optional
 
+# Add src to path so we can import the card store
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
 
-def extract_lexical_items() -> Dict[str, Any]:
-    """Extract all lexical items and their context scenarios from voice-cards.json."""
-    # Load voice-cards.json
-    voice_cards_path = Path(__file__).parent.parent.parent.parent / "app" / "generated_data" / "voice-cards.json"
-    
+from services.card_store import CardStore
+from services.card_stream import tail_cards
+
+GENERATED_DATA_DIR = Path(__file__).parent.parent.parent.parent.parent / "app" / "generated_data"
+
+
+def load_context_cards(stream_path: Optional[Path] = None) -> tuple[Iterable[dict[str, Any]], Path]:
+    """Context cards from a generator's card stream, the sharded deck, or voice-cards.json."""
+    if stream_path:
+        # Works on a run that's still in progress: only complete cards are read
+        print(f"📁 Reading card stream {stream_path}")
+        cards = (card for card in tail_cards(str(stream_path), follow=False) if card["type"] == "context")
+        return cards, stream_path
+
+    cards_dir = GENERATED_DATA_DIR / "cards"
+    if CardStore.exists(str(cards_dir)):
+        store = CardStore(str(cards_dir))
+        print(f"📁 Loaded card index from {cards_dir}")
+        print(f"📊 Total cards: {len(store)}")
+        # Only the context cards' bytes are read
+        return store.iter_cards(card_type="context"), cards_dir
+
+    voice_cards_path = GENERATED_DATA_DIR / "voice-cards.json"
     if not voice_cards_path.exists():
         raise FileNotFoundError(f"voice-cards.json not found at {voice_cards_path}")
     
@@ -23,11 +45,17 @@ def extract_lexical_items() -> Dict[str, Any]:
     
     print(f"📁 Loaded voice-cards.json from {voice_cards_path}")
     print(f"📊 Total cards: {voice_cards_data['totalCards']}")
+    return voice_cards_data["voiceCardTypes"], voice_cards_path
+
+
+def extract_lexical_items(stream_path: Optional[Path] = None) -> dict[str, Any]:
+    """Extract all lexical items and their context scenarios from the generated deck."""
+    cards, source_path = load_context_cards(stream_path)
     
     # Extract unique lexical items and their context scenarios
     lexical_items = {}
     
-    for card in voice_cards_data["voiceCardTypes"]:
+    for card in cards:
         # We want context cards (not native_explain) for scenario data
         if card["type"] == "context":
             lexical_item = card["targetLexicalItem"]["lexicalItem"]
@@ -58,11 +86,11 @@ def extract_lexical_items() -> Dict[str, Any]:
         "total_lexical_items": len(lexical_items),
         "lexical_items": lexical_items,
         "extracted_at": "2025-08-29",
-        "source_file": str(voice_cards_path)
+        "source_file": str(source_path)
     }
 
 
-def save_lexical_items_data(data: Dict[str, Any], filename: str = "lexical_items_extracted.json"):
+def save_lexical_items_data(data: dict[str, Any], filename: str = "lexical_items_extracted.json"):
     """Save extracted lexical items data to JSON file."""
     output_path = os.path.join(os.path.dirname(__file__), filename)
     
@@ -73,7 +101,7 @@ def save_lexical_items_data(data: Dict[str, Any], filename: str = "lexical_items
     return output_path
 
 
-def print_summary(data: Dict[str, Any]):
+def print_summary(data: dict[str, Any]):
     """Print a summary of extracted lexical items."""
     print(f"\n🎯 Extracted {data['total_lexical_items']} lexical items:")
     
@@ -87,12 +115,13 @@ def print_summary(data: Dict[str, Any]):
 
 
 def main():
-    """Extract and display lexical items from voice-cards.json."""
+    """Extract and display lexical items (optionally from a cards.ndjson stream given as argument)."""
     try:
-        print("🔍 Extracting lexical items from voice-cards.json...")
+        stream_path = Path(sys.argv[1]) if len(sys.argv) > 1 else None
+        print(f"🔍 Extracting lexical items from {stream_path or 'the generated deck'}...")
         
         # Extract lexical items
-        data = extract_lexical_items()
+        data = extract_lexical_items(stream_path)
         
         # Print summary
         print_summary(data)
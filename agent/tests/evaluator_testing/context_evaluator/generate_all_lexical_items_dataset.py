@@ -7,9 +7,15 @@ Creates 25 test cases per lexical item (100 total) with expected feedback for wr
 import json
 import os
 import asyncio
+import sys
 from typing import List, Dict, Any
 from pathlib import Path
 
+# Add src to path so we can use the agent's phrasal verb matcher
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from services.phrasal_verb_matcher import PhrasalVerbMatcher, get_phrasal_verb_matcher
+
 
 class ComprehensiveLexicalItemDatasetGenerator:
     """Generate comprehensive test cases for all lexical items with contextual feedback."""
@@ -17,6 +23,9 @@ class ComprehensiveLexicalItemDatasetGenerator:
     def __init__(self):
         # Load extracted lexical items data
         self.lexical_items = self.load_lexical_items()
+        # PHaVE verbs plus the dataset's own items, to label what each response actually uses
+        phave = get_phrasal_verb_matcher()
+        self.matcher = PhrasalVerbMatcher([*(phave.lemmas if phave else []), *self.lexical_items])
         
     def load_lexical_items(self) -> Dict[str, Any]:
         """Load extracted lexical items data."""
@@ -101,9 +110,14 @@ class ComprehensiveLexicalItemDatasetGenerator:
                         "difficulty": difficulty,
                         "lexical_item": lexical_item,
                         "scenario_character": scenario_data["character"],
+                        "detected_lexical_items": self.matcher.lemmas_in(response),
                         "notes": self.get_category_notes(category)
                     }
                 }
+                # Scrambled word order is deliberately not a match
+                detected = lexical_item.upper() in test_case["metadata"]["detected_lexical_items"]
+                if detected != used_verb and category != "grammatical_error":
+                    print(f"   ⚠️  {category} case labelled used_verb={used_verb} but matcher disagrees: {response}")
                 test_cases.append(test_case)
         
         print(f"   Generated {len(test_cases)} test cases for {lexical_item}")
@@ -0,0 +1,38 @@
+from services.card_store import CardStore, write_card_shards
+
+
+def _card(card_id: str, card_type: str, lexical_item: str) -> dict:
+    return {
+        "id": card_id,
+        "type": card_type,
+        "difficulty": "B1",
+        "targetLexicalItem": {"lexicalItem": lexical_item, "definition": "Café ✓"},
+    }
+
+
+CARDS = [
+    _card("native-explain-pull-in", "native_explain", "PULL IN"),
+    _card("context-pull-in", "context", "PULL IN"),
+    _card("native-explain-break-down", "native_explain", "BREAK DOWN"),
+    _card("context-break-down", "context", "BREAK DOWN"),
+]
+
+
+def test_single_card_reads_through_the_index(tmp_path) -> None:
+    write_card_shards(CARDS, str(tmp_path), {"generatedAt": "2025-08-28-165231"})
+
+    store = CardStore(str(tmp_path))
+
+    assert len(store) == 4
+    assert store.index["generatedAt"] == "2025-08-28-165231"
+    assert sorted(p.name for p in tmp_path.glob("*.jsonl")) == [
+        "break-down.jsonl",
+        "pull-in.jsonl",
+    ]
+    assert store.get("context-break-down") == CARDS[3]
+    assert [store.at(i) for i in range(4)] == CARDS
+    assert store.get("missing") is None
+    assert [
+        e["id"] for e in store.find(card_type="context", lexical_item="pull in")
+    ] == ["context-pull-in"]
+    assert list(store.iter_cards(card_type="native_explain")) == [CARDS[0], CARDS[2]]
@@ -0,0 +1,58 @@
+from services.card_store import CardStore
+from services.card_stream import (
+    CardStreamWriter,
+    compact_card_stream,
+    read_trailer,
+    tail_cards,
+)
+
+
+def _card(card_id: str, lexical_item: str, title: str = "") -> dict:
+    return {
+        "id": card_id,
+        "type": "context" if card_id.startswith("context") else "native_explain",
+        "difficulty": "B1",
+        "title": title,
+        "targetLexicalItem": {"lexicalItem": lexical_item},
+    }
+
+
+def test_tail_skips_partial_lines_and_compaction_orders_the_deck(tmp_path) -> None:
+    path = tmp_path / "cards.ndjson"
+    writer = CardStreamWriter(str(path), fsync_every=2)
+    writer.append(
+        _card("context-break-down", "BREAK DOWN"),
+        _card("native-explain-break-down", "BREAK DOWN"),
+    )
+    writer.append(_card("context-pull-in", "PULL IN"))
+
+    # A reader racing the writer must not see the half-written line
+    with open(path, "ab") as f:
+        f.write(b'{"id":"native-explain-pull-in"')
+    assert [c["id"] for c in tail_cards(str(path), follow=False)] == [
+        "context-break-down",
+        "native-explain-break-down",
+        "context-pull-in",
+    ]
+    assert read_trailer(str(path)) is None
+    with open(path, "r+b") as f:
+        f.truncate(path.stat().st_size - len(b'{"id":"native-explain-pull-in"'))
+
+    writer.append(_card("native-explain-pull-in", "PULL IN"))
+    writer.append(_card("context-pull-in", "PULL IN", title="retried"))
+    writer.close({"generatedAt": "2025-08-28-165231"})
+    assert writer.fsyncs >= 2
+    assert read_trailer(str(path))["totalCards"] == 5
+
+    order = [
+        "native-explain-pull-in",
+        "context-pull-in",
+        "native-explain-break-down",
+        "context-break-down",
+    ]
+    compact_card_stream(str(path), str(tmp_path / "cards"), order=order)
+
+    store = CardStore(str(tmp_path / "cards"))
+    assert [entry["id"] for entry in store.entries] == order
+    assert store.index["generatedAt"] == "2025-08-28-165231"
+    assert store.get("context-pull-in")["title"] == "retried"
@@ -0,0 +1,171 @@
+import json
+from types import SimpleNamespace
+from typing import Optional
+
+import pytest
+
+from services.context_evaluator import ContextEvaluator, EvaluationResult, VerdictResult
+
+
+class _FakeLLM:
+    """Streams a canned structured response and records the requested schema."""
+
+    def __init__(self, payload: dict):
+        self.payload = payload
+        self.response_formats: list[type] = []
+
+    def chat(self, chat_ctx, response_format):
+        self.response_formats.append(response_format)
+        fields = response_format.model_fields
+        text = json.dumps({k: v for k, v in self.payload.items() if k in fields})
+        return _FakeStream(text)
+
+
+class _FakeStream:
+    def __init__(self, text: str):
+        self._chunks = [
+            SimpleNamespace(delta=SimpleNamespace(content=text), usage=None),
+            SimpleNamespace(
+                delta=None, usage=SimpleNamespace(completion_tokens=len(text) // 4)
+            ),
+        ]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for chunk in self._chunks:
+            yield chunk
+
+
+def _evaluator(monkeypatch, llm_feedback: bool) -> tuple[ContextEvaluator, _FakeLLM]:
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    evaluator = ContextEvaluator(local_tier=False, llm_feedback=llm_feedback)
+    fake = _FakeLLM(
+        {
+            "used_verb": True,
+            "used_correctly": False,
+            "feedback": "LLM says: wrong sense.",
+        }
+    )
+    evaluator.llm = fake
+    return evaluator, fake
+
+
+async def _evaluate(evaluator: ContextEvaluator, include_feedback: bool) -> dict:
+    return await evaluator.evaluate_usage(
+        user_text="The server broke down last night",
+        lexical_item="break down",
+        lexical_item_definition="Divide something into smaller parts",
+        scenario="Sprint planning",
+        include_feedback=include_feedback,
+    )
+
+
+@pytest.mark.asyncio
+async def test_verdict_only_when_feedback_is_not_shown(monkeypatch) -> None:
+    evaluator, fake = _evaluator(monkeypatch, llm_feedback=True)
+
+    evaluation = await _evaluate(evaluator, include_feedback=False)
+
+    assert fake.response_formats == [VerdictResult]
+    assert (evaluation["used_verb"], evaluation["used_correctly"]) == (True, False)
+    assert evaluation["feedback"] == ""
+    assert evaluator.stats["completion_tokens"]["verdict_only"]
+
+    # Feedback needed later for the same answer: the LLM is asked again, with feedback
+    evaluation = await _evaluate(evaluator, include_feedback=True)
+    assert fake.response_formats == [VerdictResult, EvaluationResult]
+    assert evaluation["feedback"] == "LLM says: wrong sense."
+
+
+@pytest.mark.asyncio
+async def test_template_feedback_mode(monkeypatch) -> None:
+    evaluator, fake = _evaluator(monkeypatch, llm_feedback=False)
+
+    evaluation = await _evaluate(evaluator, include_feedback=True)
+
+    assert fake.response_formats == [VerdictResult]
+    assert "Divide something into smaller parts" in evaluation["feedback"]
+
+
+class _BrokenLLM:
+    """Streams the given chunks, then optionally fails mid-response."""
+
+    def __init__(self, chunks: list[str], error: Optional[Exception] = None):
+        self.chunks = chunks
+        self.error = error
+
+    def chat(self, chat_ctx, response_format):
+        return _BrokenStream(self.chunks, self.error)
+
+
+class _BrokenStream(_FakeStream):
+    def __init__(self, chunks: list[str], error: Optional[Exception]):
+        self._chunks = [
+            SimpleNamespace(delta=SimpleNamespace(content=chunk), usage=None)
+            for chunk in chunks
+        ]
+        self._error = error
+
+    async def _iterate(self):
+        for chunk in self._chunks:
+            yield chunk
+        if self._error is not None:
+            raise self._error
+
+
+async def _evaluate_streamed(monkeypatch, llm: _BrokenLLM) -> tuple[dict, list[dict]]:
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    evaluator = ContextEvaluator(local_tier=False, llm_feedback=True)
+    evaluator.llm = llm
+    verdicts: list[dict] = []
+    evaluation = await evaluator.evaluate_usage(
+        user_text="Let's break the epic down into tasks",
+        lexical_item="break down",
+        lexical_item_definition="Divide something into smaller parts",
+        scenario="Sprint planning",
+        on_verdict=verdicts.append,
+    )
+    return evaluation, verdicts
+
+
+VERDICT = '{"used_verb": true, "used_correctly": true, '
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "llm",
+    [
+        _BrokenLLM([VERDICT, '"feedback": "Gre']),
+        _BrokenLLM([VERDICT, '"feedback": "Gre'], RuntimeError("connection reset")),
+    ],
+    ids=["truncated", "stream_error"],
+)
+async def test_result_keeps_a_verdict_published_before_the_stream_broke(
+    monkeypatch, llm
+) -> None:
+    evaluation, verdicts = await _evaluate_streamed(monkeypatch, llm)
+
+    assert verdicts == [{"used_verb": True, "used_correctly": True}]
+    assert evaluation == {
+        "used_verb": True,
+        "used_correctly": True,
+        "feedback": "",
+        "tier": "llm",
+    }
+
+
+@pytest.mark.asyncio
+async def test_malformed_verdict_is_not_published_early(monkeypatch) -> None:
+    llm = _BrokenLLM(['{"used_verb": false, "used_correctly": true, ', '"feedback": "'])
+    evaluation, verdicts = await _evaluate_streamed(monkeypatch, llm)
+
+    assert verdicts == []
+    assert evaluation["used_correctly"] is False
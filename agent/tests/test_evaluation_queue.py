@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from services.evaluation_queue import EvaluationQueue
+
+
+@pytest.mark.asyncio
+async def test_turns_are_evaluated_in_order() -> None:
+    """Turns submitted back to back are evaluated sequentially, never overlapping."""
+    seen: list[int] = []
+    active = 0
+
+    async def evaluate(turn_number: int, user_text: str) -> None:
+        nonlocal active
+        active += 1
+        assert active == 1
+        await asyncio.sleep(0.01)
+        seen.append(turn_number)
+        active -= 1
+
+    queue = EvaluationQueue(evaluate)
+    for turn in range(1, 4):
+        queue.submit(turn, f"turn {turn}")
+
+    await asyncio.wait_for(queue._queue.join(), timeout=1.0)
+    assert seen == [1, 2, 3]
+    assert queue.stats["completed"] == 3
+    await queue.aclose()
+
+
+@pytest.mark.asyncio
+async def test_decision_is_idempotent_and_skips_pending_turns() -> None:
+    """Only the first decision wins; queued and late turns never reach the evaluator."""
+    calls: list[int] = []
+    decisions: list[bool] = []
+
+    async def evaluate(turn_number: int, user_text: str) -> None:
+        calls.append(turn_number)
+        decisions.append(queue.decide())
+
+    queue = EvaluationQueue(evaluate)
+    queue.submit(1, "correct usage")
+    queue.submit(2, "queued behind the decision")
+
+    await asyncio.wait_for(queue._queue.join(), timeout=1.0)
+    assert calls == [1]
+    assert decisions == [True]
+    assert queue.decide() is False
+
+    assert queue.submit(3, "late turn") is False
+    assert queue.stats["avoided"] == 2
+    await queue.aclose()
+
+
+@pytest.mark.asyncio
+async def test_decision_cancels_in_flight_evaluation() -> None:
+    """A decision made elsewhere cancels the evaluation that is still waiting on the LLM."""
+    started = asyncio.Event()
+
+    async def evaluate(turn_number: int, user_text: str) -> None:
+        started.set()
+        await asyncio.sleep(10)
+
+    queue = EvaluationQueue(evaluate)
+    queue.submit(1, "slow evaluation")
+    await asyncio.wait_for(started.wait(), timeout=1.0)
+
+    assert queue.decide() is True
+    await asyncio.wait_for(queue._queue.join(), timeout=1.0)
+    assert queue.stats["cancelled"] == 1
+    await queue.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failed_evaluation_is_counted_and_the_next_turn_still_runs() -> None:
+    """An evaluation error is counted by the queue and does not stop the worker."""
+    seen: list[int] = []
+
+    async def evaluate(turn_number: int, user_text: str) -> None:
+        seen.append(turn_number)
+        if turn_number == 1:
+            raise RuntimeError("LLM unavailable")
+
+    queue = EvaluationQueue(evaluate)
+    queue.submit(1, "fails")
+    queue.submit(2, "succeeds")
+
+    await asyncio.wait_for(queue._queue.join(), timeout=1.0)
+    assert seen == [1, 2]
+    assert queue.stats["failed"] == 1
+    assert queue.stats["completed"] == 1
+    await queue.aclose()
@@ -0,0 +1,38 @@
+from services.greeting_cache import GreetingCache
+
+
+def test_pool_misses_until_full_then_picks_variants(tmp_path):
+    cache = GreetingCache(path=str(tmp_path / "greetings.json"), pool_size=2)
+    key = GreetingCache.make_key("context-pull-in", "nl-NL-Chirp3-HD-Sadaltager", "v1")
+
+    assert cache.pick(key) is None
+    assert cache.add(key, "Hi, got a minute?")
+    assert not cache.add(key, "Hi, got a minute?")  # duplicates don't count
+    assert cache.pick(key) is None
+
+    assert cache.add(key, "Hey, quick question about the release.")
+    assert not cache.add(key, "One more variant")  # pool is full
+    assert cache.pick(key) in cache.variants(key)
+
+
+def test_save_merges_with_greetings_written_by_other_processes(tmp_path):
+    path = str(tmp_path / "greetings.json")
+    first = GreetingCache(path=path, pool_size=3)
+    second = GreetingCache(path=path, pool_size=3)
+
+    first.add("card|voice|v1", "Hola")
+    first.save()
+    second.add("card|voice|v1", "Buenas")
+    second.save()
+
+    reloaded = GreetingCache(path=path, pool_size=3)
+    reloaded.load()
+    assert sorted(reloaded.variants("card|voice|v1")) == ["Buenas", "Hola"]
+
+
+def test_key_changes_with_the_prompts_it_was_generated_from():
+    key = GreetingCache.make_key("card", "voice", "v1", "system", "greet")
+
+    assert key == GreetingCache.make_key("card", "voice", "v1", "system", "greet")
+    assert key != GreetingCache.make_key("card", "voice", "v1", "system 2", "greet")
+    assert key != GreetingCache.make_key("card", "voice", "v1", "system", "greet 2")
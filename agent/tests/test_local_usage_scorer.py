@@ -0,0 +1,80 @@
+import re
+
+from services.inflections import inflection_table, verb_inflections
+from services.local_usage_scorer import LocalUsageScorer
+
+DEFINITION = "Divide something into smaller parts"
+EXAMPLES = [
+    "Let's break down this user story into smaller tasks.",
+    "We should break down the problem into manageable pieces.",
+]
+
+
+def test_inflections_cover_regular_and_irregular_forms() -> None:
+    assert {"pull", "pulls", "pulling", "pulled"} <= verb_inflections("pull")
+    assert {"broke", "broken", "breaking"} <= verb_inflections("break")
+    assert {"set", "setting"} <= verb_inflections("set")
+
+
+def test_precomputed_table_drives_matching() -> None:
+    table = inflection_table("BREAK DOWN")
+    assert re.search(table["separablePattern"], "we broke the story down")
+    assert not re.search(table["contiguousPattern"], "we broke the story down")
+
+    # The scorer trusts the stored forms instead of deriving its own
+    table["verbForms"] = ["brake"]
+    verdict = LocalUsageScorer().score(
+        "We brake down", "break down", DEFINITION, EXAMPLES, table
+    )
+    assert verdict.used_verb
+
+
+def test_clear_cut_cases_are_decided_locally() -> None:
+    scorer = LocalUsageScorer()
+
+    def verdict(text: str):
+        result = scorer.score(text, "break down", DEFINITION, EXAMPLES)
+        return result.confident, result.used_verb, result.used_correctly, result.reason
+
+    assert verdict("Vamos a dividir esto") == (True, False, False, "verb_absent")
+    assert verdict("Break down.") == (True, True, False, "incomplete")
+    assert verdict("Um, break down") == (True, True, False, "incomplete")
+    assert verdict("We need to break down...") == (True, True, False, "incomplete")
+    assert verdict("down break we should this task") == (True, True, False, "scrambled")
+
+
+def test_complete_sentences_escalate_to_the_llm() -> None:
+    scorer = LocalUsageScorer()
+    # Even a near-copy of a sense example is never marked correct locally
+    for text in (
+        "We should break the problem down into manageable pieces",
+        "The server might break down under heavy load",
+    ):
+        verdict = scorer.score(text, "break down", DEFINITION, EXAMPLES)
+        assert (verdict.used_verb, verdict.confident) == (True, False)
+
+
+def test_pronoun_objects_and_modal_frames_are_sentences() -> None:
+    """Regression: short but complete answers used to be rejected as incomplete."""
+    scorer = LocalUsageScorer()
+    for text, lexical_item in (
+        ("Let's break it down.", "break down"),
+        ("Can you break it down?", "break down"),
+        ("Could you pull them in?", "pull in"),
+        ("We should roll it out", "roll out"),
+        ("Should we fall back?", "fall back"),
+        ("Let us roll out", "roll out"),
+        ("We break down", "break down"),
+    ):
+        verdict = scorer.score(text, lexical_item, DEFINITION)
+        assert (verdict.used_verb, verdict.confident) == (True, False), text
+
+
+def test_be_before_the_bare_verb_escalates() -> None:
+    scorer = LocalUsageScorer()
+    for text in (
+        "We are break down it",
+        "What I want to do is break down the epic into tasks",
+    ):
+        verdict = scorer.score(text, "break down", DEFINITION, EXAMPLES)
+        assert (verdict.confident, verdict.reason) == (False, "ungrammatical"), text
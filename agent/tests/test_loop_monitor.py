@@ -0,0 +1,22 @@
+import asyncio
+import time
+
+import pytest
+
+from services.loop_monitor import LoopStallMonitor
+from services.session_metrics import SessionMetrics
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_is_counted_as_stall():
+    metrics = SessionMetrics()
+    monitor = LoopStallMonitor(metrics, interval=0.01, threshold=0.05)
+    monitor.start()
+    await asyncio.sleep(0.03)
+
+    time.sleep(0.1)  # blocks the loop
+    await asyncio.sleep(0.03)
+    await monitor.aclose()
+
+    assert metrics.counters["event_loop.stalls"] >= 1
+    assert max(metrics.timings["event_loop.lag"]) >= 0.05
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from handlers.participant import start_next_card
+from models.session import MySessionInfo, create_target_lexical_item
+from services.terminal_state_manager import TerminalStateManager
+
+
+class FakeSession:
+    def __init__(self, userdata):
+        self.userdata = userdata
+        self.interrupted = False
+        self.agent = None
+
+    def interrupt(self):
+        self.interrupted = True
+
+    def update_agent(self, agent):
+        self.agent = agent
+
+
+@pytest.fixture
+def session():
+    current = create_target_lexical_item(
+        "pick up", [{"senseNumber": 1, "definition": "to lift", "examples": []}]
+    )
+    return FakeSession(
+        MySessionInfo(
+            user_name="Max",
+            age=25,
+            target_lexical_item=current,
+            card_index=2,
+            card_id="pick-up",
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        "not json",
+        "[]",
+        json.dumps({"activityType": "voice"}),
+        # Valid card, but building NativeExplainAgent fails outside a job context
+        json.dumps(
+            {
+                "activityType": "voice",
+                "voiceCardData": {
+                    "id": "take-off",
+                    "targetLexicalItem": {
+                        "lexicalItem": "take off",
+                        "senses": [
+                            {"senseNumber": 1, "definition": "to leave", "examples": []}
+                        ],
+                    },
+                },
+            }
+        ),
+        # ContextAgent refuses a scenario without a definition
+        json.dumps(
+            {
+                "activityType": "context",
+                "scenario": {"character": "Ana"},
+                "targetLexicalItem": {"lexicalItem": "pull in"},
+            }
+        ),
+    ],
+)
+async def test_invalid_next_card_leaves_current_card_untouched(
+    monkeypatch, session, payload
+):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    generation = TerminalStateManager._card_generation
+
+    agent = await start_next_card(payload, session, in_executor=False)
+
+    assert agent is None
+    assert TerminalStateManager._card_generation == generation
+    assert session.userdata.card_index == 2
+    assert session.userdata.card_id == "pick-up"
+    assert session.userdata.target_lexical_item.phrase == "pick up"
+    assert not session.interrupted
+    assert session.agent is None
@@ -0,0 +1,36 @@
+from services.phrasal_verb_matcher import PhrasalVerbMatcher, naive_find, naive_patterns
+
+ITEMS = ["BREAK DOWN", "GO BACK", "GO ON", "PICK UP", "RUN OUT"]
+
+
+def test_finds_inflected_and_separated_phrasal_verbs() -> None:
+    matcher = PhrasalVerbMatcher(ITEMS)
+    text = "He picked the box up and went on. The server broke down."
+
+    matches = matcher.find(text)
+
+    assert [m.lemma for m in matches] == ["PICK UP", "GO ON", "BREAK DOWN"]
+    pick_up = matches[0]
+    assert text[pick_up.start : pick_up.end] == "picked the box up"
+    assert text[pick_up.particle_start : pick_up.particle_end] == "up"
+    assert pick_up.separated
+    assert not matches[1].separated
+
+
+def test_particles_do_not_cross_sentences_or_the_window() -> None:
+    matcher = PhrasalVerbMatcher(ITEMS)
+
+    assert matcher.find("Let's go. Back to work") == []
+    assert matcher.find("Pick the very big heavy box up") == []
+    assert matcher.lemmas_in("Go back, then go back again") == ["GO BACK"]
+
+
+def test_agrees_with_per_verb_regexes() -> None:
+    matcher = PhrasalVerbMatcher(ITEMS)
+    patterns = naive_patterns(ITEMS)
+    text = "We ran out of time, so we are going back to break it down later"
+
+    assert [(m.lemma, m.start) for m in matcher.find(text)] == [
+        (lemma, start)
+        for lemma, start, _ in sorted(naive_find(patterns, text), key=lambda m: m[1])
+    ]
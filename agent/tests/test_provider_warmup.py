@@ -0,0 +1,111 @@
+from types import SimpleNamespace
+from typing import ClassVar
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from livekit.agents.utils import http_context
+from livekit.plugins import google
+from livekit.plugins.google import tts as google_tts
+
+from services import provider_warmup
+from services.provider_warmup import warm_agent_tts, warm_deepgram
+from services.session_metrics import SessionMetrics
+
+
+class FakeTextToSpeechClient:
+    """Stands in for the gRPC client the plugin builds in _ensure_client."""
+
+    instances: ClassVar[list["FakeTextToSpeechClient"]] = []
+    fail = False
+
+    def __init__(self, client_options=None):
+        self.listed: list[str] = []
+        FakeTextToSpeechClient.instances.append(self)
+
+    async def list_voices(self, language_code: str):
+        if FakeTextToSpeechClient.fail:
+            raise RuntimeError("token fetch failed")
+        self.listed.append(language_code)
+        return SimpleNamespace(voices=[])
+
+
+@pytest.fixture
+def google_agent(monkeypatch):
+    monkeypatch.delenv("GOOGLE_APPLICATION_CREDENTIALS", raising=False)
+    monkeypatch.setattr(
+        google_tts.texttospeech, "TextToSpeechAsyncClient", FakeTextToSpeechClient
+    )
+    FakeTextToSpeechClient.instances = []
+    FakeTextToSpeechClient.fail = False
+    tts = google.TTS(voice_name="en-GB-Chirp3-HD-Kore", language="en-GB")
+    return SimpleNamespace(tts=tts)
+
+
+async def test_google_tts_warmup_builds_client_and_lists_voices(google_agent):
+    metrics = SessionMetrics()
+    await warm_agent_tts(google_agent, metrics)
+
+    [client] = FakeTextToSpeechClient.instances
+    assert google_agent.tts._client is client
+    assert client.listed == ["en-GB"]
+    assert len(metrics.timings["provider_warmup.tts"]) == 1
+
+
+async def test_google_tts_warmup_failure_is_swallowed(google_agent):
+    FakeTextToSpeechClient.fail = True
+    metrics = SessionMetrics()
+    await warm_agent_tts(google_agent, metrics)
+
+    assert "provider_warmup.tts" not in metrics.timings
+
+
+async def test_google_tts_warmup_skips_client_from_earlier_card(google_agent):
+    reused = FakeTextToSpeechClient()
+    google_agent.tts._client = reused
+    metrics = SessionMetrics()
+    await warm_agent_tts(google_agent, metrics)
+
+    assert FakeTextToSpeechClient.instances == [reused]
+    assert reused.listed == []
+    assert "provider_warmup.tts" not in metrics.timings
+
+
+@pytest.fixture
+async def http_session():
+    http_context._new_session_ctx()
+    yield
+    await http_context._close_http_ctx()
+
+
+async def test_deepgram_warmup_calls_rest_api(monkeypatch, http_session):
+    seen = []
+
+    async def projects(request):
+        seen.append(request.headers["Authorization"])
+        return web.json_response({"projects": []})
+
+    app = web.Application()
+    app.router.add_get("/v1/projects", projects)
+    async with TestServer(app) as server:
+        monkeypatch.setenv("DEEPGRAM_API_KEY", "dg-key")
+        monkeypatch.setattr(
+            provider_warmup, "DEEPGRAM_WARMUP_URL", str(server.make_url("/v1/projects"))
+        )
+        metrics = SessionMetrics()
+        await warm_deepgram(metrics)
+
+    assert seen == ["Token dg-key"]
+    assert len(metrics.timings["provider_warmup.stt"]) == 1
+
+
+async def test_deepgram_warmup_failure_is_swallowed(monkeypatch, http_session):
+    monkeypatch.setenv("DEEPGRAM_API_KEY", "dg-key")
+    # Nothing listens on port 9 (discard) here, so the connection is refused
+    monkeypatch.setattr(
+        provider_warmup, "DEEPGRAM_WARMUP_URL", "http://127.0.0.1:9/v1/projects"
+    )
+    metrics = SessionMetrics()
+    await warm_deepgram(metrics)
+
+    assert "provider_warmup.stt" not in metrics.timings
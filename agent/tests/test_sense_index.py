@@ -0,0 +1,86 @@
+import json
+
+import numpy as np
+
+from services.sense_index import (
+    SENSES_FILE,
+    VECTORS_FILE,
+    SenseIndex,
+    build_sense_index,
+    held_out_accuracy,
+)
+
+PHAVE = [
+    {
+        "id": 1,
+        "verb": "BREAK DOWN",
+        "senses": [
+            {
+                "senseNumber": 1,
+                "definition": "Stop working because of a fault",
+                "confidencePercent": 60,
+                "examples": ["The old car stopped working on the highway."],
+            },
+            {
+                "senseNumber": 2,
+                "definition": "Divide into smaller parts",
+                "confidencePercent": 40,
+                "examples": ["Let's divide this story into smaller tasks."],
+            },
+        ],
+    },
+    {
+        "id": 2,
+        "verb": "PICK UP",
+        "senses": [
+            {
+                "senseNumber": 1,
+                "definition": "Lift something",
+                "confidencePercent": 100,
+                "examples": ["Pick up the box from the floor."],
+            },
+        ],
+    },
+]
+
+
+def test_build_writes_one_normalized_row_per_sense(tmp_path) -> None:
+    phave_path = tmp_path / "phave.json"
+    phave_path.write_text(json.dumps(PHAVE))
+    index_dir = tmp_path / "index"
+    assert build_sense_index(str(phave_path), str(index_dir), dim=1024) == 3
+
+    vectors = np.load(index_dir / VECTORS_FILE)
+    table = json.loads((index_dir / SENSES_FILE).read_text())
+    assert vectors.shape == (3, 1024)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+    assert [(s["verb"], s["senseNumber"]) for s in table["senses"]] == [
+        ("BREAK DOWN", 1),
+        ("BREAK DOWN", 2),
+        ("PICK UP", 1),
+    ]
+
+
+def test_held_out_accuracy_skips_single_sense_verbs() -> None:
+    counts = held_out_accuracy(PHAVE, dim=1024)
+    assert counts == {"examples": 2, "hits": 2, "baseline": 1}
+
+
+def test_loaded_index_is_memory_mapped_and_ranks_senses(tmp_path) -> None:
+    phave_path = tmp_path / "phave.json"
+    phave_path.write_text(json.dumps(PHAVE))
+    build_sense_index(str(phave_path), str(tmp_path), dim=1024)
+
+    index = SenseIndex.load(str(tmp_path))
+    assert isinstance(index.vectors, np.memmap)
+
+    [divide, lift] = index.query(
+        ["We should divide the story into smaller tasks", "Pick up the box"], k=2
+    )
+    assert [(verb, number) for verb, number, _ in divide] == [
+        ("BREAK DOWN", 2),
+        ("BREAK DOWN", 1),
+    ]
+    assert divide[0][2] > divide[1][2]
+    assert lift[0][:2] == ("PICK UP", 1)
+    assert index.query([]) == []
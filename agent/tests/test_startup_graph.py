@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+import pytest
+
+from services.session_metrics import SessionMetrics
+from services.startup_graph import StartupGraph
+
+
+def _sleeper(seconds: float, result=None):
+    async def phase():
+        await asyncio.sleep(seconds)
+        return result
+
+    return phase
+
+
+@pytest.mark.asyncio
+async def test_independent_phases_overlap_and_dependencies_wait():
+    metrics = SessionMetrics()
+    graph = StartupGraph(metrics)
+    graph.add("connect", _sleeper(0.1, "room"))
+    graph.add("credentials", _sleeper(0.05, "creds"))
+    graph.add("select_agent", _sleeper(0.02, "agent"), after=("connect", "credentials"))
+
+    start = time.perf_counter()
+    results = await graph.join()
+    elapsed = time.perf_counter() - start
+
+    assert results == {
+        "connect": "room",
+        "credentials": "creds",
+        "select_agent": "agent",
+    }
+    assert elapsed < 0.15  # not 0.17 sequential
+    assert graph.timings["select_agent"][0] >= graph.timings["connect"][1]
+    assert graph.critical_path()[0] == ["connect", "select_agent"]
+    assert "startup.connect" in metrics.timings
+
+
+@pytest.mark.asyncio
+async def test_unknown_dependency_is_rejected():
+    graph = StartupGraph()
+    with pytest.raises(ValueError):
+        graph.add("select_agent", _sleeper(0), after=("connect",))
@@ -0,0 +1,44 @@
+import json
+
+from services.streaming_json import IncrementalJsonObjectParser
+
+
+def _feed_in_chunks(parser: IncrementalJsonObjectParser, text: str, size: int):
+    completed = []
+    for start in range(0, len(text), size):
+        completed.append(parser.feed(text[start : start + size]))
+    return completed
+
+
+def test_verdict_fields_complete_before_feedback() -> None:
+    """The boolean verdict is published while the feedback string is still streaming."""
+    text = '{"used_verb": true, "used_correctly": false, "feedback": "Try using it to mean divide, not stop working."}'
+    parser = IncrementalJsonObjectParser()
+
+    prefix = text[: text.index('"feedback"') + len('"feedback": "Try')]
+    parser.feed(prefix)
+
+    assert parser.fields == {"used_verb": True, "used_correctly": False}
+    assert not parser.complete
+
+    parser.feed(text[len(prefix) :])
+    assert parser.complete
+    assert parser.fields == json.loads(text)
+    assert parser.text == text
+
+
+def test_handles_escapes_nesting_and_tiny_chunks() -> None:
+    """Escaped quotes, braces inside strings and nested values survive 1-char chunks."""
+    payload = {
+        "feedback": 'She said "go on}" and {left}',
+        "details": {"tags": ["a", "b,c"], "score": 0.5},
+        "ok": None,
+    }
+    text = json.dumps(payload, indent=2)
+    parser = IncrementalJsonObjectParser()
+
+    completed = _feed_in_chunks(parser, text, 1)
+
+    assert parser.complete
+    assert parser.fields == payload
+    assert sum(len(c) for c in completed) == len(payload)
@@ -0,0 +1,59 @@
+import json
+
+from services.voice_catalog import (
+    VoiceCatalog,
+    build_voice_catalog,
+    expand_voice_persona,
+)
+
+
+def _persona(voice_name: str, gender: str, traits: list[str]) -> dict:
+    return {
+        "voice": {
+            "name": voice_name,
+            "language_code": "-".join(voice_name.split("-")[:2]),
+            "language_name": "English",
+            "gender": gender,
+            "voice_type": "Chirp3-HD",
+        },
+        "persona": {
+            "name": "Ana Café",
+            "teaching_style": "Patient",
+            "expertise": "Engineering",
+            "personality_traits": traits,
+            "preferred_contexts": ["standups"],
+        },
+    }
+
+
+PERSONAS = [
+    _persona("en-US-Chirp3-HD-Puck", "MALE", ["calm", "direct", "warm"]),
+    _persona("en-GB-Chirp3-HD-Kore", "FEMALE", ["precise"]),
+    _persona("es-MX-Chirp3-HD-Aoede", "FEMALE", []),
+]
+
+
+def test_catalog_round_trips_personas_and_expands_slim_metadata(tmp_path) -> None:
+    personas_path = tmp_path / "personas.json"
+    personas_path.write_text(json.dumps({"personas": PERSONAS}), encoding="utf-8")
+    build_voice_catalog(str(personas_path), str(tmp_path / "voice_catalog.bin"))
+
+    catalog = VoiceCatalog(str(tmp_path / "voice_catalog.bin"))
+
+    assert len(catalog) == 3
+    assert list(catalog.voice_names()) == sorted(p["voice"]["name"] for p in PERSONAS)
+    for persona in PERSONAS:
+        assert catalog.get(persona["voice"]["name"]) == persona
+    assert catalog.get("fr-FR-Chirp3-HD-Puck") is None
+
+    slim = {
+        "voice": {"name": "en-GB-Chirp3-HD-Kore"},
+        "persona": {"name": "Priya", "teaching_style": "Socratic"},
+    }
+    expanded = expand_voice_persona(slim, catalog)
+    assert expanded["voice"] == PERSONAS[1]["voice"]
+    assert expanded["persona"]["name"] == "Priya"
+    assert expanded["persona"]["personality_traits"] == ["precise"]
+
+    unknown = expand_voice_persona({"voice": {"name": "de-DE-Chirp3-HD-Orus"}}, catalog)
+    assert unknown["voice"]["language_code"] == "de-DE"
@@ -10,6 +10,69 @@ const GENERATED_DATA_PATHS = [
 
 const GENERATED_DATA_DIR = GENERATED_DATA_PATHS.find(dir => fs.existsSync(dir)) || GENERATED_DATA_PATHS[0];
 
+// Sharded deck written by the content pipeline (see agent/src/services/card_store.py)
+const CARDS_DIR = path.join(GENERATED_DATA_DIR, 'cards');
+const CARD_INDEX_PATH = path.join(CARDS_DIR, 'index.json');
+const VOICE_CARDS_PATH = path.join(GENERATED_DATA_DIR, 'voice-cards.json');
+
+interface CardIndexEntry {
+  id: string;
+  type: string;
+  difficulty: string | null;
+  lexicalItem: string;
+  file: string;
+  offset: number;
+  length: number;
+}
+
+interface CardIndex {
+  totalCards: number;
+  generatedAt?: string;
+  cards: CardIndexEntry[];
+}
+
+let cardIndexCache: { mtimeMs: number; index: CardIndex; byId: Map<string, CardIndexEntry> } | null = null;
+let voiceCardsCache: { mtimeMs: number; data: { generatedAt?: string; voiceCardTypes: Array<{ id: string }> } } | null = null;
+
+function loadVoiceCards() {
+  if (!fs.existsSync(VOICE_CARDS_PATH)) return null;
+  const { mtimeMs } = fs.statSync(VOICE_CARDS_PATH);
+  if (!voiceCardsCache || voiceCardsCache.mtimeMs !== mtimeMs) {
+    voiceCardsCache = { mtimeMs, data: JSON.parse(fs.readFileSync(VOICE_CARDS_PATH, 'utf-8')) };
+  }
+  return voiceCardsCache.data;
+}
+
+function loadCardIndex() {
+  if (!fs.existsSync(CARD_INDEX_PATH)) return null;
+  const { mtimeMs } = fs.statSync(CARD_INDEX_PATH);
+  if (!cardIndexCache || cardIndexCache.mtimeMs !== mtimeMs) {
+    const index: CardIndex = JSON.parse(fs.readFileSync(CARD_INDEX_PATH, 'utf-8'));
+    cardIndexCache = { mtimeMs, index, byId: new Map(index.cards.map(entry => [entry.id, entry])) };
+  }
+  // voice-cards.json regenerated without re-sharding: the offsets point into an older deck
+  const voiceCards = loadVoiceCards();
+  if (voiceCards && voiceCards.generatedAt !== cardIndexCache.index.generatedAt) {
+    console.warn(
+      `Card index (${cardIndexCache.index.generatedAt}) is older than voice-cards.json (${voiceCards.generatedAt}), using the full file`
+    );
+    return null;
+  }
+  return cardIndexCache;
+}
+
+// One positioned read of just this card's bytes
+function readCard(entry: CardIndexEntry) {
+  const fd = fs.openSync(path.join(CARDS_DIR, entry.file), 'r');
+  try {
+    const buffer = Buffer.alloc(entry.length);
+    fs.readSync(fd, buffer, 0, entry.length, entry.offset);
+    return JSON.parse(buffer.toString('utf-8'));
+  } finally {
+    fs.closeSync(fd);
+  }
+}
+
 export async function GET(request: NextRequest) {
   try {
     // Check if generated_data directory exists
@@ -21,6 +84,30 @@ export async function GET(request: NextRequest) {
       }, { status: 404 });
     }
 
+    // Single card or the card index, served from the shards
+    const cardId = request.nextUrl.searchParams.get('card');
+    if (cardId !== null || request.nextUrl.searchParams.get('index') === 'true') {
+      const cardIndex = loadCardIndex();
+      if (!cardIndex) {
+        // Single cards can still come out of the full file
+        const fullCard = cardId !== null && loadVoiceCards()?.voiceCardTypes.find(card => card.id === cardId);
+        if (fullCard) {
+          return NextResponse.json(fullCard);
+        }
+        return NextResponse.json({
+          error: 'Card index not found or out of date. Run the demo generator or card_store.py build'
+        }, { status: 404 });
+      }
+      if (cardId === null) {
+        return NextResponse.json(cardIndex.index);
+      }
+      const entry = cardIndex.byId.get(cardId);
+      if (!entry) {
+        return NextResponse.json({ error: `Card '${cardId}' not found` }, { status: 404 });
+      }
+      return NextResponse.json(readCard(entry));
+    }
+
     // Check for the main voice cards file
     const mainFilePath = path.join(GENERATED_DATA_DIR, 'voice-cards.json');
     
@@ -34,17 +34,66 @@ async function loadVoiceCardData() {
   }
 }
 
-// Function to get a card by index (sequential order)
-async function getCardByIndex(index: number): Promise<CardType | null> {
+// Card index (ids only) so cards are fetched one at a time instead of the whole deck
+let cachedIndex: { cards: Array<{ id: string }>; generatedAt?: string } | null = null;
+// Set once the index turns out not to match voice-cards.json; the full file is used from then on
+let indexUnusable = false;
+
+async function loadCardIndex() {
+  if (indexUnusable) return null;
+  if (!cachedIndex) {
+    const indexResponse = await fetch('/api/generated-data?index=true');
+    if (!indexResponse.ok) return null; // Older decks only have voice-cards.json, or the index is out of date
+    cachedIndex = await indexResponse.json();
+  }
+  // A full file loaded earlier from a different generation wins over the index
+  if (cachedData && cachedData.generatedAt !== cachedIndex?.generatedAt) {
+    console.warn('Card index does not match voice-cards.json, using the full file');
+    dropCardIndex();
+    return null;
+  }
+  return cachedIndex;
+}
+
+function dropCardIndex() {
+  cachedIndex = null;
+  indexUnusable = true;
+}
+
+async function getCardCount(): Promise<number> {
+  const index = await loadCardIndex();
+  if (index) return index.cards.length;
+  const data = await loadVoiceCardData();
+  return data ? data.voiceCardTypes.length : 0;
+}
+
+async function fetchCard(index: number): Promise<CardType | null> {
+  const cardIndex = await loadCardIndex();
+  if (cardIndex) {
+    const entry = cardIndex.cards[index];
+    if (!entry) return null;
+    const cardResponse = await fetch(`/api/generated-data?card=${encodeURIComponent(entry.id)}`);
+    if (cardResponse.ok) return await cardResponse.json();
+    // The deck changed under the cached index (regenerated since the page loaded)
+    dropCardIndex();
+    cachedData = null;
+  }
+
   const data = await loadVoiceCardData();
   if (!data) return null;
-  const cards = data.voiceCardTypes;
-  
-  if (index >= cards.length || index < 0) {
-    return null; // End of deck or invalid index
+  return data.voiceCardTypes[index] ?? null;
+}
+
+// Function to get a card by index (sequential order)
+async function getCardByIndex(index: number): Promise<CardType | null> {
+  if (index < 0) {
+    return null; // Invalid index
+  }
+
+  const card = await fetchCard(index);
+  if (!card) {
+    return null; // End of deck
   }
-  
-  const card = cards[index];
   
   // Handle generated images (only for context cards)
   if ('imageUrl' in card && card.imageUrl && card.imageUrl.startsWith('/generated_data/images/')) {
@@ -83,12 +132,11 @@ export default function VocabularyPracticePage() {
     // Load the first card after component mounts
     const loadFirstCard = async () => {
       try {
-        const data = await loadVoiceCardData();
-        if (!data) {
+        const cardCount = await getCardCount();
+        if (!cardCount) {
           console.error('Failed to load voice card data');
           return;
         }
-        const cardCount = data.voiceCardTypes.length;
         setTotalCards(cardCount);
         
         const card = await getCardByIndex(0);
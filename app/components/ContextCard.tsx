@@ -142,9 +142,17 @@ const ContextCard = ({ contextCard, onAnswer, onReset }: ContextCardProps) => {
       // Prepare metadata with activity type, scenario, and voice persona
       const metadata = {
         activityType: 'context',
+        cardId: contextCard.id,
         scenario: contextCard.scenario,
         targetLexicalItem: contextCard.targetLexicalItem,
-        voicePersona: contextCard.voicePersona
+        // The agent resolves the rest of the voice from its persona catalog
+        voicePersona: {
+          voice: { name: contextCard.voicePersona?.voice?.name },
+          persona: {
+            name: contextCard.voicePersona?.persona?.name,
+            teaching_style: contextCard.voicePersona?.persona?.teaching_style
+          }
+        }
       };
       
       // Send metadata via POST body instead of URL to avoid URL length issues
@@ -203,7 +211,31 @@ const ContextCard = ({ contextCard, onAnswer, onReset }: ContextCardProps) => {
             <p className="text-sm leading-relaxed">{contextCard.contextText}</p>
           </div>
           
-          {contextCard.imageUrl && (
+          {contextCard.imageUrl && contextCard.imageVariants && !contextCard.imageUrl.startsWith('data:') ? (
+            <div className="rounded-lg overflow-hidden border">
+              <picture>
+                {contextCard.imageVariants.sources.map(source => (
+                  <source
+                    key={source.type}
+                    type={source.type}
+                    srcSet={source.srcSet}
+                    sizes="(max-width: 768px) 100vw, 800px"
+                  />
+                ))}
+                {/* eslint-disable-next-line @next/next/no-img-element -- variants are pre-built, no optimizer needed */}
+                <img
+                  src={contextCard.imageUrl}
+                  alt={`Context for ${contextCard.scenario.character}`}
+                  width={800}
+                  height={192}
+                  loading="lazy"
+                  decoding="async"
+                  className="w-full h-48 object-cover bg-cover bg-center"
+                  style={{ backgroundImage: `url(${contextCard.imageVariants.placeholder})` }}
+                />
+              </picture>
+            </div>
+          ) : contextCard.imageUrl && (
             <div className="rounded-lg overflow-hidden border">
               <Image
                 src={contextCard.imageUrl}
@@ -1,3 +1,5 @@
+import type { LexicalItemInflections } from './voice-card-types';
+
 export type ActivityType = 'voice' | 'context';
 
 export interface VoicePersona {
@@ -25,18 +27,38 @@ export interface ContextScenario {
   maxTurns?: number;
 }
 
+export interface ImageVariant {
+  format: 'avif' | 'webp';
+  width: number;
+  height: number;
+  bytes: number;
+  url: string;
+}
+
+// Responsive, metadata-free transcodes of imageUrl written by the content pipeline
+export interface ImageVariants {
+  width: number;
+  height: number;
+  placeholder: string; // tiny inline WebP data URI shown while the image loads
+  sources: Array<{ type: string; srcSet: string }>;
+  variants: ImageVariant[];
+  originalBytes: number;
+}
+
 export interface ContextCard {
   id: string;
   type: 'context';
   title: string;
   contextText: string;
   imageUrl: string;
+  imageVariants?: ImageVariants;
   ctaText: string;
   scenario: ContextScenario;
   targetLexicalItem: {
     lexicalItem: string;
     definition: string;
     example: string;
+    inflections?: LexicalItemInflections;
   };
   voicePersona: VoicePersona;
 }
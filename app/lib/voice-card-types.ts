@@ -4,9 +4,20 @@ export interface VoiceCardSense {
   examples: string[];
 }
 
+// Precomputed by the content generator so the agent needs no runtime morphology
+export interface LexicalItemInflections {
+  verb: string;
+  verbForms: string[];
+  particles: string[];
+  separableWindow: number;
+  contiguousPattern: string;
+  separablePattern: string;
+}
+
 export interface VoiceCardLexicalItem {
   lexicalItem: string;
   senses: VoiceCardSense[];
+  inflections?: LexicalItemInflections;
 }
 
 export interface VoiceCard {
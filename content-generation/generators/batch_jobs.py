@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Batch Jobs
+Offline generation through the OpenAI Batch API for bulk regeneration. A job
+directory holds the plan (verbs, personas and seed, fixed on the first export)
+and the exported JSONL request files. Imported results are written straight
+into the generation cache, so every step can be interrupted and re-run, and
+assembling the deck is a normal pipeline run in which every scenario and image
+is a cache hit.
+
+Image prompts are built from the scenarios, so images are a second round:
+
+    python generators/batch_jobs.py export <job_dir>            # scenarios.jsonl
+    python generators/batch_jobs.py submit <job_dir>
+    python generators/batch_jobs.py fetch <job_dir>             # downloads + imports finished batches
+    python generators/batch_jobs.py export <job_dir>            # images.jsonl
+    python generators/batch_jobs.py submit <job_dir>
+    python generators/batch_jobs.py fetch <job_dir>
+    python generators/batch_jobs.py assemble <job_dir>
+
+Results downloaded elsewhere (or a fixture) can be imported directly:
+
+    python generators/batch_jobs.py import <job_dir> <results.jsonl>
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from demo_generator import DemoGenerator
+from downloads import stream_to_file
+
+PLAN_FILE = "plan.json"
+BATCHES_FILE = "batches.json"
+SCENARIOS_FILE = "scenarios.jsonl"
+IMAGES_FILE = "images.jsonl"
+RESULTS_DIR = "results"
+# A batch input file may only target one endpoint
+ENDPOINTS = {SCENARIOS_FILE: "/v1/chat/completions", IMAGES_FILE: "/v1/images/generations"}
+
+
+def write_json_atomic(path: Path, data) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class BatchJob:
+    """Plan, export, import and assemble one offline generation run"""
+
+    def __init__(self, generator: DemoGenerator, job_dir: Path):
+        if not generator.cache.enabled:
+            raise ValueError("Batch results are stored in the generation cache; unset DEMO_CACHE=0")
+        self.generator = generator
+        self.cache = generator.cache
+        self.job_dir = Path(job_dir)
+        self.job_dir.mkdir(parents=True, exist_ok=True)
+        self.plan = self.load_plan()
+        # Cache keys include the seed, so they must match the plan's
+        self.generator.seed = self.plan["seed"]
+        self.items: List[Dict] = self.plan["items"]
+
+    def load_plan(self) -> Dict:
+        """The job's verbs and personas, sampled once so every later step agrees on them"""
+        path = self.job_dir / PLAN_FILE
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+
+        generator = self.generator
+        verbs = generator.add_inflection_tables(generator.get_selected_verbs(generator.load_phrasal_verbs()))
+        plan = {
+            "createdAt": generator.timestamp,
+            "seed": generator.seed,
+            "items": [{"verb": verb, "persona": generator.get_random_persona()} for verb in verbs],
+        }
+        write_json_atomic(path, plan)
+        print(f"📝 Planned {len(verbs)} verbs in {path}")
+        return plan
+
+    def scenario_request(self, item: Dict) -> Tuple[str, Dict]:
+        """(cache key, request body) for an item's scenario"""
+        prompt = self.generator.build_scenario_prompt(item["verb"], item["persona"])
+        key = self.generator.scenario_cache_key(item["verb"], item["persona"], prompt)
+        return key, self.generator.scenario_request(prompt)
+
+    def image_request(self, item: Dict, scenario: Dict) -> Tuple[str, Dict]:
+        """(cache key, request body) for an item's image; inline base64 outlives DALL-E's 1h URLs"""
+        image_prompt = self.generator.build_image_prompt(item["verb"], scenario)
+        key = self.generator.image_cache_key(item["verb"], item["persona"], image_prompt)
+        return key, {**self.generator.image_request(image_prompt), "response_format": "b64_json"}
+
+    def cached_scenario(self, item: Dict) -> Optional[Dict]:
+        key, _ = self.scenario_request(item)
+        return self.cache.peek_scenario(key)
+
+    def status(self) -> Dict[str, int]:
+        scenarios = images = 0
+        for item in self.items:
+            scenario = self.cached_scenario(item)
+            if scenario is None:
+                continue
+            scenarios += 1
+            key, _ = self.image_request(item, scenario)
+            images += self.cache.has(key)
+        return {"items": len(self.items), "scenarios": scenarios, "images": images}
+
+    def export(self) -> Dict[str, int]:
+        """Write request files for everything not in the cache yet; images once their scenario is"""
+        requests = {SCENARIOS_FILE: [], IMAGES_FILE: []}
+        for index, item in enumerate(self.items):
+            scenario = self.cached_scenario(item)
+            if scenario is None:
+                _, body = self.scenario_request(item)
+                requests[SCENARIOS_FILE].append((f"scenario-{index}", body))
+                continue
+            key, body = self.image_request(item, scenario)
+            if not self.cache.has(key):
+                requests[IMAGES_FILE].append((f"image-{index}", body))
+
+        for filename, lines in requests.items():
+            path = self.job_dir / filename
+            if not lines:
+                # Nothing left for this endpoint; don't leave a stale file to resubmit
+                path.unlink(missing_ok=True)
+                continue
+            with open(path, "w", encoding="utf-8") as f:
+                for custom_id, body in lines:
+                    request = {"custom_id": custom_id, "method": "POST", "url": ENDPOINTS[filename], "body": body}
+                    f.write(json.dumps(request, ensure_ascii=False) + "\n")
+            print(f"📤 {len(lines)} requests -> {path}")
+
+        counts = {filename: len(lines) for filename, lines in requests.items()}
+        if not any(counts.values()):
+            print("✅ Every scenario and image is cached; run `assemble`")
+        return counts
+
+    async def import_results(self, results_path: Path) -> Dict[str, int]:
+        """Store every successful result in the cache. Safe to re-run: cached entries are skipped"""
+        counts = {"imported": 0, "skipped": 0, "failed": 0, "unknown": 0}
+        with open(results_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                kind, _, index = result.get("custom_id", "").rpartition("-")
+                if kind not in ("scenario", "image") or not index.isdigit() or int(index) >= len(self.items):
+                    counts["unknown"] += 1
+                    continue
+                item = self.items[int(index)]
+                response = result.get("response") or {}
+                if result.get("error") or response.get("status_code") != 200:
+                    counts["failed"] += 1
+                    print(f"⚠️  {result['custom_id']} ({item['verb']['lexicalItem']}) failed: {result.get('error') or response}")
+                    continue
+                if kind == "scenario":
+                    outcome = self.import_scenario(item, response["body"])
+                else:
+                    outcome = await self.import_image(item, response["body"])
+                counts[outcome] += 1
+
+        print(
+            f"📥 {results_path}: {counts['imported']} imported, {counts['skipped']} already cached, "
+            f"{counts['failed']} failed, {counts['unknown']} unknown (failed items are re-exported)"
+        )
+        return counts
+
+    def import_scenario(self, item: Dict, body: Dict) -> str:
+        key, _ = self.scenario_request(item)
+        if self.cache.has(key):
+            return "skipped"
+        try:
+            scenario = json.loads(body["choices"][0]["message"]["content"])
+        except (KeyError, IndexError, ValueError):
+            return "failed"
+        if not self.generator.is_valid_scenario(scenario, item["verb"]):
+            print(f"⚠️  Scenario for {item['verb']['lexicalItem']} is incomplete; it will be re-exported")
+            return "failed"
+        scenario["character_name"] = item["persona"]["persona"]["name"]
+        self.cache.put_scenario(key, scenario, {"lexicalItem": item["verb"]["lexicalItem"], "batch": True})
+        return "imported"
+
+    async def import_image(self, item: Dict, body: Dict) -> str:
+        scenario = self.cached_scenario(item)
+        if scenario is None:
+            return "unknown"  # The image was requested for a scenario this cache doesn't have
+        key, _ = self.image_request(item, scenario)
+        if self.cache.has(key):
+            return "skipped"
+
+        data = (body.get("data") or [{}])[0]
+        tmp_path = self.job_dir / RESULTS_DIR / f"{key}.png"
+        tmp_path.parent.mkdir(exist_ok=True)
+        try:
+            if data.get("b64_json"):
+                await asyncio.to_thread(tmp_path.write_bytes, base64.b64decode(data["b64_json"]))
+            elif data.get("url"):
+                await stream_to_file(self.generator.get_http_client(), data["url"], tmp_path)
+            else:
+                return "failed"
+            meta = {"lexicalItem": item["verb"]["lexicalItem"], "batch": True}
+            await asyncio.to_thread(self.cache.put_image, key, tmp_path, meta)
+        except Exception as e:
+            print(f"⚠️  Image for {item['verb']['lexicalItem']} could not be stored: {e}")
+            return "failed"
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return "imported"
+
+    def load_batches(self) -> Dict[str, Dict]:
+        path = self.job_dir / BATCHES_FILE
+        if not path.exists():
+            return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    async def submit(self) -> None:
+        """Upload the exported request files and start a 24h batch for each"""
+        batches = self.load_batches()
+        client = self.generator.client
+        for filename, endpoint in ENDPOINTS.items():
+            path = self.job_dir / filename
+            if not path.exists():
+                continue
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            if any(b["sha256"] == digest and b["status"] != "failed" for b in batches.values()):
+                print(f"⏭️  {filename} is already submitted")
+                continue
+            with open(path, "rb") as f:
+                uploaded = await client.files.create(file=f, purpose="batch")
+            batch = await client.batches.create(
+                input_file_id=uploaded.id, endpoint=endpoint, completion_window="24h"
+            )
+            batches[batch.id] = {"file": filename, "sha256": digest, "status": batch.status, "imported": False}
+            write_json_atomic(self.job_dir / BATCHES_FILE, batches)
+            print(f"🚀 Submitted {filename} as batch {batch.id}")
+
+    async def fetch(self) -> None:
+        """Download and import every finished batch that hasn't been imported yet"""
+        batches = self.load_batches()
+        client = self.generator.client
+        for batch_id, entry in batches.items():
+            if entry["imported"]:
+                continue
+            batch = await client.batches.retrieve(batch_id)
+            entry["status"] = batch.status
+            counts = batch.request_counts
+            print(
+                f"⏳ {batch_id} ({entry['file']}): {batch.status}"
+                + (f", {counts.completed}/{counts.total} done, {counts.failed} failed" if counts else "")
+            )
+            if batch.status != "completed":
+                continue
+            for file_id in filter(None, (batch.output_file_id, batch.error_file_id)):
+                results_path = self.job_dir / RESULTS_DIR / f"{batch_id}-{file_id}.jsonl"
+                results_path.parent.mkdir(exist_ok=True)
+                if not results_path.exists():
+                    content = await client.files.content(file_id)
+                    await asyncio.to_thread(results_path.write_bytes, content.read())
+                await self.import_results(results_path)
+            entry["imported"] = True
+            write_json_atomic(self.job_dir / BATCHES_FILE, batches)
+
+    async def assemble(self, live_images: bool = False) -> Optional[Path]:
+        """Run the regular pipeline over the plan; every scenario (and image) comes from the cache"""
+        status = self.status()
+        missing_images = status["scenarios"] - status["images"]
+        if status["scenarios"] < status["items"] or (missing_images and not live_images):
+            print(
+                f"❌ {status['items'] - status['scenarios']} scenarios and {missing_images} images still missing; "
+                "export and import them first"
+                + ("" if live_images else " (or pass --live-images to generate the images live)")
+            )
+            return None
+        self.generator.persona_plan = [item["persona"] for item in self.items]
+        return await self.generator.generate_all_cards([item["verb"] for item in self.items])
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Offline generation through the OpenAI Batch API")
+    parser.add_argument("command", choices=["export", "submit", "fetch", "import", "status", "assemble"])
+    parser.add_argument("job_dir", type=Path, help="directory holding the plan, requests and results")
+    parser.add_argument("results", type=Path, nargs="?", help="results JSONL (import only)")
+    parser.add_argument("--live-images", action="store_true", help="assemble: generate missing images live")
+    args = parser.parse_args()
+
+    generator = DemoGenerator()
+    job = BatchJob(generator, args.job_dir)
+    try:
+        if args.command == "export":
+            job.export()
+        elif args.command == "submit":
+            await job.submit()
+        elif args.command == "fetch":
+            await job.fetch()
+        elif args.command == "import":
+            if args.results is None:
+                parser.error("import needs a results file")
+            await job.import_results(args.results)
+        elif args.command == "status":
+            status = job.status()
+            print(f"📊 {status['scenarios']}/{status['items']} scenarios, {status['images']}/{status['items']} images cached")
+        else:
+            await job.assemble(args.live_images)
+    finally:
+        await generator.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
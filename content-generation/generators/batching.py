@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Micro-batching
+Collects items submitted by concurrent workers into batches of up to
+`batch_size` (or whatever arrived within `max_wait` seconds), hands each batch
+to one async handler and resolves every caller with its own result. Lets a
+per-item pipeline stage share a single API request across several items
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# The handler returns one result per item, None for items it couldn't produce
+BatchHandler = Callable[[List[Any]], Awaitable[List[Optional[Any]]]]
+
+# Result for every item of a batch whose handler raised, so callers can tell a
+# failed request (retrying per item won't help) from an item the handler rejected
+BATCH_FAILED = object()
+
+
+class MicroBatcher:
+    def __init__(self, handler: BatchHandler, batch_size: int, max_wait: float = 0.1):
+        self.handler = handler
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.items = 0
+        self.failed = 0
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+
+    async def submit(self, item: Any) -> Optional[Any]:
+        """Result for this item, None if the handler didn't produce one, BATCH_FAILED if it raised"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = await self.handler([item for item, _ in batch])
+        except Exception as e:
+            print(f"⚠️  Batch of {len(batch)} failed: {e}")
+            results = [BATCH_FAILED] * len(batch)
+        # Every caller gets an answer, even if the handler came back short
+        results = list(results) + [None] * (len(batch) - len(results))
+        for (_, future), result in zip(batch, results):
+            if result is None or result is BATCH_FAILED:
+                self.failed += 1
+            if not future.done():
+                future.set_result(result)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "batchSize": self.batch_size,
+            "batches": self.batches,
+            "items": self.items,
+            "failedItems": self.failed,
+            "meanBatchSize": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Download Benchmark
+Serves fake DALL-E sized PNGs from a local HTTP server and downloads many of
+them concurrently, comparing the old approach (a new client per image, the
+whole body in memory, a blocking write on the loop) with the shared pooled
+client streaming to disk. Also reports the worst event loop stall seen while
+downloading, since that is what delays the other pipeline stages
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Awaitable, Callable, Dict
+
+import httpx
+
+from downloads import create_http_client, stream_to_file
+
+
+def start_server(image_bytes: int) -> ThreadingHTTPServer:
+    payload = os.urandom(image_bytes)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def download_per_request_client(url: str, path: Path) -> None:
+    """What demo_generator.py did before: new client, whole body, blocking write"""
+    async with httpx.AsyncClient() as client:
+        response = await client.get(url)
+        with open(path, "wb") as f:
+            f.write(response.content)
+
+
+async def measure(
+    name: str,
+    download: Callable[[str, Path], Awaitable[None]],
+    url: str,
+    count: int,
+    concurrency: int,
+    out_dir: Path,
+    image_bytes: int,
+) -> Dict[str, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    max_stall = 0.0
+    done = asyncio.Event()
+
+    async def watch_loop():
+        nonlocal max_stall
+        while not done.is_set():
+            started_at = time.perf_counter()
+            await asyncio.sleep(0.005)
+            max_stall = max(max_stall, time.perf_counter() - started_at - 0.005)
+
+    async def one(i: int):
+        async with semaphore:
+            await download(f"{url}/image-{i}.png", out_dir / f"image-{i}.png")
+
+    watcher = asyncio.create_task(watch_loop())
+    started_at = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(count)])
+    elapsed = time.perf_counter() - started_at
+    done.set()
+    await watcher
+
+    row = {
+        "seconds": elapsed,
+        "imagesPerSecond": count / elapsed,
+        "mbPerSecond": count * image_bytes / elapsed / 1e6,
+        "maxLoopStallMs": max_stall * 1000,
+    }
+    print(
+        f"   {name:<28} {row['seconds']:>6.2f}s  {row['imagesPerSecond']:>7.1f} img/s  "
+        f"{row['mbPerSecond']:>7.1f} MB/s  max loop stall {row['maxLoopStallMs']:>6.1f}ms"
+    )
+    return row
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--images", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32, help="downloads in flight")
+    parser.add_argument("--size-kb", type=int, default=1500, help="bytes per image (DALL-E PNGs are ~1.5MB)")
+    args = parser.parse_args()
+
+    image_bytes = args.size_kb * 1024
+    server = start_server(image_bytes)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    out_dir = Path(tempfile.mkdtemp(prefix="download-bench-"))
+    print(
+        f"⬇️  Downloading {args.images} x {args.size_kb}KB images, {args.concurrency} in flight"
+    )
+
+    try:
+        await measure(
+            "new client + blocking write",
+            download_per_request_client,
+            url, args.images, args.concurrency, out_dir, image_bytes,
+        )
+        async with create_http_client(max_connections=args.concurrency) as client:
+            await measure(
+                "shared client + streaming",
+                lambda u, p: stream_to_file(client, u, p),
+                url, args.images, args.concurrency, out_dir, image_bytes,
+            )
+    finally:
+        server.shutdown()
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Inflection Table Builder
+Stores inflected forms and separable match patterns for every phrasal verb in
+the PHaVE list and in already generated cards, so the agent loads ready-made
+match tables instead of deriving verb forms at runtime
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.append(str(Path(__file__).parent.parent.parent / "agent" / "src"))
+from services.card_store import CARDS_DIR, CardStore, shard_voice_cards
+from services.inflections import inflection_table
+
+PHAVE_PATH = Path(__file__).parent.parent / "data" / "phrasal_verbs_phave_list.json"
+CARDS_PATH = Path(__file__).parent.parent.parent / "app" / "generated_data" / "voice-cards.json"
+
+
+def annotate_phave(path: Path = PHAVE_PATH) -> int:
+    """Add an `inflections` table to every PHaVE entry"""
+    with open(path, encoding="utf-8") as f:
+        verbs: List[Dict] = json.load(f)
+
+    for verb in verbs:
+        verb["inflections"] = inflection_table(verb["verb"])
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(verbs, f, indent=2, ensure_ascii=False)
+    return len(verbs)
+
+
+def annotate_cards(path: Path = CARDS_PATH) -> int:
+    """Add an `inflections` table to the target lexical item of every card"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    for card in data["voiceCardTypes"]:
+        target = card["targetLexicalItem"]
+        target["inflections"] = inflection_table(target["lexicalItem"])
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    # Keep the sharded copy of the deck in sync
+    if CardStore.exists(str(path.parent / CARDS_DIR)):
+        shard_voice_cards(str(path))
+    return len(data["voiceCardTypes"])
+
+
+def main():
+    """Main entry point"""
+    print(f"✅ Stored inflection tables for {annotate_phave()} PHaVE verbs in {PHAVE_PATH}")
+    if CARDS_PATH.exists():
+        print(f"✅ Stored inflection tables for {annotate_cards()} cards in {CARDS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,38 +5,204 @@ Generates enhanced voice card data with OpenAI-powered content and images
 """
 
 import asyncio
+import copy
 import json
 import os
 import random
+import shutil
+import sys
+import textwrap
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 import httpx
 from dotenv import load_dotenv
-from openai import AsyncOpenAI
+from openai import APIError, AsyncOpenAI
+
+sys.path.append(str(Path(__file__).parent.parent.parent / "agent" / "src"))
+from services.card_store import CARDS_DIR, CardStore
+from services.card_stream import STREAM_FILE, CardStreamWriter, compact_card_stream
+from services.inflections import inflection_table
+from services.voice_catalog import DEFAULT_CATALOG_PATH, VoiceCatalog
+
+from batching import BATCH_FAILED, MicroBatcher
+from downloads import create_http_client, stream_to_file
+from generation_cache import CACHE_DIR, GenerationCache, cache_key, prompt_hash
+from image_variants import ImagePostProcessor, card_image_variants
+from persona_catalog import NameBanks, PersonaCatalog
+from pipeline import Stage, StagedPipeline
+from rate_limits import AdaptiveLimiter
 
 load_dotenv(Path(__file__).parent.parent / ".env.local")
 
 VOICE_PERSONAS_PATH = Path(__file__).parent.parent / "data" / "google_voice_personas.json"
 PHRASAL_VERBS_CONFIG_PATH = Path(__file__).parent.parent / "data" / "phrasal_verbs_config.json"
+PHAVE_PATH = Path(__file__).parent.parent / "data" / "phrasal_verbs_phave_list.json"
+
+SCENARIO_MODEL = "gpt-4o-mini"
+IMAGE_MODEL = "dall-e-3"
+SCENARIO_SYSTEM_PROMPT = "You are an English teacher specializing in technical English for software developers. Create realistic scenarios that developers would encounter in their daily work."
+# Scenario fields every generated item must fill in (besides the alternative_scenarios list)
+SCENARIO_TEXT_FIELDS = (
+    "scenario_title",
+    "character_role",
+    "situation",
+    "conversation_starter",
+    "expected_usage",
+    "business_context",
+    "learning_tip",
+)
+# (verb, persona) pairs per scenario request; 1 sends one request per verb
+DEFAULT_SCENARIO_BATCH_SIZE = 4
+
+# Workers per pipeline stage; override with e.g. DEMO_IMAGE_CONCURRENCY=5. For the scenario and
+# image stages this is the ceiling: the adaptive limiters decide how many requests are in flight
+DEFAULT_STAGE_CONCURRENCY = {
+    "load": 1,
+    "persona": 1,
+    "scenario": 8,
+    "image": 8,
+    "download": 8,
+    "postprocess": 4,
+    "assemble": 1,
+}
+
+# Tech-focused overrides applied to every sampled persona
+TECH_ROLES = [
+    "Senior Software Engineer",
+    "Tech Lead",
+    "Engineering Manager",
+    "CTO",
+    "Product Manager",
+    "DevOps Engineer",
+    "QA Lead",
+    "Scrum Master",
+]
+TECH_TEACHING_STYLES = [
+    "direct and technical",
+    "collaborative and supportive",
+    "methodical and thorough",
+    "practical and hands-on",
+    "clear and structured",
+    "patient and encouraging",
+]
+TECH_CONTEXTS = [
+    "code reviews",
+    "sprint planning",
+    "technical discussions",
+    "architecture meetings",
+    "deployment planning",
+    "incident response",
+    "team retrospectives",
+]
+TECH_TRAITS = [
+    "analytical",
+    "problem-solving",
+    "collaborative",
+    "detail-oriented",
+    "supportive",
+    "technical",
+    "clear",
+    "patient",
+]
 
 
 class DemoGenerator:
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # Retries are handled by the adaptive limiters below, not the SDK
+        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
         self.timestamp = datetime.now().strftime("%Y-%m-%d-%H%M%S")
         self.output_dir = Path(__file__).parent.parent / "output" / f"voice-cards-{self.timestamp}"
         self.images_dir = self.output_dir / "images"
-        self.voice_personas = self.load_voice_personas()
         self.used_personas = set()
-        self.ensure_directories()
+        # Personas fixed ahead of time (by a batch job), one per verb index
+        self.persona_plan: Optional[List[Dict]] = None
+        # Same seed + same verb list -> same personas, so cached scenarios and images line up
+        self.seed = int(os.getenv("DEMO_SEED", "0"))
+        self.rng = random.Random(self.seed)
+        self.persona_catalog = self.load_persona_catalog()
+        self.name_banks = NameBanks(self.rng)
+        # Optional persona filters, e.g. DEMO_PERSONA_LANGUAGE=en-GB DEMO_PERSONA_GENDER=FEMALE
+        self.persona_filter = (
+            os.getenv("DEMO_PERSONA_LANGUAGE"),
+            os.getenv("DEMO_PERSONA_GENDER"),
+            os.getenv("DEMO_PERSONA_VOICE_TYPE"),
+        )
+        self.cache = GenerationCache(
+            Path(os.getenv("DEMO_CACHE_DIR", CACHE_DIR)),
+            enabled=os.getenv("DEMO_CACHE", "1") != "0",
+        )
+        self.stage_concurrency = {
+            stage: int(os.getenv(f"DEMO_{stage.upper()}_CONCURRENCY", default))
+            for stage, default in DEFAULT_STAGE_CONCURRENCY.items()
+        }
+        # Scenario requests are shared by up to DEMO_SCENARIO_BATCH_SIZE verbs
+        self.scenario_batch_size = int(os.getenv("DEMO_SCENARIO_BATCH_SIZE", DEFAULT_SCENARIO_BATCH_SIZE))
+        self.scenario_batcher = (
+            MicroBatcher(self.generate_scenario_batch, self.scenario_batch_size)
+            if self.scenario_batch_size > 1
+            else None
+        )
+        if self.scenario_batcher:
+            # Batches only fill if enough scenario workers are waiting on them
+            self.stage_concurrency["scenario"] = max(self.stage_concurrency["scenario"], self.scenario_batch_size)
+        self.scenario_usage = {"requests": 0, "promptTokens": 0, "completionTokens": 0, "requeuedItems": 0}
+        # AIMD concurrency per endpoint, driven by 429s and rate-limit headers; the image
+        # limiter starts at the old fixed 3 in flight. DEMO_MAX_RETRIES bounds retries per call
+        max_retries = int(os.getenv("DEMO_MAX_RETRIES", "5"))
+        self.chat_limiter = AdaptiveLimiter("chat", self.stage_concurrency["scenario"], max_retries=max_retries)
+        self.image_limiter = AdaptiveLimiter(
+            "image", self.stage_concurrency["image"], initial=3, max_retries=max_retries
+        )
+        self.http: Optional[httpx.AsyncClient] = None
+        # Finished cards are appended here as they complete, fsynced every DEMO_FSYNC_EVERY cards
+        self.card_stream_path = self.output_dir / STREAM_FILE
+        self.card_stream: Optional[CardStreamWriter] = None
+        # Image transcoding runs in its own process pool (DEMO_POSTPROCESS_WORKERS, default: all cores)
+        self.postprocessor = ImagePostProcessor(int(os.getenv("DEMO_POSTPROCESS_WORKERS", "0")) or None)
+
+    def get_http_client(self) -> httpx.AsyncClient:
+        """Shared pooled client, created on first use inside the running loop"""
+        if self.http is None:
+            self.http = create_http_client(max_connections=self.stage_concurrency["download"])
+        return self.http
+
+    async def close(self):
+        if self.http is not None:
+            await self.http.aclose()
+            self.http = None
+        await asyncio.to_thread(self.postprocessor.close)
+        await asyncio.to_thread(self.cache.compact)
 
     def ensure_directories(self):
         """Create necessary directories if they don't exist"""
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.images_dir.mkdir(exist_ok=True)
 
+    def load_phrasal_verbs(self) -> List[Dict]:
+        """Load the verbs to generate: the active config set, or the full PHaVE list"""
+        if os.getenv("PHRASAL_VERB_SOURCE") == "phave":
+            return self.load_phrasal_verbs_from_phave()
+        return self.load_phrasal_verbs_from_config()
+
+    def load_phrasal_verbs_from_phave(self) -> List[Dict]:
+        """Load all PHaVE phrasal verbs in the config's verb format"""
+        with open(PHAVE_PATH, encoding="utf-8") as f:
+            phave = json.load(f)
+
+        verbs = [
+            {
+                "lexicalItem": entry["verb"],
+                "difficulty": "B1",  # PHaVE has no CEFR levels
+                "senses": entry["senses"],
+                **({"inflections": entry["inflections"]} if "inflections" in entry else {}),
+            }
+            for entry in phave
+        ]
+        print(f"📚 Loaded PHaVE list ({len(verbs)} verbs)")
+        return verbs
+
     def load_phrasal_verbs_from_config(self) -> List[Dict]:
         """Load phrasal verbs from configuration file"""
         try:
@@ -54,6 +220,12 @@ class DemoGenerator:
             print("🔄 Falling back to hardcoded verbs")
             return self.get_fallback_phrasal_verbs()
     
+    def add_inflection_tables(self, verbs: List[Dict]) -> List[Dict]:
+        """Precompute inflected forms and match patterns so the agent doesn't have to"""
+        for verb in verbs:
+            verb.setdefault("inflections", inflection_table(verb["lexicalItem"]))
+        return verbs
+
     def get_fallback_phrasal_verbs(self) -> List[Dict]:
         """Fallback phrasal verbs if config file fails"""
         return [
@@ -77,237 +249,39 @@ class DemoGenerator:
         try:
             with open(VOICE_PERSONAS_PATH, encoding="utf-8") as f:
                 data = json.load(f)
-            return data["personas"]
+            # Voice-name order, like the binary catalog, so a seed picks the same personas from either
+            return sorted(data["personas"], key=lambda p: p["voice"]["name"])
         except Exception as e:
             print(f"Error loading voice personas: {e}")
             return []
 
+    def load_persona_catalog(self) -> PersonaCatalog:
+        """Index personas from the binary voice catalog when built, else from the JSON"""
+        catalog_path = os.getenv("VOICE_CATALOG_PATH", DEFAULT_CATALOG_PATH)
+        if VoiceCatalog.exists(catalog_path):
+            catalog = VoiceCatalog(catalog_path)
+            print(f"🎭 Using voice catalog {catalog.path} ({len(catalog)} personas)")
+            return PersonaCatalog.from_voice_catalog(catalog, self.rng)
+        return PersonaCatalog(self.load_voice_personas(), self.rng)
+
     def get_culturally_appropriate_name(self, language_code: str, gender: str) -> Dict:
         """Get culturally appropriate name based on voice language and gender"""
-        name_mappings = {
-            "en-US": {
-                "MALE": ["Mr. Johnson", "Mr. Smith", "Mr. Davis", "Mr. Williams"],
-                "FEMALE": ["Ms. Johnson", "Ms. Smith", "Ms. Davis", "Ms. Williams"],
-            },
-            "en-GB": {
-                "MALE": ["Mr. Thompson", "Mr. Clarke", "Mr. Brown", "Mr. Wilson"],
-                "FEMALE": ["Ms. Thompson", "Ms. Clarke", "Ms. Brown", "Ms. Wilson"],
-            },
-            "en-AU": {
-                "MALE": ["Mr. Anderson", "Mr. Campbell", "Mr. Fraser", "Mr. Stewart"],
-                "FEMALE": ["Ms. Anderson", "Ms. Campbell", "Ms. Fraser", "Ms. Stewart"],
-            },
-            "en-CA": {
-                "MALE": ["Mr. MacDonald", "Mr. Taylor", "Mr. Miller", "Mr. White"],
-                "FEMALE": ["Ms. MacDonald", "Ms. Taylor", "Ms. Miller", "Ms. White"],
-            },
-            "en-IN": {
-                "MALE": ["Mr. Sharma", "Mr. Patel", "Mr. Singh", "Mr. Kumar"],
-                "FEMALE": ["Ms. Sharma", "Ms. Patel", "Ms. Singh", "Ms. Kumar"],
-            },
-            "es-ES": {
-                "MALE": ["Mr. García", "Mr. Martínez", "Mr. López", "Mr. Rodríguez"],
-                "FEMALE": ["Ms. García", "Ms. Martínez", "Ms. López", "Ms. Rodríguez"],
-            },
-            "es-MX": {
-                "MALE": ["Mr. Hernández", "Mr. González", "Mr. Pérez", "Mr. Sánchez"],
-                "FEMALE": ["Ms. Hernández", "Ms. González", "Ms. Pérez", "Ms. Sánchez"],
-            },
-            "es-US": {
-                "MALE": ["Mr. Hernández", "Mr. González", "Mr. Pérez", "Mr. Sánchez"],
-                "FEMALE": ["Ms. Hernández", "Ms. González", "Ms. Pérez", "Ms. Sánchez"],
-            },
-            "fr-FR": {
-                "MALE": ["Mr. Dubois", "Mr. Moreau", "Mr. Laurent", "Mr. Simon"],
-                "FEMALE": ["Ms. Dubois", "Ms. Moreau", "Ms. Laurent", "Ms. Simon"],
-            },
-            "de-DE": {
-                "MALE": ["Mr. Müller", "Mr. Schmidt", "Mr. Weber", "Mr. Fischer"],
-                "FEMALE": ["Ms. Müller", "Ms. Schmidt", "Ms. Weber", "Ms. Fischer"],
-            },
-            "it-IT": {
-                "MALE": ["Mr. Rossi", "Mr. Bianchi", "Mr. Ferrari", "Mr. Romano"],
-                "FEMALE": ["Ms. Rossi", "Ms. Bianchi", "Ms. Ferrari", "Ms. Romano"],
-            },
-            "pt-BR": {
-                "MALE": ["Mr. Silva", "Mr. Santos", "Mr. Oliveira", "Mr. Pereira"],
-                "FEMALE": ["Ms. Silva", "Ms. Santos", "Ms. Oliveira", "Ms. Pereira"],
-            },
-            "ja-JP": {
-                "MALE": ["Mr. Tanaka", "Mr. Sato", "Mr. Suzuki", "Mr. Takahashi"],
-                "FEMALE": ["Ms. Tanaka", "Ms. Sato", "Ms. Suzuki", "Ms. Takahashi"],
-            },
-            "ko-KR": {
-                "MALE": ["Mr. Kim", "Mr. Lee", "Mr. Park", "Mr. Choi"],
-                "FEMALE": ["Ms. Kim", "Ms. Lee", "Ms. Park", "Ms. Choi"],
-            },
-            "zh-CN": {
-                "MALE": ["Mr. Wang", "Mr. Li", "Mr. Zhang", "Mr. Liu"],
-                "FEMALE": ["Ms. Wang", "Ms. Li", "Ms. Zhang", "Ms. Liu"],
-            },
-            "cmn-CN": {
-                "MALE": ["Mr. Wang", "Mr. Li", "Mr. Zhang", "Mr. Liu"],
-                "FEMALE": ["Ms. Wang", "Ms. Li", "Ms. Zhang", "Ms. Liu"],
-            },
-            "hi-IN": {
-                "MALE": ["Mr. Sharma", "Mr. Patel", "Mr. Singh", "Mr. Kumar"],
-                "FEMALE": ["Ms. Sharma", "Ms. Patel", "Ms. Singh", "Ms. Kumar"],
-            },
-            "ar-XA": {
-                "MALE": ["Mr. Ahmed", "Mr. Mohammed", "Mr. Ali", "Mr. Hassan"],
-                "FEMALE": ["Ms. Fatima", "Ms. Aisha", "Ms. Zeinab", "Ms. Mariam"],
-            },
-            "ru-RU": {
-                "MALE": ["Mr. Petrov", "Mr. Ivanov", "Mr. Smirnov", "Mr. Kuznetsov"],
-                "FEMALE": [
-                    "Ms. Petrova",
-                    "Ms. Ivanova",
-                    "Ms. Smirnova",
-                    "Ms. Kuznetsova",
-                ],
-            },
-            "nl-NL": {
-                "MALE": [
-                    "Mr. de Jong",
-                    "Mr. Jansen",
-                    "Mr. de Vries",
-                    "Mr. van den Berg",
-                ],
-                "FEMALE": [
-                    "Ms. de Jong",
-                    "Ms. Jansen",
-                    "Ms. de Vries",
-                    "Ms. van den Berg",
-                ],
-            },
-            "sv-SE": {
-                "MALE": [
-                    "Mr. Andersson",
-                    "Mr. Johansson",
-                    "Mr. Karlsson",
-                    "Mr. Nilsson",
-                ],
-                "FEMALE": [
-                    "Ms. Andersson",
-                    "Ms. Johansson",
-                    "Ms. Karlsson",
-                    "Ms. Nilsson",
-                ],
-            },
-            "th-TH": {
-                "MALE": ["Mr. Somchai", "Mr. Somsak", "Mr. Sombat", "Mr. Somkid"],
-                "FEMALE": ["Ms. Siriporn", "Ms. Somjit", "Ms. Sirikul", "Ms. Somying"],
-            },
-            "vi-VN": {
-                "MALE": ["Mr. Nguyen", "Mr. Tran", "Mr. Le", "Mr. Pham"],
-                "FEMALE": ["Ms. Nguyen", "Ms. Tran", "Ms. Le", "Ms. Pham"],
-            },
-            "bn-IN": {
-                "MALE": ["Mr. Rahman", "Mr. Ahmed", "Mr. Khan", "Mr. Islam"],
-                "FEMALE": ["Ms. Rahman", "Ms. Ahmed", "Ms. Khan", "Ms. Islam"],
-            },
-            "ur-IN": {
-                "MALE": ["Mr. Khan", "Mr. Ahmed", "Mr. Ali", "Mr. Shah"],
-                "FEMALE": ["Ms. Khan", "Ms. Ahmed", "Ms. Ali", "Ms. Shah"],
-            },
-            "ml-IN": {
-                "MALE": ["Mr. Nair", "Mr. Pillai", "Mr. Menon", "Mr. Kumar"],
-                "FEMALE": ["Ms. Nair", "Ms. Pillai", "Ms. Menon", "Ms. Kumar"],
-            },
-            "uk-UA": {
-                "MALE": [
-                    "Mr. Kovalenko",
-                    "Mr. Bondarenko",
-                    "Mr. Tkachenko",
-                    "Mr. Koval",
-                ],
-                "FEMALE": [
-                    "Ms. Kovalenko",
-                    "Ms. Bondarenko",
-                    "Ms. Tkachenko",
-                    "Ms. Koval",
-                ],
-            },
-        }
-
-        # Use base language code if specific variant not found
-        base_lang = language_code.split("-")[0]
-        if language_code not in name_mappings and base_lang == "en":
-            language_code = "en-US"
-        elif language_code not in name_mappings:
-            for key in name_mappings.keys():
-                if key.startswith(base_lang):
-                    language_code = key
-                    break
-            else:
-                language_code = "en-US"  # fallback
-
-        names = name_mappings.get(language_code, name_mappings["en-US"])
-        available_names = names.get(gender, names["MALE"])
-
-        # Track used names to avoid repeats
-        if not hasattr(self, "used_names"):
-            self.used_names = set()
-
-        # Filter out used names
-        unused_names = [name for name in available_names if name not in self.used_names]
-        if not unused_names:
-            self.used_names.clear()  # Reset if all used
-            unused_names = available_names
-
-        selected_name = random.choice(unused_names)
-        self.used_names.add(selected_name)
-
-        return {
-            "name": selected_name,
-            "cultural_background": self.get_cultural_background(language_code),
-            "language_region": language_code,
-        }
+        return self.name_banks.pick(language_code, gender)
 
     def get_cultural_background(self, language_code: str) -> str:
         """Get cultural background description for image generation"""
-        backgrounds = {
-            "en-US": "American professional",
-            "en-GB": "British professional",
-            "en-AU": "Australian professional",
-            "en-CA": "Canadian professional",
-            "en-IN": "Indian professional",
-            "es-ES": "Spanish professional",
-            "es-MX": "Mexican professional",
-            "fr-FR": "French professional",
-            "de-DE": "German professional",
-            "it-IT": "Italian professional",
-            "pt-BR": "Brazilian professional",
-            "ja-JP": "Japanese professional",
-            "ko-KR": "Korean professional",
-            "zh-CN": "Chinese professional",
-            "cmn-CN": "Chinese professional",
-            "hi-IN": "Indian professional",
-            "ar-XA": "Middle Eastern professional",
-            "ru-RU": "Russian professional",
-            "nl-NL": "Dutch professional",
-            "sv-SE": "Swedish professional",
-        }
-        return backgrounds.get(language_code, "international professional")
+        return self.name_banks.backgrounds.get(language_code, "international professional")
 
     def get_random_persona(self) -> Dict:
         """Get a random voice persona with culturally appropriate name"""
-        if not self.voice_personas:
+        if not len(self.persona_catalog):
             return self.get_fallback_persona()
 
-        # Filter out recently used personas
-        available_personas = [
-            p
-            for p in self.voice_personas
-            if p["voice"]["name"] not in self.used_personas
-        ]
-
-        # If all personas are used, reset and reuse
-        if not available_personas:
-            self.used_personas.clear()
-            available_personas = self.voice_personas
+        # No voice repeats until the bucket is exhausted; unknown filters fall back to all voices
+        persona = self.persona_catalog.sample(*self.persona_filter) or self.persona_catalog.sample()
 
-        selected_persona = random.choice(available_personas)
+        # Copy so renaming this persona doesn't rewrite cards that already use it
+        selected_persona = copy.deepcopy(persona)
         self.used_personas.add(selected_persona["voice"]["name"])
 
         # Generate culturally appropriate name
@@ -324,51 +298,10 @@ class DemoGenerator:
         }
         
         # Override with tech-focused expertise and contexts
-        tech_roles = [
-            "Senior Software Engineer",
-            "Tech Lead", 
-            "Engineering Manager",
-            "CTO",
-            "Product Manager",
-            "DevOps Engineer",
-            "QA Lead",
-            "Scrum Master"
-        ]
-        
-        tech_teaching_styles = [
-            "direct and technical",
-            "collaborative and supportive", 
-            "methodical and thorough",
-            "practical and hands-on",
-            "clear and structured",
-            "patient and encouraging"
-        ]
-        
-        tech_contexts = [
-            "code reviews",
-            "sprint planning", 
-            "technical discussions",
-            "architecture meetings",
-            "deployment planning",
-            "incident response",
-            "team retrospectives"
-        ]
-        
-        tech_traits = [
-            "analytical",
-            "problem-solving",
-            "collaborative", 
-            "detail-oriented",
-            "supportive",
-            "technical",
-            "clear",
-            "patient"
-        ]
-        
-        selected_persona["persona"]["expertise"] = random.choice(tech_roles)
-        selected_persona["persona"]["teaching_style"] = random.choice(tech_teaching_styles)
-        selected_persona["persona"]["personality_traits"] = random.sample(tech_traits, 3)
-        selected_persona["persona"]["preferred_contexts"] = random.sample(tech_contexts, 3)
+        selected_persona["persona"]["expertise"] = self.rng.choice(TECH_ROLES)
+        selected_persona["persona"]["teaching_style"] = self.rng.choice(TECH_TEACHING_STYLES)
+        selected_persona["persona"]["personality_traits"] = self.rng.sample(TECH_TRAITS, 3)
+        selected_persona["persona"]["preferred_contexts"] = self.rng.sample(TECH_CONTEXTS, 3)
 
         return selected_persona
 
@@ -402,8 +335,63 @@ class DemoGenerator:
 
     async def generate_workplace_scenario(self, verb: Dict, persona: Dict) -> Dict:
         """Generate a developer-focused workplace scenario using OpenAI"""
+        prompt = self.build_scenario_prompt(verb, persona)
+        key = self.scenario_cache_key(verb, persona, prompt)
+        cached = self.cache.get_scenario(key)
+        if cached is not None:
+            return cached
+
+        if self.scenario_batcher:
+            scenario_data = await self.scenario_batcher.submit((verb, persona))
+            if scenario_data is BATCH_FAILED:
+                # The request itself failed after its retries; asking again per item would too
+                return self.get_fallback_scenario(verb, persona)
+            if scenario_data is not None:
+                self.cache.put_scenario(key, scenario_data, {"lexicalItem": verb["lexicalItem"]})
+                return scenario_data
+            # Only this item failed validation; re-request it on its own
+            self.scenario_usage["requeuedItems"] += 1
+            print(f"  ↩️  Re-requesting the scenario for {verb['lexicalItem']} on its own")
+
+        try:
+            response = await self.create_chat_completion(**self.scenario_request(prompt))
+            self.record_scenario_usage(response)
+
+            scenario_data = json.loads(response.choices[0].message.content)
+            # Ensure character name matches persona name exactly
+            scenario_data["character_name"] = persona["persona"]["name"]
+            self.cache.put_scenario(key, scenario_data, {"lexicalItem": verb["lexicalItem"]})
+            return scenario_data
+        except Exception as e:
+            print(f"Error generating scenario for {verb['lexicalItem']}: {e}")
+            return self.get_fallback_scenario(verb, persona)
+
+    async def create_chat_completion(self, **params):
+        """Chat completion through the adaptive limiter; raises only once retries are spent"""
+        raw = await self.chat_limiter.call(self.client.chat.completions.with_raw_response.create, **params)
+        return raw.parse()
+
+    async def create_image(self, **params):
+        """Image generation through the adaptive limiter; raises only once retries are spent"""
+        raw = await self.image_limiter.call(self.client.images.with_raw_response.generate, **params)
+        return raw.parse()
+
+    def scenario_request(self, prompt: str) -> Dict:
+        """Chat completion parameters for a scenario prompt (also the body of batch requests)"""
+        return {
+            "model": SCENARIO_MODEL,
+            "messages": [
+                {"role": "system", "content": SCENARIO_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            "response_format": {"type": "json_object"},
+            "temperature": 0.7,
+        }
+
+    def build_scenario_prompt(self, verb: Dict, persona: Dict) -> str:
+        """Single-verb scenario prompt; its hash keys the scenario cache in both modes"""
         cefr_level = verb["difficulty"]
-        prompt = f"""
+        return f"""
         You are {persona["persona"]["name"]}, a {persona["persona"]["expertise"]} in a software development company. Create a realistic tech workplace scenario for practicing the phrasal verb "{verb["lexicalItem"]}".
         
         The phrasal verb means: {verb["senses"][0]["definition"]}
@@ -434,27 +422,151 @@ class DemoGenerator:
         }}
         """
 
+    def build_scenario_batch_prompt(self, items: List[Tuple[Dict, Dict]]) -> str:
+        """One prompt for several (verb, persona) pairs, with the shared instructions sent once"""
+        requests = [
+            {
+                "id": str(i),
+                "phrasal_verb": verb["lexicalItem"],
+                "meaning": verb["senses"][0]["definition"],
+                "example": verb["senses"][0]["examples"][0] if verb["senses"][0]["examples"] else "N/A",
+                "cefr_level": verb["difficulty"],
+                "character_name": persona["persona"]["name"],
+                "character_expertise": persona["persona"]["expertise"],
+            }
+            for i, (verb, persona) in enumerate(items)
+        ]
+        return f"""
+        Create one realistic tech workplace scenario for each request below, for practicing its phrasal verb. In each scenario, the request's character_name is a character_expertise in a software development company.
+
+        IMPORTANT: This is for developers learning English. Every scenario should involve:
+        - Software development concepts (pull requests, deployments, code reviews, sprints, etc.)
+        - Tech team roles (developers, QA, DevOps, product managers, etc.)
+        - Real situations developers face (debugging, releases, architecture decisions, etc.)
+
+        Language difficulty should match the request's cefr_level:
+        - A2: Simple, direct sentences with basic tech vocabulary
+        - B1: Clear explanations with common development terminology
+        - B2: More complex scenarios with advanced technical concepts
+
+        Requests:
+        {json.dumps(requests, ensure_ascii=False)}
+
+        Generate a JSON response with exactly one scenario per request:
+        {{
+            "scenarios": [
+                {{
+                    "id": "The request's id",
+                    "scenario_title": "Brief title for the tech scenario",
+                    "character_name": "The request's character_name",
+                    "character_role": "Their tech role (e.g., Senior Developer, Tech Lead, CTO, Product Manager)",
+                    "situation": "Detailed tech situation where the phrasal verb would naturally be used (mention specific dev concepts like pull requests, deployments, code reviews, etc.)",
+                    "conversation_starter": "How the character begins the conversation (use tech context)",
+                    "expected_usage": "How the developer should use the phrasal verb in response (with tech context)",
+                    "difficulty": "The request's cefr_level",
+                    "business_context": "Specific tech context (code review, sprint planning, deployment, incident response, etc.)",
+                    "learning_tip": "A helpful tip for remembering this phrasal verb in tech contexts",
+                    "alternative_scenarios": ["2-3 other tech situations where this verb applies"]
+                }}
+            ]
+        }}
+        """
+
+    async def generate_scenario_batch(self, items: List[Tuple[Dict, Dict]]) -> List[Optional[Dict]]:
+        """Scenarios for several (verb, persona) pairs in one request; None for items that failed validation.
+
+        API errors (transport, rate limits, quota) propagate once the limiter's retries are spent, so the
+        batcher marks the whole batch BATCH_FAILED instead of every item being re-requested on its own
+        """
+        verbs = ", ".join(verb["lexicalItem"] for verb, _ in items)
         try:
-            response = await self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an English teacher specializing in technical English for software developers. Create realistic scenarios that developers would encounter in their daily work.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.7,
+            response = await self.create_chat_completion(
+                **self.scenario_request(self.build_scenario_batch_prompt(items))
             )
-
-            scenario_data = json.loads(response.choices[0].message.content)
-            # Ensure character name matches persona name exactly
-            scenario_data["character_name"] = persona["persona"]["name"]
-            return scenario_data
+            self.record_scenario_usage(response)
+            entries = json.loads(response.choices[0].message.content).get("scenarios", [])
+        except APIError:
+            raise
         except Exception as e:
-            print(f"Error generating scenario for {verb['verb']}: {e}")
-            return self.get_fallback_scenario(verb, persona)
+            print(f"Error generating scenario batch for {verbs}: {e}")
+            return [None] * len(items)
+
+        by_id = {str(entry.get("id")): entry for entry in entries if isinstance(entry, dict)}
+        results = []
+        for i, (verb, persona) in enumerate(items):
+            scenario_data = by_id.get(str(i))
+            if scenario_data is None or not self.is_valid_scenario(scenario_data, verb):
+                results.append(None)
+                continue
+            scenario_data.pop("id", None)
+            scenario_data["character_name"] = persona["persona"]["name"]
+            results.append(scenario_data)
+        print(f"  📦 Scenario batch ({verbs}): {sum(r is not None for r in results)}/{len(items)} valid")
+        return results
+
+    def is_valid_scenario(self, scenario_data: Dict, verb: Dict) -> bool:
+        """A batched item is usable if every field is filled in at the verb's CEFR level"""
+        alternatives = scenario_data.get("alternative_scenarios")
+        return (
+            all(
+                isinstance(scenario_data.get(field), str) and scenario_data[field].strip()
+                for field in SCENARIO_TEXT_FIELDS
+            )
+            and scenario_data.get("difficulty") == verb["difficulty"]
+            and isinstance(alternatives, list)
+            and bool(alternatives)
+        )
+
+    def record_scenario_usage(self, response) -> None:
+        self.scenario_usage["requests"] += 1
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self.scenario_usage["promptTokens"] += usage.prompt_tokens
+            self.scenario_usage["completionTokens"] += usage.completion_tokens
+
+    def print_scenario_report(self) -> None:
+        usage = self.scenario_usage
+        batching = (
+            f", batches of up to {self.scenario_batch_size} (mean {self.scenario_batcher.report()['meanBatchSize']})"
+            if self.scenario_batcher
+            else ""
+        )
+        print(
+            f"\n💬 Scenario requests: {usage['requests']}{batching}, "
+            f"{usage['promptTokens']} prompt + {usage['completionTokens']} completion tokens, "
+            f"{usage['requeuedItems']} re-requested individually"
+        )
+
+    def scenario_report(self) -> Dict:
+        report = dict(self.scenario_usage)
+        if self.scenario_batcher:
+            report["batching"] = self.scenario_batcher.report()
+        return report
+
+    def scenario_cache_key(self, verb: Dict, persona: Dict, prompt: str) -> str:
+        """Cache key for a scenario; fallbacks are never cached"""
+        sense = verb["senses"][0]
+        return cache_key(
+            "scenario",
+            verb=verb["lexicalItem"],
+            sense={"definition": sense["definition"], "examples": sense["examples"]},
+            voice=persona["voice"]["name"],
+            prompt=prompt_hash(SCENARIO_SYSTEM_PROMPT, prompt),
+            model=SCENARIO_MODEL,
+            seed=self.seed,
+        )
+
+    def image_cache_key(self, verb: Dict, persona: Dict, image_prompt: str) -> str:
+        """Cache key for a card image; the prompt carries the scenario it depicts"""
+        return cache_key(
+            "image",
+            verb=verb["lexicalItem"],
+            sense=verb["senses"][0]["definition"],
+            voice=persona["voice"]["name"],
+            prompt=prompt_hash(image_prompt),
+            model=IMAGE_MODEL,
+            seed=self.seed,
+        )
 
     def get_fallback_scenario(self, verb: Dict, persona: Dict) -> Dict:
         """Fallback scenario if API fails"""
@@ -477,6 +589,19 @@ class DemoGenerator:
 
     async def generate_image(self, verb: Dict, scenario: Dict, persona: Dict) -> str:
         """Generate a cartoon-style tech-themed image using DALL-E"""
+        image_prompt = self.build_image_prompt(verb, scenario)
+        key = self.image_cache_key(verb, persona, image_prompt)
+        cached = self.cache.get_image(key)
+        if cached is not None:
+            return await self.copy_cached_image(verb, cached)
+
+        image_url = await self.request_image(verb, image_prompt)
+        if image_url is None:
+            return "/placeholder.svg"
+        return await self.download_image(verb, image_url, key)
+
+    def build_image_prompt(self, verb: Dict, scenario: Dict) -> str:
+        """DALL-E prompt for the card image"""
         tech_role = scenario["character_role"]
         business_context = scenario["business_context"]
 
@@ -517,33 +642,45 @@ class DemoGenerator:
         No photorealistic people - keep it cartoon/illustration style.
         Focus on creating a welcoming, modern tech environment that developers would recognize and enjoy.
         """
+        return image_prompt
 
-        try:
-            response = await self.client.images.generate(
-                model="dall-e-3",
-                prompt=image_prompt,
-                size="1024x1024",
-                quality="standard",
-                n=1,
-            )
-
-            image_url = response.data[0].url
+    def image_request(self, image_prompt: str) -> Dict:
+        """Image generation parameters for a prompt (also the body of batch requests)"""
+        return {"model": IMAGE_MODEL, "prompt": image_prompt, "size": "1024x1024", "quality": "standard", "n": 1}
 
-            # Download and save image locally to timestamped folder
-            image_filename = f"{verb['lexicalItem'].lower().replace(' ', '-')}.png"
-            image_path = self.images_dir / image_filename
+    async def request_image(self, verb: Dict, image_prompt: str) -> Optional[str]:
+        """Ask DALL-E for the card image. Returns its temporary URL, or None on failure"""
+        try:
+            response = await self.create_image(**self.image_request(image_prompt))
+            return response.data[0].url
 
-            async with httpx.AsyncClient() as client:
-                img_response = await client.get(image_url)
-                with open(image_path, "wb") as f:
-                    f.write(img_response.content)
+        except Exception as e:
+            print(f"Error generating image for {verb['lexicalItem']}: {e}")
+            return None
 
-            return f"images/{image_filename}"
+    async def download_image(self, verb: Dict, image_url: str, cache_key: Optional[str] = None) -> str:
+        """Save a generated image to the timestamped folder (and the cache). Returns its card path"""
+        image_filename = f"{verb['lexicalItem'].lower().replace(' ', '-')}.png"
+        image_path = self.images_dir / image_filename
 
+        try:
+            await stream_to_file(self.get_http_client(), image_url, image_path)
         except Exception as e:
-            print(f"Error generating image for {verb['lexicalItem']}: {e}")
+            print(f"Error downloading image for {verb['lexicalItem']}: {e}")
             return "/placeholder.svg"
 
+        if cache_key:
+            await asyncio.to_thread(
+                self.cache.put_image, cache_key, image_path, {"lexicalItem": verb["lexicalItem"]}
+            )
+        return f"images/{image_filename}"
+
+    async def copy_cached_image(self, verb: Dict, cached_path: Path) -> str:
+        """Copy a cached image into the timestamped folder. Returns its card path"""
+        image_filename = f"{verb['lexicalItem'].lower().replace(' ', '-')}{cached_path.suffix}"
+        await asyncio.to_thread(shutil.copyfile, cached_path, self.images_dir / image_filename)
+        return f"images/{image_filename}"
+
     async def generate_native_explain_scenario(self, verb: Dict, persona: Dict) -> Dict:
         """Generate a native explanation scenario using OpenAI"""
         prompt = f"""
@@ -568,7 +705,7 @@ class DemoGenerator:
         """
 
         try:
-            response = await self.client.chat.completions.create(
+            response = await self.create_chat_completion(
                 model="gpt-4o-mini",
                 messages=[
                     {
@@ -622,7 +759,8 @@ class DemoGenerator:
             "difficulty": verb["difficulty"],
             "targetLexicalItem": {
                 "lexicalItem": verb["lexicalItem"],
-                "senses": verb["senses"]
+                "senses": verb["senses"],
+                "inflections": verb["inflections"]
             }
         }
 
@@ -630,10 +768,21 @@ class DemoGenerator:
 
     async def create_situation_card(self, verb: Dict) -> Dict:
         """Create a situation/context card with voice persona"""
+        self.ensure_directories()
         persona = self.get_random_persona()
         scenario = await self.generate_workplace_scenario(verb, persona)
         image_path = await self.generate_image(verb, scenario, persona)
-
+        return self.assemble_situation_card(verb, persona, scenario, image_path)
+
+    def assemble_situation_card(
+        self,
+        verb: Dict,
+        persona: Dict,
+        scenario: Dict,
+        image_path: str,
+        image_variants: Optional[Dict] = None,
+    ) -> Dict:
+        """Build the context card from its generated parts"""
         # Use the first sense as the primary definition
         primary_sense = verb["senses"][0]
 
@@ -657,7 +806,8 @@ class DemoGenerator:
             "targetLexicalItem": {
                 "lexicalItem": verb["lexicalItem"],
                 "definition": primary_sense["definition"],
-                "examples": primary_sense["examples"] + [scenario["expected_usage"]]
+                "examples": primary_sense["examples"] + [scenario["expected_usage"]],
+                "inflections": verb["inflections"]
             },
             "voicePersona": {
                 **persona,
@@ -671,92 +821,163 @@ class DemoGenerator:
             }
         }
 
-        return situation_card
-
-    async def generate_card_batch(
-        self, verb: Dict, verb_index: int, total_verbs: int
-    ) -> List[Dict]:
-        """Generate both cards for a single verb in parallel"""
-        print(f"Processing {verb_index + 1}/{total_verbs}: {verb['lexicalItem']}")
-
-        # Create both cards concurrently
-        native_task = asyncio.create_task(self.create_native_explain_card(verb))
-        situation_task = asyncio.create_task(self.create_situation_card(verb))
-
-        # Wait for both cards to complete
-        native_card, situation_card = await asyncio.gather(native_task, situation_task)
-
-        print(f"  ✅ Completed both cards for {verb['lexicalItem']}")
-        return [native_card, situation_card]
+        if image_variants:
+            situation_card["imageVariants"] = image_variants
 
-    async def generate_all_cards(self):
-        """Main generation process with parallel processing"""
-        print(f"Starting parallel demo generation at {self.timestamp}")
-
-        # Load verbs from config
-        all_verbs = self.load_phrasal_verbs_from_config()
-        selected_verbs = self.get_selected_verbs(all_verbs)
+        return situation_card
 
-        print(f"Processing {len(selected_verbs)} phrasal verbs in parallel...")
+    def build_pipeline(self, total_verbs: int) -> StagedPipeline:
+        """load -> persona -> scenario -> image -> download -> postprocess -> assemble, stages overlapping"""
 
-        # Create tasks for all verbs (each task generates 2 cards)
-        batch_tasks = [
-            self.generate_card_batch(verb, i, len(selected_verbs))
-            for i, verb in enumerate(selected_verbs)
-        ]
+        async def load(job: Dict) -> Dict:
+            print(f"Processing {job['index'] + 1}/{total_verbs}: {job['verb']['lexicalItem']}")
+            job["native_card"] = await self.create_native_explain_card(job["verb"])
+            return job
 
-        # Execute all batches concurrently with a semaphore to control concurrency
-        semaphore = asyncio.Semaphore(
-            3
-        )  # Limit to 3 concurrent verb processing batches
+        async def persona(job: Dict) -> Dict:
+            if self.persona_plan:
+                job["persona"] = self.persona_plan[job["index"]]
+                self.used_personas.add(job["persona"]["voice"]["name"])
+            else:
+                job["persona"] = self.get_random_persona()
+            return job
+
+        async def scenario(job: Dict) -> Dict:
+            job["scenario"] = await self.generate_workplace_scenario(job["verb"], job["persona"])
+            return job
+
+        async def image(job: Dict) -> Dict:
+            image_prompt = self.build_image_prompt(job["verb"], job["scenario"])
+            job["image_key"] = self.image_cache_key(job["verb"], job["persona"], image_prompt)
+            job["cached_image"] = self.cache.get_image(job["image_key"])
+            job["image_url"] = (
+                None if job["cached_image"] else await self.request_image(job["verb"], image_prompt)
+            )
+            return job
+
+        async def download(job: Dict) -> Dict:
+            if job["cached_image"]:
+                job["image_path"] = await self.copy_cached_image(job["verb"], job["cached_image"])
+            elif job["image_url"]:
+                job["image_path"] = await self.download_image(
+                    job["verb"], job["image_url"], job["image_key"]
+                )
+            else:
+                job["image_path"] = "/placeholder.svg"
+            return job
+
+        async def postprocess(job: Dict) -> Dict:
+            job["image_variants"] = None
+            if self.postprocessor.available and job["image_path"].startswith("images/"):
+                processed = await self.postprocessor.process(self.output_dir / job["image_path"])
+                job["image_variants"] = card_image_variants(job["image_path"], processed)
+            return job
+
+        async def assemble(job: Dict) -> Dict:
+            situation_card = self.assemble_situation_card(
+                job["verb"],
+                job["persona"],
+                job["scenario"],
+                job["image_path"],
+                job["image_variants"],
+            )
+            await asyncio.to_thread(self.card_stream.append, job["native_card"], situation_card)
+            print(f"  ✅ Completed both cards for {job['verb']['lexicalItem']}")
+            # The cards live in the stream now; only keep what's needed to order the deck
+            return {"index": job["index"], "cardIds": [job["native_card"]["id"], situation_card["id"]]}
+
+        stage_fns = [load, persona, scenario, image, download, postprocess, assemble]
+        return StagedPipeline(
+            [Stage(fn.__name__, fn, self.stage_concurrency[fn.__name__]) for fn in stage_fns]
+        )
 
-        async def limited_batch(task):
-            async with semaphore:
-                return await task
+    def write_voice_cards_json(self, store: CardStore, header: Dict, path: Path) -> None:
+        """Write voice-cards.json from the indexed deck, one card in memory at a time"""
+        with open(path, "w") as f:
+            f.write("{\n")
+            for key, value in header.items():
+                f.write(f"  {json.dumps(key)}: {textwrap.indent(json.dumps(value, indent=2), '  ').lstrip()},\n")
+            f.write('  "voiceCardTypes": [')
+            for i, card in enumerate(store.iter_cards()):
+                f.write(("," if i else "") + "\n" + textwrap.indent(json.dumps(card, indent=2), "    "))
+            f.write("\n  ]\n}\n")
+
+    async def generate_all_cards(self, selected_verbs: Optional[List[Dict]] = None):
+        """Main generation process, pipelined by stage"""
+        print(f"Starting pipelined demo generation at {self.timestamp}")
+        self.ensure_directories()
 
-        print("🚀 Generating all cards concurrently...")
-        batch_results = await asyncio.gather(
-            *[limited_batch(task) for task in batch_tasks]
+        if selected_verbs is None:
+            # Load verbs from config
+            all_verbs = self.load_phrasal_verbs()
+            selected_verbs = self.add_inflection_tables(self.get_selected_verbs(all_verbs))
+
+        print(f"Processing {len(selected_verbs)} phrasal verbs through the stage pipeline...")
+        if not self.postprocessor.available:
+            print("⚠️  This Pillow build encodes neither AVIF nor WebP, cards will reference the raw PNGs")
+        pipeline = self.build_pipeline(len(selected_verbs))
+        self.card_stream = CardStreamWriter(
+            str(self.card_stream_path), fsync_every=int(os.getenv("DEMO_FSYNC_EVERY", "16"))
         )
+        try:
+            jobs = await pipeline.run(
+                {"index": i, "verb": verb} for i, verb in enumerate(selected_verbs)
+            )
+        finally:
+            await self.close()
+
+        metadata = {
+            "generator": "demo_generator.py",
+            "version": "2.1.0",
+            "phrasalVerbsProcessed": [v["lexicalItem"] for v in selected_verbs],
+            "voicePersonasUsed": len(self.used_personas),
+            "cardStructure": "1 native_explain + 1 context per phrasal verb",
+            "generationMode": "pipelined",
+            "pipelineStages": pipeline.report(),
+            "seed": self.seed,
+            "cache": self.cache.report(),
+            "scenarioRequests": self.scenario_report(),
+            "rateLimits": {"chat": self.chat_limiter.report(), "image": self.image_limiter.report()},
+        }
+        self.card_stream.close({"generatedAt": self.timestamp, "metadata": metadata})
 
-        # Flatten results
-        voice_cards = []
-        for batch in batch_results:
-            voice_cards.extend(batch)
-
-        # Separate cards by type for statistics
-        native_explains = [
-            card for card in voice_cards if card["type"] == "native_explain"
+        # Stages finish out of order; compact the stream into the indexed deck in verb order
+        order = [
+            card_id
+            for job in sorted(jobs, key=lambda job: job["index"])
+            for card_id in job["cardIds"]
         ]
-        situations = [card for card in voice_cards if card["type"] == "context"]
+        cards_dir = self.output_dir / CARDS_DIR
+        compact_card_stream(str(self.card_stream_path), str(cards_dir), order=order)
+        store = CardStore(str(cards_dir))
 
-        # Create output structure
-        output = {
+        native_explains = len(store.find(card_type="native_explain"))
+        situations = len(store.find(card_type="context"))
+        header = {
             "generatedAt": self.timestamp,
-            "totalCards": len(voice_cards),
-            "nativeExplainCards": len(native_explains),
-            "situationCards": len(situations),
-            "voiceCardTypes": voice_cards,
-            "metadata": {
-                "generator": "demo_generator.py",
-                "version": "2.1.0",
-                "phrasalVerbsProcessed": [v["lexicalItem"] for v in selected_verbs],
-                "voicePersonasUsed": len(self.used_personas),
-                "cardStructure": "1 native_explain + 1 context per phrasal verb",
-                "generationMode": "parallel",
-            },
+            "totalCards": len(store),
+            "nativeExplainCards": native_explains,
+            "situationCards": situations,
+            "metadata": metadata,
         }
 
-        # Save to timestamped folder
+        # The monolithic file is kept for tools that still rewrite the whole deck
         output_file = self.output_dir / "voice-cards.json"
-        with open(output_file, "w") as f:
-            json.dump(output, f, indent=2)
-
-        print("\n🎉 Parallel generation complete!")
-        print(f"Total cards generated: {len(voice_cards)}")
-        print(f"  - Native explain cards: {len(native_explains)}")
-        print(f"  - Situation cards: {len(situations)}")
+        self.write_voice_cards_json(store, header, output_file)
+
+        pipeline.print_report()
+        self.print_scenario_report()
+        print("\n🚦 Rate limits:")
+        self.chat_limiter.print_report()
+        self.image_limiter.print_report()
+        self.cache.print_report()
+        print("\n🎉 Pipelined generation complete!")
+        print(f"Total cards generated: {len(store)}")
+        print(f"  - Native explain cards: {native_explains}")
+        print(f"  - Situation cards: {situations}")
         print(f"Voice personas used: {len(self.used_personas)}")
+        print(f"Card stream saved to: {self.card_stream_path} ({self.card_stream.fsyncs} fsyncs)")
+        print(f"Card shards and index saved to: {cards_dir}")
         print(f"Output saved to: {output_file}")
         print(f"Images saved to: {self.images_dir}")
 
@@ -5,10 +5,14 @@ Generates mock data for testing the system integration
 """
 
 import json
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
 
+sys.path.append(str(Path(__file__).parent.parent.parent / "agent" / "src"))
+from services.inflections import inflection_table
+
 PHRASAL_VERBS_PATH = (
     Path(__file__).parent.parent / "data" / "phrasal_verbs_phave_list.json"
 )
@@ -30,6 +34,9 @@ class MockDemoGenerator:
         """Load phrasal verbs from JSON file"""
         with open(PHRASAL_VERBS_PATH) as f:
             data = json.load(f)
+        # Older copies of the list predate the stored inflection tables
+        for verb in data:
+            verb.setdefault("inflections", inflection_table(verb["verb"]))
         return data
 
     def get_selected_verbs(self, verbs: List[Dict]) -> List[Dict]:
@@ -135,6 +142,7 @@ class MockDemoGenerator:
                 "examples": primary_sense["examples"] + [scenario["expected_usage"]],
                 "learningTip": scenario["learning_tip"],
                 "alternativeScenarios": scenario["alternative_scenarios"],
+                "inflections": verb["inflections"],
             },
             "metadata": {
                 "originalId": verb["id"],
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Image Downloads
+One shared, connection-pooled httpx client per generator run, and a streaming
+download that writes to a temp file off the event loop and renames it into
+place, so a crash never leaves a half-written image behind
+"""
+
+import asyncio
+import os
+import uuid
+from pathlib import Path
+
+import httpx
+
+CHUNK_SIZE = 64 * 1024
+
+
+def create_http_client(max_connections: int = 16) -> httpx.AsyncClient:
+    """Pooled client meant to live as long as the generator"""
+    return httpx.AsyncClient(
+        # Needs the `h2` package, installed with httpx[http2]
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        ),
+        timeout=httpx.Timeout(60.0, connect=10.0),
+        follow_redirects=True,
+    )
+
+
+async def stream_to_file(
+    client: httpx.AsyncClient, url: str, path: Path, chunk_size: int = CHUNK_SIZE
+) -> int:
+    """Stream `url` into `path` atomically. Returns the number of bytes written"""
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.part")
+    written = 0
+    async with client.stream("GET", url) as response:
+        response.raise_for_status()
+        f = await asyncio.to_thread(open, tmp_path, "wb")
+        try:
+            async for chunk in response.aiter_bytes(chunk_size):
+                await asyncio.to_thread(f.write, chunk)
+                written += len(chunk)
+            await asyncio.to_thread(f.close)
+            await asyncio.to_thread(os.replace, tmp_path, path)
+        except BaseException:
+            await asyncio.to_thread(f.close)
+            await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+            raise
+    return written
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Greeting Pre-Generator
+Fills the agent's greeting cache for every card so the first turn of a session
+can go straight to TTS instead of waiting for an LLM call
+"""
+
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+sys.path.append(str(Path(__file__).parent.parent.parent / "agent" / "src"))
+from prompts.greetings import (
+    CONTEXT_GREETING_PROMPT_VERSION,
+    NATIVE_EXPLAIN_GREETING_PROMPT_VERSION,
+    context_agent_instructions,
+    context_greeting_instructions,
+    native_explain_greeting_instructions,
+)
+from prompts.loader import load_prompt
+from services.greeting_cache import GreetingCache
+from services.voice_catalog import expand_voice_persona
+
+load_dotenv(Path(__file__).parent.parent / ".env.local")
+
+CARDS_PATH = Path(__file__).parent.parent.parent / "app" / "generated_data" / "voice-cards.json"
+
+# Must match the voice NativeExplainAgent speaks with
+NATIVE_EXPLAIN_VOICE = "es-US-Chirp3-HD-Schedar"
+
+
+class GreetingGenerator:
+    def __init__(self, pool_size: Optional[int] = None):
+        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.cache = GreetingCache(pool_size=pool_size)
+        self.cache.load()
+
+    def greeting_request(self, card: Dict) -> Optional[Tuple[str, str, str]]:
+        """Return (cache key, system prompt, instructions) for a card, as the agent builds them"""
+        if card["type"] == "context":
+            # Same fallbacks as ContextAgent, and the persona as the agent expands it
+            scenario = card["scenario"]
+            character = scenario.get("character", "Mr. Yang")
+            voice_persona = expand_voice_persona(card.get("voicePersona") or {})
+            voice_name = voice_persona.get("voice", {}).get("name", "en-US-Chirp3-HD-Achernar")
+            teaching_style = voice_persona.get("persona", {}).get("teaching_style", "professional and clear")
+            system = context_agent_instructions(
+                character, scenario.get("situation", "a meeting"), teaching_style, scenario.get("contextText", "")
+            )
+            instructions = context_greeting_instructions(character, scenario.get("conversationStarter", ""))
+            key = GreetingCache.make_key(card["id"], voice_name, CONTEXT_GREETING_PROMPT_VERSION, system, instructions)
+            return key, system, instructions
+
+        if card["type"] == "native_explain":
+            lexical_item = card["targetLexicalItem"]
+            system = load_prompt("native_explain_agent")
+            instructions = native_explain_greeting_instructions(lexical_item["lexicalItem"], lexical_item["senses"])
+            key = GreetingCache.make_key(
+                card["id"], NATIVE_EXPLAIN_VOICE, NATIVE_EXPLAIN_GREETING_PROMPT_VERSION, system, instructions
+            )
+            return key, system, instructions
+
+        return None
+
+    async def generate_variant(self, system: str, instructions: str, previous: List[str]) -> str:
+        """Generate one spoken opening line"""
+        avoid = ""
+        if previous:
+            avoid = "\n\nSay it differently from these earlier openings:\n" + "\n".join(f"- {text}" for text in previous)
+
+        response = await self.client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "system", "content": instructions + avoid},
+            ],
+            temperature=0.9,
+        )
+        return response.choices[0].message.content.strip()
+
+    async def fill_card(self, card: Dict) -> int:
+        """Generate greetings until this card's pool is full. Returns how many were added"""
+        request = self.greeting_request(card)
+        if request is None:
+            return 0
+
+        key, system, instructions = request
+        added = 0
+        attempts = 0
+        while self.cache.pick(key) is None and attempts < self.cache.pool_size * 2:
+            attempts += 1
+            previous = self.cache.variants(key)
+            try:
+                text = await self.generate_variant(system, instructions, previous)
+            except Exception as e:
+                print(f"⚠️  Greeting generation failed for {card['id']}: {e}")
+                break
+            if self.cache.add(key, text):
+                added += 1
+        return added
+
+    async def generate_all(self, cards_path: Path = CARDS_PATH) -> int:
+        with open(cards_path) as f:
+            cards = json.load(f)["voiceCardTypes"]
+
+        print(f"🗣️  Pre-generating greetings for {len(cards)} cards (pool size {self.cache.pool_size})...")
+        semaphore = asyncio.Semaphore(5)
+
+        async def limited(card: Dict) -> int:
+            async with semaphore:
+                return await self.fill_card(card)
+
+        added = sum(await asyncio.gather(*[limited(card) for card in cards]))
+        self.cache.save()
+        print(f"✅ Added {added} greetings to {self.cache.path}")
+        return added
+
+
+async def main():
+    """Main entry point"""
+    await GreetingGenerator().generate_all()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
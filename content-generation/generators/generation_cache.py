@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Generation Cache
+Content-addressed store for generated scenarios and images. Every entry is
+keyed by a hash of everything that shaped it (verb, sense, persona voice,
+prompt, model, seed), appended to a manifest journal as soon as it's written,
+so re-runs and interrupted runs only pay for the work that's still missing.
+The journal is folded into `manifest.json` once at the end of a run
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+CACHE_DIR = Path(__file__).parent.parent / "cache"
+
+# Rough list prices per call, only used to report what cache hits saved
+ESTIMATED_COST_USD = {
+    "scenario": 0.0005,  # gpt-4o-mini, ~600 prompt + ~400 completion tokens
+    "image": 0.04,  # dall-e-3, 1024x1024 standard
+}
+
+
+def prompt_hash(*parts: str) -> str:
+    """Hash of the rendered prompt text, so template edits invalidate entries"""
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def cache_key(kind: str, **parts: Any) -> str:
+    """Content address for one generated artifact"""
+    payload = json.dumps({"kind": kind, **parts}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GenerationCache:
+    """Scenario JSON and image files addressed by cache_key, plus a manifest"""
+
+    def __init__(self, root: Path = CACHE_DIR, enabled: bool = True):
+        self.root = Path(root)
+        self.enabled = enabled
+        self.objects_dir = self.root / "objects"
+        self.manifest_path = self.root / "manifest.json"
+        # One JSON line per put since the last compact(), replayed over manifest.json on load
+        self.journal_path = self.root / "manifest.jsonl"
+        self.manifest: Dict[str, Dict[str, Any]] = self._load_manifest() if enabled else {}
+        # Image entries are written from worker threads; one manifest writer at a time
+        self._lock = threading.Lock()
+        self.stats = {
+            kind: {"hits": 0, "misses": 0, "avoidedUsd": 0.0} for kind in ESTIMATED_COST_USD
+        }
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        manifest: Dict[str, Dict[str, Any]] = {}
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, encoding="utf-8") as f:
+                    manifest = json.load(f)["entries"]
+            except Exception as e:
+                print(f"⚠️  Ignoring unreadable cache manifest {self.manifest_path}: {e}")
+        if self.journal_path.exists():
+            with open(self.journal_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn last line from a crash mid-append
+                    manifest[record.pop("key")] = record
+        return manifest
+
+    def compact(self) -> None:
+        """Fold the journal into manifest.json; call once when a run finishes"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if not self.journal_path.exists():
+                return
+            # Write-then-rename so a crash mid-write never leaves a truncated manifest
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "entries": self.manifest}, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.manifest_path)
+            self.journal_path.unlink()
+
+    def _object_path(self, key: str, suffix: str) -> Path:
+        return self.objects_dir / key[:2] / f"{key}{suffix}"
+
+    def _lookup(self, key: str, kind: str) -> Optional[Path]:
+        if not self.enabled:
+            return None
+        entry = self.manifest.get(key)
+        path = self.root / entry["file"] if entry else None
+        if path is None or not path.exists():
+            self.stats[kind]["misses"] += 1
+            return None
+        self.stats[kind]["hits"] += 1
+        self.stats[kind]["avoidedUsd"] += ESTIMATED_COST_USD[kind]
+        return path
+
+    def _record(self, key: str, kind: str, path: Path, meta: Dict[str, Any]) -> None:
+        entry = {
+            "kind": kind,
+            "file": str(path.relative_to(self.root)),
+            "createdAt": datetime.now().isoformat(timespec="seconds"),
+            "meta": meta,
+        }
+        line = json.dumps({"key": key, **entry}, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.manifest[key] = entry
+            # Appending keeps each put O(1) however large the manifest grows
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def has(self, key: str) -> bool:
+        """Whether an entry is stored, without counting a hit or miss"""
+        entry = self.manifest.get(key) if self.enabled else None
+        return entry is not None and (self.root / entry["file"]).exists()
+
+    def peek_scenario(self, key: str) -> Optional[Dict]:
+        """Stored scenario without counting a hit or miss"""
+        if not self.has(key):
+            return None
+        with open(self.root / self.manifest[key]["file"], encoding="utf-8") as f:
+            return json.load(f)
+
+    def get_scenario(self, key: str) -> Optional[Dict]:
+        path = self._lookup(key, "scenario")
+        if path is None:
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def put_scenario(self, key: str, scenario: Dict, meta: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        path = self._object_path(key, ".json")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(scenario, f, indent=2, ensure_ascii=False)
+        self._record(key, "scenario", path, meta)
+
+    def get_image(self, key: str) -> Optional[Path]:
+        return self._lookup(key, "image")
+
+    def put_image(self, key: str, image_path: Path, meta: Dict[str, Any]) -> None:
+        """Copy a downloaded image into the cache"""
+        if not self.enabled:
+            return
+        path = self._object_path(key, image_path.suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(image_path, path)
+        self._record(key, "image", path, meta)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "root": str(self.root),
+            **{kind: {**row, "avoidedUsd": round(row["avoidedUsd"], 4)} for kind, row in self.stats.items()},
+        }
+
+    def print_report(self) -> None:
+        if not self.enabled:
+            print("\n🗄️  Generation cache disabled")
+            return
+        print(f"\n🗄️  Generation cache ({self.root}):")
+        for kind, row in self.stats.items():
+            print(f"   {kind:<10} {row['hits']:>4} hits, {row['misses']:>4} misses")
+        avoided = sum(row["avoidedUsd"] for row in self.stats.values())
+        print(f"   💰 Avoided API spend: ~${avoided:.2f}")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Persona Catalog
+Voice personas indexed by language code, gender and voice type, sampled
+without replacement through a shuffled order and a cursor per bucket. Every
+index and name bank is built once, so picking a persona or a name is an O(1)
+step with no per-call list building
+"""
+
+import json
+import random
+from itertools import product
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from services.voice_catalog import GENDER, LANGUAGE_CODE, VOICE_TYPE, VoiceCatalog
+
+NAME_BANKS_PATH = Path(__file__).parent.parent / "data" / "persona_name_banks.json"
+
+BucketKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+class ShuffledCursor:
+    """Hands out items in shuffled order; reshuffles in place once all were used"""
+
+    def __init__(self, items: List, rng: random.Random):
+        self.items = list(items)
+        self.rng = rng
+        self.position = len(self.items)  # Shuffle lazily on first draw
+
+    def next(self):
+        if self.position >= len(self.items):
+            self.rng.shuffle(self.items)
+            self.position = 0
+        item = self.items[self.position]
+        self.position += 1
+        return item
+
+
+class NameBanks:
+    """Culturally appropriate names and backgrounds per language, loaded once"""
+
+    def __init__(self, rng: random.Random, path: Path = NAME_BANKS_PATH):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        self.names: Dict[str, Dict[str, List[str]]] = data["names"]
+        self.backgrounds: Dict[str, str] = data["backgrounds"]
+        self.rng = rng
+        self._cursors: Dict[Tuple[str, str], ShuffledCursor] = {}
+        self._resolved: Dict[str, str] = {}
+
+    def resolve_language(self, language_code: str) -> str:
+        """Bank key for a voice language: exact match, same base language, else en-US"""
+        resolved = self._resolved.get(language_code)
+        if resolved is None:
+            base_lang = language_code.split("-")[0]
+            if language_code in self.names:
+                resolved = language_code
+            elif base_lang == "en":
+                resolved = "en-US"
+            else:
+                resolved = next((key for key in self.names if key.startswith(base_lang)), "en-US")
+            self._resolved[language_code] = resolved
+        return resolved
+
+    def pick(self, language_code: str, gender: str) -> Dict:
+        region = self.resolve_language(language_code)
+        bank = self.names.get(region, self.names["en-US"])
+        gender = gender if gender in bank else "MALE"
+        cursor = self._cursors.get((region, gender))
+        if cursor is None:
+            cursor = self._cursors[(region, gender)] = ShuffledCursor(bank[gender], self.rng)
+        return {
+            "name": cursor.next(),
+            "cultural_background": self.backgrounds.get(region, "international professional"),
+            "language_region": region,
+        }
+
+
+class PersonaCatalog:
+    """Personas bucketed by every combination of (language code, gender, voice type)"""
+
+    def __init__(
+        self, personas: Sequence[Dict], rng: random.Random, attributes: Optional[List[BucketKey]] = None
+    ):
+        self.personas = personas
+        self.rng = rng
+        if attributes is None:
+            attributes = [
+                (p["voice"]["language_code"], p["voice"]["gender"], p["voice"]["voice_type"]) for p in personas
+            ]
+        buckets: Dict[BucketKey, List[int]] = {}
+        for i, attrs in enumerate(attributes):
+            # None is a wildcard, so any filter combination is a single lookup
+            for mask in product((True, False), repeat=3):
+                key = tuple(attr if keep else None for attr, keep in zip(attrs, mask))
+                buckets.setdefault(key, []).append(i)
+        self._cursors = {key: ShuffledCursor(indices, rng) for key, indices in buckets.items()}
+
+    @classmethod
+    def from_voice_catalog(cls, catalog: VoiceCatalog, rng: random.Random) -> "PersonaCatalog":
+        """Bucket straight from the binary catalog's fields; personas decode only when sampled"""
+        attributes = [
+            (catalog.field(i, LANGUAGE_CODE), catalog.field(i, GENDER), catalog.field(i, VOICE_TYPE))
+            for i in range(len(catalog))
+        ]
+        return cls(catalog, rng, attributes)
+
+    def __len__(self) -> int:
+        return len(self.personas)
+
+    def bucket_size(
+        self, language_code: Optional[str] = None, gender: Optional[str] = None, voice_type: Optional[str] = None
+    ) -> int:
+        cursor = self._cursors.get((language_code, gender, voice_type))
+        return len(cursor.items) if cursor else 0
+
+    def sample(
+        self, language_code: Optional[str] = None, gender: Optional[str] = None, voice_type: Optional[str] = None
+    ) -> Optional[Dict]:
+        """Next persona in this bucket; no repeats until the bucket is exhausted"""
+        cursor = self._cursors.get((language_code, gender, voice_type))
+        if cursor is None:
+            return None
+        return self.personas[cursor.next()]
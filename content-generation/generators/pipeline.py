@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Staged Async Pipeline
+Runs items through a chain of stages connected by bounded queues. Every stage
+has its own worker count, so slow stages (image generation) don't hold back
+fast ones (chat completions) and all stages overlap
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+
+@dataclass
+class StageStats:
+    completed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    first_started: Optional[float] = None
+    last_finished: Optional[float] = None
+
+    @property
+    def active_seconds(self) -> float:
+        if self.first_started is None or self.last_finished is None:
+            return 0.0
+        return self.last_finished - self.first_started
+
+    @property
+    def throughput(self) -> float:
+        """Items per second while the stage was active"""
+        return self.completed / self.active_seconds if self.active_seconds else 0.0
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[[Any], Awaitable[Any]]
+    concurrency: int = 1
+    stats: StageStats = field(default_factory=StageStats)
+
+
+class StagedPipeline:
+    """Chain of async stages with bounded queues between them.
+
+    Each stage function receives the previous stage's output. A stage that raises
+    drops the item (counted as failed) so one bad item can't stall the pipeline.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 8):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.wall_seconds = 0.0
+
+    async def run(self, items: Iterable[Any]) -> List[Any]:
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results: List[Any] = []
+        workers = []
+        for i, stage in enumerate(self.stages):
+            outbox = queues[i + 1] if i + 1 < len(queues) else None
+            for _ in range(stage.concurrency):
+                workers.append(asyncio.create_task(self._work(stage, queues[i], outbox, results)))
+
+        started_at = time.perf_counter()
+        try:
+            for item in items:
+                await queues[0].put(item)
+            # A stage only finishes after the one before it, so join in order
+            for queue in queues:
+                await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        self.wall_seconds = time.perf_counter() - started_at
+        return results
+
+    async def _work(
+        self,
+        stage: Stage,
+        inbox: asyncio.Queue,
+        outbox: Optional[asyncio.Queue],
+        results: List[Any],
+    ) -> None:
+        stats = stage.stats
+        while True:
+            item = await inbox.get()
+            started_at = time.perf_counter()
+            if stats.first_started is None:
+                stats.first_started = started_at
+            try:
+                output = await stage.fn(item)
+            except Exception as e:
+                stats.failed += 1
+                print(f"⚠️  Stage '{stage.name}' failed: {e}")
+                inbox.task_done()
+                continue
+            finally:
+                stats.last_finished = time.perf_counter()
+                stats.busy_seconds += stats.last_finished - started_at
+
+            stats.completed += 1
+            if outbox is not None:
+                await outbox.put(output)
+            else:
+                results.append(output)
+            inbox.task_done()
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        return {
+            stage.name: {
+                "concurrency": stage.concurrency,
+                "completed": stage.stats.completed,
+                "failed": stage.stats.failed,
+                "throughputPerSecond": round(stage.stats.throughput, 3),
+                "meanSeconds": round(stage.stats.busy_seconds / stage.stats.completed, 3)
+                if stage.stats.completed
+                else 0.0,
+            }
+            for stage in self.stages
+        }
+
+    def print_report(self) -> None:
+        print(f"\n📊 Pipeline stages (wall time {self.wall_seconds:.1f}s):")
+        for name, row in self.report().items():
+            print(
+                f"   {name:<12} x{row['concurrency']:<3} {row['completed']:>4} done, "
+                f"{row['failed']:>2} failed, {row['throughputPerSecond']:>7.2f}/s, "
+                f"{row['meanSeconds']:>6.2f}s each"
+            )
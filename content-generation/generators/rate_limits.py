@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Adaptive Rate Limits
+Per-endpoint concurrency controller for OpenAI calls. The number of requests in
+flight follows AIMD: +1 per window of successful requests, halved on a 429. The
+`x-ratelimit-*` and `retry-after` response headers pause every caller until the
+window resets once the remaining request budget is spent. Retryable failures
+(429, 5xx, timeouts, connection errors) are retried with full-jitter
+exponential backoff; only when the retry budget is spent does the error reach
+the caller, which then falls back. The SDK's own retries should be off
+(`AsyncOpenAI(max_retries=0)`) so this is the only retry budget
+"""
+
+import asyncio
+import random
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+import openai
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Seconds in an OpenAI reset header such as "120ms", "1s" or "6m0s" """
+    if not value:
+        return None
+    parts = _DURATION.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _UNIT_SECONDS[unit] for amount, unit in parts)
+
+
+def retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """How long the server asked us to wait, in seconds"""
+    if not headers:
+        return None
+    if headers.get("retry-after-ms"):
+        return float(headers["retry-after-ms"]) / 1000
+    if headers.get("retry-after"):
+        try:
+            return float(headers["retry-after"])
+        except ValueError:
+            return None
+    return parse_duration(headers.get("x-ratelimit-reset-requests"))
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, openai.APIConnectionError):  # Includes timeouts
+        return True
+    if isinstance(error, openai.RateLimitError):
+        # Out of credits isn't something waiting fixes
+        return getattr(error, "code", None) != "insufficient_quota"
+    status = getattr(error, "status_code", None)
+    return status is not None and (status in (408, 409) or status >= 500)
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit plus jittered retries for one endpoint"""
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        initial: Optional[int] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        rng: Optional[random.Random] = None,
+    ):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = float(initial or max(1, (self.max_concurrency + 1) // 2))
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng or random.Random()
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+        self.stats = {
+            "requests": 0,
+            "succeeded": 0,
+            "rateLimited": 0,
+            "retries": 0,
+            "exhausted": 0,
+            "minLimit": self.limit,
+            "peakInFlight": 0,
+        }
+        self.limit_rpm: Optional[int] = None
+        self.first_started: Optional[float] = None
+        self.last_finished: Optional[float] = None
+
+    async def call(self, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Await fn(*args, **kwargs) within the limit, retrying retryable errors.
+
+        Pass a `with_raw_response` method to feed its rate-limit headers back into
+        the limiter; the raw response is returned as-is.
+        """
+        attempt = 0
+        while True:
+            await self._acquire()
+            # The slot goes back however the call ends, cancellation included
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                error = e
+                headers = getattr(getattr(e, "response", None), "headers", None)
+                self._observe(headers)
+                # Out of credits says nothing about how many requests the endpoint takes
+                if isinstance(e, openai.RateLimitError) and getattr(e, "code", None) != "insufficient_quota":
+                    self._on_rate_limited(headers)
+            else:
+                self._observe(getattr(result, "headers", None))
+                self._on_success()
+                return result
+            finally:
+                await self._release()
+
+            if not is_retryable(error):
+                raise error
+            if attempt >= self.max_retries:
+                self.stats["exhausted"] += 1
+                raise error
+            delay = self._backoff(attempt, headers)
+            attempt += 1
+            self.stats["retries"] += 1
+            print(f"  🔁 {self.name}: {type(error).__name__}, retry {attempt}/{self.max_retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def _acquire(self) -> None:
+        while True:
+            pause = self.paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+            async with self._cond:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    self.stats["requests"] += 1
+                    self.stats["peakInFlight"] = max(self.stats["peakInFlight"], self.in_flight)
+                    if self.first_started is None:
+                        self.first_started = time.monotonic()
+                    return
+                await self._cond.wait()
+
+    async def _release(self) -> None:
+        # Give the slot back before the first await, so it can't leak even if this is interrupted
+        self.in_flight -= 1
+        self.last_finished = time.monotonic()
+        async with self._cond:
+            self._cond.notify_all()
+
+    def _observe(self, headers: Optional[Mapping[str, str]]) -> None:
+        """Track the advertised limit and pause when the remaining request budget is spent"""
+        if not headers:
+            return
+        if headers.get("x-ratelimit-limit-requests"):
+            self.limit_rpm = int(headers["x-ratelimit-limit-requests"])
+        remaining = headers.get("x-ratelimit-remaining-requests")
+        reset = parse_duration(headers.get("x-ratelimit-reset-requests"))
+        if remaining is not None and int(remaining) <= 0 and reset:
+            self.paused_until = max(self.paused_until, time.monotonic() + reset)
+
+    def _on_success(self) -> None:
+        self.stats["succeeded"] += 1
+        # Additive increase: one more slot per window of `limit` successes
+        self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+
+    def _on_rate_limited(self, headers: Optional[Mapping[str, str]]) -> None:
+        self.stats["rateLimited"] += 1
+        now = time.monotonic()
+        # Requests already in flight will 429 together; halve once per burst, not once per request
+        if now - self._last_decrease >= 1.0:
+            self.limit = max(1.0, self.limit / 2)
+            self.stats["minLimit"] = min(self.stats["minLimit"], self.limit)
+            self._last_decrease = now
+        wait = retry_after(headers)
+        if wait:
+            self.paused_until = max(self.paused_until, now + wait)
+
+    def _backoff(self, attempt: int, headers: Optional[Mapping[str, str]]) -> float:
+        """Full jitter: uniform over [0, base * 2^attempt], but never sooner than the server asked"""
+        jittered = self.rng.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        return max(jittered, retry_after(headers) or 0.0)
+
+    @property
+    def achieved_rpm(self) -> float:
+        if self.first_started is None or self.last_finished is None:
+            return 0.0
+        minutes = (self.last_finished - self.first_started) / 60
+        return self.stats["succeeded"] / minutes if minutes > 0 else 0.0
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "minLimit": round(self.stats["minLimit"], 2),
+            "finalLimit": round(self.limit, 2),
+            "maxConcurrency": self.max_concurrency,
+            "achievedRpm": round(self.achieved_rpm, 1),
+            "limitRpm": self.limit_rpm,
+        }
+
+    def print_report(self) -> None:
+        stats = self.stats
+        limit = (
+            f" of {self.limit_rpm} RPM limit ({self.achieved_rpm / self.limit_rpm:.0%})"
+            if self.limit_rpm
+            else " (no limit headers seen)"
+        )
+        print(
+            f"   {self.name:<6} {stats['succeeded']:>4} ok of {stats['requests']:<4} attempts, "
+            f"{stats['rateLimited']} rate-limited, {stats['retries']} retries, "
+            f"{stats['exhausted']} fell back; {self.achieved_rpm:.1f} RPM{limit}; "
+            f"limit {self.limit:.1f} (low {stats['minLimit']:.1f}, ceiling {self.max_concurrency}), "
+            f"peak {stats['peakInFlight']} in flight"
+        )